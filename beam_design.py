@@ -0,0 +1,266 @@
+import argparse
+import math
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import eng_module.beams as beams
+import eng_module.continuous_beam as continuous_beam
+import eng_module.load_factors as load_factors
+import eng_module.sections_db as sections_db
+
+GRAVITY = 9.81 # m/s**2
+GAMMA_M0 = 1.0
+SELF_WEIGHT = "Self weight"
+
+# Columns of the rows returned by size_beam
+DESIGN_FIELDS = [
+    "File", "Name", "Section", "kg/m",
+    "M Ed", "V Ed", "Deflection", "Deflection limit",
+    "Bending utilisation", "Shear utilisation", "Deflection utilisation",
+    "Converged", "Iterations", "Analyses", "Time", "Error",
+]
+
+_default_index = None
+
+
+def default_index() -> sections_db.SectionIndex:
+    """
+    Returns a SectionIndex of the bundled catalogue in mm units (see
+    sections_db.load_eu_pf_sections), built on first use.
+    """
+    global _default_index
+    if _default_index is None:
+        _default_index = sections_db.SectionIndex(sections_db.load_eu_pf_sections())
+    return _default_index
+
+
+def self_weight(kg_per_m: float) -> float:
+    """
+    Returns the weight in N/mm of a section of mass 'kg_per_m'.
+    """
+    return kg_per_m * GRAVITY / 1000
+
+
+def deflection_limits(beam_data: dict, x: np.ndarray, deflection_ratio: float = 250) -> np.ndarray:
+    """
+    Returns the deflection limit at each of the locations 'x' along the beam
+    in 'beam_data': the length of the span the location is in divided by
+    'deflection_ratio'. Cantilevers count as spans of twice their length.
+    """
+    length = beam_data['L']
+    supports = sorted(beam_data['Supports'])
+    bounds = np.unique([0., *supports, length])
+    spans = np.diff(bounds)
+    if supports[0] > 0:
+        spans[0] *= 2
+    if supports[-1] < length:
+        spans[-1] *= 2
+    span_index = np.clip(np.searchsorted(bounds, x, side="right") - 1, 0, len(spans) - 1)
+    return spans[span_index] / deflection_ratio
+
+
+def combination_factors(
+    load_cases: list[str],
+    load_combos: dict[str, dict[str, float]],
+) -> np.ndarray:
+    """
+    Returns load_factors.combination_matrix for 'load_cases', with the
+    SELF_WEIGHT case given its own permanent action factor in every
+    combination: the factor the combination gives SELF_WEIGHT if it names
+    it, else its factor on the permanent "Dead" load, else 1.0. The self
+    weight is so in every combination whatever load cases the beam has.
+    """
+    factors = load_factors.combination_matrix(load_cases, load_combos)
+    permanent = load_factors.LOAD_CASE_NAMES["D"]
+    factors[load_cases.index(SELF_WEIGHT)] = [
+        load_combo.get(SELF_WEIGHT, load_combo.get(permanent, load_combo.get("D", 1.0)))
+        for load_combo in load_combos.values()
+    ]
+    return factors
+
+
+def size_beam(
+    beam_data: dict,
+    index: Optional[sections_db.SectionIndex] = None,
+    grade: str = "S355",
+    deflection_ratio: float = 250,
+    uls_combos: dict[str, dict[str, float]] = load_factors.EC_0_COMBS,
+    sls_combos: Optional[dict[str, dict[str, float]]] = None,
+    max_iterations: int = 10,
+    n_points: int = 201,
+) -> dict:
+    """
+    Returns a dict of the lightest section of 'index' (the bundled catalogue
+    by default) for the beam in 'beam_data', structured as by
+    beams.get_structured_beam_data in N and mm, with its self weight added
+    as a permanent action (see combination_factors). The section needs:
+        - Wpl.y >= M Ed * GAMMA_M0 / fy under 'uls_combos'
+        - Avz >= V Ed * sqrt(3) * GAMMA_M0 / fy under 'uls_combos'
+        where fy is the yield strength in 'grade' (see
+        sections_db.STEEL_GRADES) for the section's flange thickness
+        - Iy large enough to keep the deflection under 'sls_combos' (every
+          load case unfactored by default) within deflection_limits
+    The beam's own Iz is only a starting stiffness.
+
+    The beam is analysed once, with each load case and a unit self weight
+    solved together ("Analyses" counts the solves). Its moments and shears do not depend on the stiffness
+    of a prismatic beam and its deflections scale with 1 / Iy, so every
+    iteration (a new self weight, a new section) is a superposition of that
+    one solution. Iterations stop once the section chosen is the one whose
+    self weight was assumed.
+
+    The dict holds the DESIGN_FIELDS other than "File" and "Error";
+    "Section" is None if no section of the catalogue is strong or stiff enough.
+    """
+    if max_iterations < 1:
+        raise ValueError(f"max_iterations must be at least 1, not {max_iterations}.")
+    if grade not in sections_db.STEEL_GRADES:
+        raise ValueError(f"Invalid grade: {grade}. Please use one of {list(sections_db.STEEL_GRADES)}.")
+    start = time.perf_counter()
+    if index is None:
+        index = default_index()
+    fy_thin, fy_thick, _, _ = sections_db.STEEL_GRADES[grade]
+    length = beam_data['L']
+    loads = [*beam_data['Loads'], {
+        'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -1., 'End Magnitude': -1.,
+        'Start Location': 0., 'End Location': length, 'Case': SELF_WEIGHT,
+    }]
+    model = continuous_beam.ContinuousBeam(dict(beam_data, Loads=loads))
+    x = model.diagram_points(n_points)
+    diagrams = model.evaluate(model.solve(), x)
+
+    if sls_combos is None:
+        sls_combos = {"SLS": {load_case: 1.0 for load_case in model.load_cases if load_case != SELF_WEIGHT}}
+    uls = combination_factors(model.load_cases, uls_combos)
+    sls = combination_factors(model.load_cases, sls_combos)
+    sw = model.load_cases.index(SELF_WEIGHT)
+    # Each diagram of the combinations as (everything else) + self weight * (unit self weight)
+    split = {}
+    for quantity, factors in (("Moment", uls), ("Shear", uls), ("Deflection", sls)):
+        others = factors.copy()
+        others[sw] = 0.
+        split[quantity] = (diagrams[quantity] @ others, np.outer(diagrams[quantity][:, sw], factors[sw]))
+    limits = deflection_limits(beam_data, x, deflection_ratio)[:, None]
+
+    def demands(weight: float) -> tuple[float, float, float]:
+        """
+        Returns the design moment, shear and deflection ratio (at the beam's
+        own Iz) of the beam with a self weight of 'weight'.
+        """
+        return tuple(
+            np.abs(others + weight * unit).max() if quantity != "Deflection"
+            else (np.abs(others + weight * unit) / limits).max()
+            for quantity, (others, unit) in split.items()
+        )
+
+    def lightest(M_Ed: float, V_Ed: float, deflection_ratio_ref: float) -> Optional[pd.Series]:
+        """
+        Returns the lightest section meeting the demands, checked at the
+        yield strength of flanges up to 40 mm and over 40 mm thick in turn.
+        """
+        candidates = []
+        for fy, flange in ((fy_thin, ("le", 40.)), (fy_thick, ("gt", 40.))):
+            candidate = index.lightest({
+                "Wpl.y": ("ge", M_Ed * GAMMA_M0 / fy),
+                "Avz": ("ge", V_Ed * math.sqrt(3) * GAMMA_M0 / fy),
+                "Iy": ("ge", beam_data['Iz'] * deflection_ratio_ref),
+                "tf": flange,
+            })
+            if candidate is not None:
+                candidates.append(candidate)
+        return min(candidates, key=lambda candidate: candidate["kg/m"], default=None)
+
+    section = None
+    weight = 0.
+    converged = False
+    for iteration in range(1, max_iterations + 1):
+        candidate = lightest(*demands(weight))
+        if candidate is None:
+            section = None
+            break
+        if section is not None and candidate.name == section.name:
+            converged = True
+            break
+        section = candidate
+        weight = self_weight(section["kg/m"])
+
+    result = {"Name": beam_data['Name'], "Section": None, "kg/m": np.nan}
+    if section is not None:
+        M_Ed, V_Ed, deflection_ratio_ref = demands(weight)
+        fy = float(sections_db.yield_strength(section["tf"], grade))
+        stiffness_ratio = beam_data['Iz'] / section["Iy"]
+        deflections = split["Deflection"][0] + weight * split["Deflection"][1]
+        worst = np.unravel_index(np.argmax(np.abs(deflections) / limits), deflections.shape)
+        result.update({
+            "Section": section["Section name"],
+            "kg/m": section["kg/m"],
+            "M Ed": M_Ed,
+            "V Ed": V_Ed,
+            "Deflection": deflections[worst] * stiffness_ratio,
+            "Deflection limit": limits[worst[0], 0],
+            "Bending utilisation": M_Ed * GAMMA_M0 / (section["Wpl.y"] * fy),
+            "Shear utilisation": V_Ed * math.sqrt(3) * GAMMA_M0 / (section["Avz"] * fy),
+            "Deflection utilisation": deflection_ratio_ref * stiffness_ratio,
+        })
+    result.update({
+        "Converged": converged,
+        "Iterations": iteration,
+        "Analyses": model.solves,
+        "Time": time.perf_counter() - start,
+    })
+    return result
+
+
+def size_beam_files(source: str, pattern: str = "*.txt", **kwargs) -> pd.DataFrame:
+    """
+    Returns a DataFrame with the DESIGN_FIELDS of size_beam (called with
+    'kwargs') for every beam in the files in 'source' (see
+    beams.beam_filenames). A beam or file that cannot be sized gives a row
+    with its "Error" set instead of raising.
+    """
+    rows = []
+    for filename in beams.beam_filenames(source, pattern):
+        try:
+            for beam_data in beams.iter_beam_records(filename):
+                try:
+                    row = size_beam(beam_data, **kwargs)
+                    row["Error"] = ""
+                except Exception as error:
+                    row = {"Name": beam_data['Name'], "Error": f"{type(error).__name__}: {error}"}
+                rows.append(dict(row, File=filename))
+        except Exception as error:
+            rows.append({"File": filename, "Name": "", "Error": f"{type(error).__name__}: {error}"})
+    return pd.DataFrame(rows, columns=DESIGN_FIELDS)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Command line entry point sizing a batch of beam files, e.g.
+        python -m eng_module.beam_design test_data --pattern "beam_*-wk4.txt" -o sizes.csv
+    """
+    parser = argparse.ArgumentParser(description="Size the beams in a batch of beam files.")
+    parser.add_argument("source", help="a directory, glob pattern or beam file")
+    parser.add_argument("--pattern", default="*.txt", help="file pattern used when 'source' is a directory")
+    parser.add_argument("--grade", default="S355", choices=list(sections_db.STEEL_GRADES), help="steel grade")
+    parser.add_argument("--deflection-ratio", type=float, default=250, help="span / deflection limit")
+    parser.add_argument("-o", "--output", default=None, help="csv file to write (default: standard output)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    designs = size_beam_files(args.source, args.pattern, grade=args.grade, deflection_ratio=args.deflection_ratio)
+    elapsed = time.perf_counter() - start
+    designs.to_csv(args.output if args.output else sys.stdout, index=False)
+    sized = designs[designs["Error"] == ""]
+    print(
+        f"Sized {len(sized)} beams ({len(designs) - len(sized)} failed) in {elapsed:.2f} s: "
+        f"{sized['Iterations'].mean():.1f} iterations and {sized['Time'].mean() * 1e3:.2f} ms per beam",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import numpy as np
+
+# Closed-form results for standard beams carrying a full length uniformly
+# distributed load 'w'. Every function accepts scalars or arrays (broadcast
+# against each other) and returns a dict of arrays:
+#     - "R1", "R2": the vertical reactions at the left and right supports
+#     - "Max Moment", "Min Moment"
+#     - "Max Shear", "Min Shear"
+#     - "Max Deflection", "Min Deflection"
+# Signs follow the beam file and PyNite conventions (see continuous_beam):
+# 'w', reactions and deflections are positive upwards, and the moments and
+# shears are those of Member3D.moment("Mz") and Member3D.shear("Fy").
+
+RESULT_KEYS = (
+    "R1", "R2",
+    "Max Moment", "Min Moment",
+    "Max Shear", "Min Shear",
+    "Max Deflection", "Min Deflection",
+)
+
+
+def _results(
+    w: np.ndarray,
+    r1: np.ndarray,
+    r2: np.ndarray,
+    moment: tuple[np.ndarray, np.ndarray],
+    shear: tuple[np.ndarray, np.ndarray],
+    deflection: tuple[np.ndarray, np.ndarray],
+) -> dict[str, np.ndarray]:
+    """
+    Returns the results dict of a beam whose results under a unit downward
+    load are 'r1', 'r2' and the (max, min) pairs 'moment', 'shear' and
+    'deflection', scaled to the load 'w'.
+    """
+    q = -np.asarray(w, dtype=np.float64) # downward load intensity
+    results = {"R1": q * r1, "R2": q * r2}
+    for name, (unit_max, unit_min) in (("Moment", moment), ("Shear", shear), ("Deflection", deflection)):
+        results[f"Max {name}"] = np.where(q >= 0, q * unit_max, q * unit_min)
+        results[f"Min {name}"] = np.where(q >= 0, q * unit_min, q * unit_max)
+    return results
+
+
+def simply_supported(w: np.ndarray, L: np.ndarray, EI: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns the results of a simply supported beam of span 'L' and bending
+    stiffness 'EI' carrying a uniform load 'w'.
+    """
+    L = np.asarray(L, dtype=np.float64)
+    zero = np.zeros_like(L)
+    return _results(
+        w,
+        r1=L / 2,
+        r2=L / 2,
+        moment=(zero, -L**2 / 8),
+        shear=(L / 2, -L / 2),
+        deflection=(zero, -5 * (L**2)**2 / (384 * EI)),
+    )
+
+
+def cantilever(w: np.ndarray, L: np.ndarray, EI: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns the results of a cantilever of length 'L' and bending stiffness
+    'EI', fixed at its left end ("R1"), carrying a uniform load 'w'. "R2" is zero.
+    """
+    L = np.asarray(L, dtype=np.float64)
+    zero = np.zeros_like(L)
+    return _results(
+        w,
+        r1=L,
+        r2=zero,
+        moment=(L**2 / 2, zero),
+        shear=(L, zero),
+        deflection=(zero, -(L**2)**2 / (8 * EI)),
+    )
+
+
+# Location of the maximum deflection of a propped cantilever, measured from the
+# prop as a fraction of the span, and the deflection there as a multiple of wL**4/EI
+PROPPED_T = (1 + np.sqrt(33)) / 16
+PROPPED_DEFLECTION = (PROPPED_T - 3 * PROPPED_T**3 + 2 * PROPPED_T**4) / 48
+
+
+def propped_cantilever(w: np.ndarray, L: np.ndarray, EI: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns the results of a propped cantilever of span 'L' and bending
+    stiffness 'EI', fixed at its left end ("R1") and simply supported at its
+    right end ("R2"), carrying a uniform load 'w'.
+    """
+    L = np.asarray(L, dtype=np.float64)
+    zero = np.zeros_like(L)
+    return _results(
+        w,
+        r1=5 * L / 8,
+        r2=3 * L / 8,
+        moment=(L**2 / 8, -9 * L**2 / 128),
+        shear=(5 * L / 8, -3 * L / 8),
+        deflection=(zero, -PROPPED_DEFLECTION * (L**2)**2 / EI),
+    )
+
+
+def cubic_roots(c3: np.ndarray, c2: np.ndarray, c1: np.ndarray, c0: np.ndarray) -> np.ndarray:
+    """
+    Returns an array of shape (..., 3) of the real roots of each cubic
+    c3*x**3 + c2*x**2 + c1*x + c0 (c3 != 0), padded with NaN where a cubic
+    has fewer than three real roots.
+    """
+    c3, c2, c1, c0 = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64) for c in (c3, c2, c1, c0)))
+    shape = c3.shape
+    a, b, c = (np.ravel(coeff / c3) for coeff in (c2, c1, c0))
+    # Depressed cubic y**3 + p*y + r = 0 with x = y - a/3
+    p = b - a**2 / 3
+    r = a * (2 * a**2 / 27 - b / 3) + c
+    discriminant = (r / 2)**2 + (p / 3)**2 * (p / 3)
+    roots = np.full((len(a), 3), np.nan)
+
+    one_root = discriminant >= 0
+    r_one, sqrt_disc = r[one_root], np.sqrt(discriminant[one_root])
+    roots[one_root, 0] = np.cbrt(-r_one / 2 + sqrt_disc) + np.cbrt(-r_one / 2 - sqrt_disc)
+
+    # Three real roots (p < 0): the trigonometric solution
+    three_roots = ~one_root
+    p_three = p[three_roots]
+    m = 2 * np.sqrt(-p_three / 3)
+    theta = np.arccos(np.clip(3 * r[three_roots] / (2 * p_three) * np.sqrt(-3 / p_three), -1, 1)) / 3
+    cos_theta, sin_theta = m * np.cos(theta), m * np.sin(theta) * (np.sqrt(3) / 2)
+    roots[three_roots] = np.stack([cos_theta, sin_theta - cos_theta / 2, -sin_theta - cos_theta / 2], axis=1)
+    roots -= a[:, None] / 3
+    return roots.reshape(shape + (3,))
+
+
+def overhang(w: np.ndarray, b: np.ndarray, a: np.ndarray, EI: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns the results of a beam simply supported at its left end ("R1")
+    and at 'b' ("R2") with a cantilever of length 'a' beyond the second
+    support, of bending stiffness 'EI' and carrying a uniform load 'w' over
+    its full length 'b' + 'a'.
+    """
+    b, a, EI = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (b, a, EI)))
+    L = b + a
+    r2 = L**2 / (2 * b)
+    r1 = L - r2
+
+    # Deflections (downward) under a unit load, from the standard formulae:
+    # backspan at t = x/b: b**4/(24EI) * (t(1 - 2alpha**2) - 2t**3(1 - alpha**2) + t**4)
+    # overhang at z from the support: z/(24EI) * (4a**2 b - b**3 + 6a**2 z - 4a z**2 + z**3)
+    # The extremes are at the roots of their (cubic) derivatives or at the tip.
+    alpha = (a / b)[..., None]
+    t = cubic_roots(np.full_like(b, 4.), -6 * (1 - alpha[..., 0]**2), np.zeros_like(b), 1 - 2 * alpha[..., 0]**2)
+    t = np.where((t > 0) & (t < 1), t, 0.)
+    span = ((b**2)**2 / (24 * EI))[..., None] * t * (1 - 2 * alpha**2 + t**2 * (t - 2 * (1 - alpha**2)))
+    linear_term = b * (4 * a**2 - b**2) # the coefficient of z in the overhang deflection
+    z = cubic_roots(np.full_like(a, 4.), -12 * a, 12 * a**2, linear_term)
+    a_ = a[..., None]
+    z = np.where((z > 0) & (z < a_), z, 0.)
+    z = np.concatenate([z, a_], axis=-1) # the tip
+    cant = z / (24 * EI[..., None]) * (linear_term[..., None] + z * (6 * a_**2 + z * (z - 4 * a_)))
+    down = np.concatenate([span, cant], axis=-1)
+
+    return _results(
+        w,
+        r1=r1,
+        r2=r2,
+        moment=(a**2 / 2, -np.where(r1 > 0, r1**2 / 2, 0.)),
+        shear=(np.maximum(r1, a), np.minimum(r1 - b, 0.)),
+        deflection=(np.maximum(-down.min(axis=-1), 0.), np.minimum(-down.max(axis=-1), 0.)),
+    )
+
+
+def standard_case(beam_data: dict) -> tuple | None:
+    """
+    Returns a tuple (formula, lengths, mirrored, load_cases, w) if the beam in
+    'beam_data' (structured as by beams.get_structured_beam_data) is one of the
+    standard beams above with each of its load cases a uniform "Fy" load over
+    its full length, or None otherwise.
+        - 'formula' is the function giving the beam's results and 'lengths'
+          the length arguments it takes before 'w' and 'EI'
+        - 'mirrored' is True when the beam is the formula's beam reversed
+          (e.g. a cantilever fixed at its right end)
+        - 'w' is an array of the load intensity of each of 'load_cases'
+    """
+    L = beam_data['L']
+    load_cases = []
+    w = []
+    for load in beam_data['Loads']:
+        if (
+            load['Type'] != "Dist" or load['Direction'] != "Fy"
+            or load['Start Location'] != 0 or load['End Location'] != L
+            or load['Start Magnitude'] != load['End Magnitude']
+        ):
+            return None
+        if load['Case'] not in load_cases:
+            load_cases.append(load['Case'])
+            w.append(0.)
+        w[load_cases.index(load['Case'])] += load['Start Magnitude']
+
+    supports = sorted(beam_data['Supports'].items())
+    locations = [x for x, _ in supports]
+    types = ["F" if sup_type == "F" else "P" for _, sup_type in supports]
+    if types == ["F"] and locations[0] in (0, L):
+        formula, lengths, mirrored = cantilever, (L,), locations[0] == L
+    elif types == ["P", "P"] and locations == [0, L]:
+        formula, lengths, mirrored = simply_supported, (L,), False
+    elif types == ["F", "P"] and locations == [0, L]:
+        formula, lengths, mirrored = propped_cantilever, (L,), False
+    elif types == ["P", "F"] and locations == [0, L]:
+        formula, lengths, mirrored = propped_cantilever, (L,), True
+    elif types == ["P", "P"] and locations[0] == 0 and locations[1] < L:
+        formula, lengths, mirrored = overhang, (locations[1], L - locations[1]), False
+    elif types == ["P", "P"] and locations[0] > 0 and locations[1] == L:
+        formula, lengths, mirrored = overhang, (L - locations[0], locations[0]), True
+    else:
+        return None
+    return formula, lengths, mirrored, load_cases, np.array(w)
+
+
+def standard_beam_results(beam_data: dict) -> list[dict] | None:
+    """
+    Returns the results of the beam in 'beam_data' from the closed-form
+    solutions, as a list of dicts in the same form as beams.beam_results, if it
+    is a standard beam (see standard_case), or None otherwise.
+    """
+    case = standard_case(beam_data)
+    if case is None:
+        return None
+    formula, lengths, mirrored, load_cases, w = case
+    results = formula(w, *lengths, beam_data['E'] * beam_data['Iz'])
+    support_locations = sorted(beam_data['Supports'])
+    if mirrored:
+        # Reversing the beam swaps its reactions and changes the sign of its shear
+        r_left, r_right = results["R2"], results["R1"]
+        max_shear, min_shear = -results["Min Shear"], -results["Max Shear"]
+    else:
+        r_left, r_right = results["R1"], results["R2"]
+        max_shear, min_shear = results["Max Shear"], results["Min Shear"]
+    reactions = [results["R1"]] if len(support_locations) == 1 else [r_left, r_right]
+    rows = []
+    for idx, load_case in enumerate(load_cases):
+        rows.append({
+            "Name": beam_data['Name'],
+            "Combo": load_case,
+            "Max Moment": float(results["Max Moment"][idx]),
+            "Min Moment": float(results["Min Moment"][idx]),
+            "Max Shear": float(max_shear[idx]),
+            "Min Shear": float(min_shear[idx]),
+            "Max Deflection": float(results["Max Deflection"][idx]),
+            "Min Deflection": float(results["Min Deflection"][idx]),
+            "Reactions": {
+                x_coord: float(reaction[idx]) for x_coord, reaction in zip(support_locations, reactions)
+            },
+            "Error": "",
+        })
+    return rows
@@ -1,7 +1,21 @@
+import argparse
 import math
 import csv
+import functools
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+import numpy as np
 from PyNite import FEModel3D, Visualization
 from eng_module.utils import str_to_int,str_to_float,read_csv_file
+import eng_module.beam_formulas as beam_formulas
 
 def get_spans(beam_length:float,cant_support_loc:float):
     """
@@ -110,25 +124,14 @@ def beam_reactions_ss_cant(
     Returms the reactions "R1" and "R2" for a simply supported beam
     with a continuous cantilever on one end. R2 is the backspan support and R1 is the hammer support.
     """
-    length=b+a
-    centroid_of_udl=length/2
-    equiv_point_load=w*length
-    print(equiv_point_load)
-    r1=equiv_point_load*centroid_of_udl/b
-    r2=equiv_point_load-r1
-    print(r1,r2,r1+r2)
-    return -r1,-r2
+    results = beam_formulas.overhang(w, b, a, EI=1.)
+    return float(results["R2"]), float(results["R1"])
 
 def read_beam_file(filename:str)->list[list[str]]:
     """
     Returns a string representing the text data in the file
     at 'filename'.
     """
-    csvfile_data=[]
-    with open(filename,"r") as csv_file:
-        csv_reader = csv.reader(csv_file)
-        for line in csv_reader:
-            csvfile_data.append(line)
     return read_csv_file(filename)
 
 def separate_data(filename:list[str])->list[list[str]]:
@@ -161,12 +164,135 @@ def get_structured_beam_data(filename:list[list[str]])->dict:
     """
     This function returns a dictionary with the input beam data parcelled out.
     """
+    numeric_data = convert_to_numeric(filename)
     beam_dict = {}
     beam_dict['Name']=filename[0][0]
-    beam_dict.update(parse_beam_attributes(convert_to_numeric(filename)[1]))
-    beam_dict['Supports']=parse_supports(convert_to_numeric(filename)[2])
-    beam_dict['Loads']=parse_loads(convert_to_numeric(filename)[3:])
+    beam_dict.update(parse_beam_attributes(numeric_data[1]))
+    beam_dict['Supports']=parse_supports(numeric_data[2])
+    beam_dict['Loads']=parse_loads(numeric_data[3:])
     return beam_dict 
+
+
+class BeamFileError(ValueError):
+    """
+    Raised when a line of a beam file does not follow the beam file format.
+    """
+    def __init__(self, filename: str, line_number: int, message: str):
+        self.filename = filename
+        self.line_number = line_number
+        super().__init__(f"{filename}, line {line_number}: {message}")
+
+
+SUPPORT_TYPES = ("P", "R", "F")
+BEAM_ATTRIBUTES = ("L", "E", "Iz", "Iy", "A", "J", "nu", "rho")
+
+
+def parse_beam_lines(lines: Iterable[str], filename: str = "<beam data>") -> Iterator[dict]:
+    """
+    Yields a dict, structured as by get_structured_beam_data, for each beam
+    described in 'lines' (e.g. an open beam file).
+
+    The lines are read in a single pass. Several beams can follow one another:
+    a new beam starts after a blank line or at any line after the supports
+    that is not a load (i.e. the name line of the next beam).
+
+    Raises a BeamFileError giving 'filename' and the line number if a line
+    cannot be parsed.
+    """
+    beam_dict = None
+    stage = "name"
+    for line_number, fields in enumerate(csv.reader(lines), start=1):
+        if not fields or not "".join(fields).strip():
+            if beam_dict is not None:
+                if stage != "loads":
+                    raise BeamFileError(filename, line_number, f"beam '{beam_dict['Name']}' is incomplete")
+                yield beam_dict
+                beam_dict = None
+            stage = "name"
+            continue
+
+        if stage == "loads" and not fields[0].lstrip().upper().startswith(("POINT:", "DIST:")):
+            yield beam_dict
+            stage = "name"
+
+        if stage == "name":
+            beam_dict = {'Name': fields[0].strip()}
+            stage = "attributes"
+        elif stage == "attributes":
+            try:
+                attributes = [float(field) for field in fields]
+            except ValueError:
+                raise BeamFileError(filename, line_number, f"beam attributes must be numeric: {fields}") from None
+            beam_dict.update(zip(BEAM_ATTRIBUTES, attributes))
+            for attr in BEAM_ATTRIBUTES[len(attributes):]:
+                beam_dict[attr] = 1.0
+            stage = "supports"
+        elif stage == "supports":
+            supports = {}
+            for support in fields:
+                sup_loc, _, sup_type = support.partition(":")
+                sup_type = sup_type.strip()
+                try:
+                    supports[float(sup_loc)] = sup_type
+                except ValueError:
+                    raise BeamFileError(filename, line_number, f"invalid support location: '{support}'") from None
+                if sup_type not in SUPPORT_TYPES:
+                    raise BeamFileError(filename, line_number, f"invalid support type: '{support}'")
+            beam_dict['Supports'] = supports
+            beam_dict['Loads'] = []
+            stage = "loads"
+        else:
+            beam_dict['Loads'].append(_parse_load_fields(fields, filename, line_number))
+
+    if beam_dict is not None:
+        if stage != "loads":
+            raise BeamFileError(filename, line_number, f"beam '{beam_dict['Name']}' is incomplete")
+        yield beam_dict
+
+
+def _parse_load_fields(fields: list[str], filename: str, line_number: int) -> dict:
+    """
+    Returns the load on one line of a beam file, structured as by parse_loads.
+    """
+    load_type, _, load_dir = fields[0].strip().partition(":")
+    load_type = load_type.upper()
+    n_values = 2 if load_type == "POINT" else 4
+    try:
+        values = [float(field) for field in fields[1:n_values + 1]]
+    except ValueError:
+        raise BeamFileError(filename, line_number, f"load values must be numeric: {fields}") from None
+    if len(values) != n_values:
+        raise BeamFileError(filename, line_number, f"a {load_type} load needs {n_values} values: {fields}")
+    load_case = fields[-1].split(":")[-1].strip()
+    if load_type == "POINT":
+        return {"Type": "Point",
+                "Direction": load_dir.title(),
+                "Magnitude": values[0],
+                "Location": values[1],
+                "Case": load_case}
+    return {"Type": "Dist",
+            "Direction": load_dir.title(),
+            "Start Magnitude": values[0],
+            "End Magnitude": values[1],
+            "Start Location": values[2],
+            "End Location": values[3],
+            "Case": load_case}
+
+
+def iter_beam_records(source: str, pattern: str = "*.txt") -> Iterator[dict]:
+    """
+    Yields a dict, structured as by get_structured_beam_data, for each beam
+    in 'source', which may be a beam file, a file of several beams one after
+    the other, or a directory. For a directory, every file matching 'pattern'
+    is read in name order.
+    """
+    if os.path.isdir(source):
+        filenames = sorted(glob.glob(os.path.join(source, pattern)))
+    else:
+        filenames = [source]
+    for filename in filenames:
+        with open(filename, "r", newline="") as beam_file:
+            yield from parse_beam_lines(beam_file, filename)
   
 def get_node_locations(support_locations: list[float], beam_length: float) -> dict[str, float]:
     """
@@ -261,7 +387,7 @@ def load_beam_model(filename:str) -> FEModel3D:
     It assumes model the beam is a simply supported beam
     with variable number of supports and the beam is loaded with a UDL
     """
-    beam_model=build_beam(get_structured_beam_data(read_beam_file(filename)))
+    beam_model=build_beam(next(iter_beam_records(filename)))
     return beam_model
 
 def parse_supports(filename:list[str])->dict[float, str]:
@@ -318,12 +444,496 @@ def parse_beam_attributes(filename:list[float]) -> dict[str, float]:
     in 'beam_attributes' in the order according to the beam file format BEAM_FORMAT.md,
     Workbook_04 edition. The order of attributes are as follows: Length,E,Iz,[Iy,A,J,nu,rho]
     """
-    ATTR_ORDER = ["L", "E", "Iz", "Iy", "A", "J", "nu", "rho"]
     parsed = {}
-    for idx, attr in enumerate(ATTR_ORDER):
+    for idx, attr in enumerate(BEAM_ATTRIBUTES):
         try:
             attr_present = filename[idx]
             parsed.update({attr: attr_present})
         except IndexError:
             parsed.update({attr: 1.0})
-    return parsed
\ No newline at end of file
+    return parsed
+
+RESULT_FIELDS = [
+    "File", "Name", "Combo",
+    "Max Moment", "Min Moment", "Max Shear", "Min Shear", "Max Deflection", "Min Deflection",
+    "Reactions", "Error",
+]
+
+
+def beam_results(beam_model: FEModel3D, beam_data: dict) -> list[dict]:
+    """
+    Returns a list of dicts, one per load combination of the analysed
+    'beam_model' built from 'beam_data' by build_beam, holding the maximum and
+    minimum moment (Mz), shear (Fy) and deflection (dy) of the beam and its
+    vertical reactions keyed by support location.
+    """
+    member = beam_model.Members[beam_data['Name']]
+    support_nodes = {
+        node_name: x_coord for node_name, x_coord in beam_data['Nodes'].items()
+        if x_coord in beam_data['Supports']
+    }
+    results = []
+    for combo_name in beam_model.LoadCombos:
+        results.append({
+            "Name": beam_data['Name'],
+            "Combo": combo_name,
+            "Max Moment": member.max_moment("Mz", combo_name),
+            "Min Moment": member.min_moment("Mz", combo_name),
+            "Max Shear": member.max_shear("Fy", combo_name),
+            "Min Shear": member.min_shear("Fy", combo_name),
+            "Max Deflection": member.max_deflection("dy", combo_name),
+            "Min Deflection": member.min_deflection("dy", combo_name),
+            "Reactions": {
+                x_coord: beam_model.Nodes[node_name].RxnFY[combo_name]
+                for node_name, x_coord in support_nodes.items()
+            },
+            "Error": "",
+        })
+    return results
+
+
+def beam_diagrams(
+    beam_model: FEModel3D,
+    beam_data: dict,
+    n_points: int = 1001,
+    combo_names: list[str] | None = None,
+) -> dict[str, dict]:
+    """
+    Returns a dict keyed by load combination name (all of the combinations
+    of 'beam_model' by default) of the shear (Fy), moment (Mz) and deflection
+    (dy) diagrams of the analysed 'beam_model' built from 'beam_data' by
+    build_beam. Each value is a dict of:
+        - "x": n_points locations along the beam plus the supports and load
+          discontinuities, which appear twice (just left, then just right)
+        - "Shear", "Moment", "Deflection": arrays of the values at "x"
+        - "Max Shear", "Min Shear", ...: the extreme values and
+        - "Max Shear Location", "Min Shear Location", ...: where they occur
+
+    Signs are those of Member3D.shear, .moment and .deflection. Rather than
+    querying the member point by point, the diagrams are rebuilt from the
+    support reactions, the displacement of the left end and the member loads
+    (all "Fy") as Macaulay terms, evaluated for every point and combination
+    in a few matrix products.
+    """
+    member = beam_model.Members[beam_data['Name']]
+    length = beam_data['L']
+    EI = beam_data['E'] * beam_data['Iz']
+    if combo_names is None:
+        combo_names = list(beam_model.LoadCombos)
+    combos = [beam_model.LoadCombos[combo_name] for combo_name in combo_names]
+
+    def factors(case: str) -> np.ndarray:
+        return np.array([combo.factors.get(case, 0.) for combo in combos])
+
+    # Point forces: the point loads and the support reactions
+    force_locations, forces = [], []
+    for direction, magnitude, location, case in member.PtLoads:
+        if direction != "Fy":
+            raise ValueError(f"Only 'Fy' loads can be extracted, not '{direction}'.")
+        force_locations.append(location)
+        forces.append(magnitude * factors(case))
+    couple_locations, couples = [], []
+    for node_name, x_coord in beam_data['Nodes'].items():
+        node = beam_model.Nodes[node_name]
+        force_locations.append(x_coord)
+        forces.append(np.array([node.RxnFY[combo_name] for combo_name in combo_names]))
+        couple_locations.append(x_coord)
+        couples.append(np.array([node.RxnMZ[combo_name] for combo_name in combo_names]))
+    # Linearly varying distributed loads
+    starts, ends, w_starts, w_ends = [], [], [], []
+    for direction, w1, w2, x1, x2, case in member.DistLoads:
+        if direction != "Fy":
+            raise ValueError(f"Only 'Fy' loads can be extracted, not '{direction}'.")
+        if x2 <= x1:
+            continue
+        starts.append(x1)
+        ends.append(x2)
+        w_starts.append(w1 * factors(case))
+        w_ends.append(w2 * factors(case))
+
+    n_combos = len(combo_names)
+    force_locations, couple_locations = np.array(force_locations), np.array(couple_locations)
+    starts, ends = np.array(starts), np.array(ends)
+    forces = np.array(forces).reshape(-1, n_combos)
+    couples = np.array(couples).reshape(-1, n_combos)
+    w_starts = np.array(w_starts).reshape(-1, n_combos)
+    w_ends = np.array(w_ends).reshape(-1, n_combos)
+    slopes = (w_ends - w_starts) / (ends - starts)[:, None] if len(starts) else w_starts
+
+    # The points, with each interior discontinuity evaluated on both sides
+    discontinuities = np.unique(np.concatenate([force_locations, starts, ends]))
+    interior = discontinuities[(discontinuities > 0) & (discontinuities < length)]
+    x = np.union1d(np.linspace(0, length, n_points), discontinuities)
+    right = x < length # the end of the beam is taken from the left
+    x = np.concatenate([x, interior])
+    right = np.concatenate([right, np.zeros(len(interior), dtype=bool)])
+    order = np.lexsort((right, x))
+    x, right = x[order], right[order]
+
+    def macaulay(locations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the step <x - a>**0 and ramp <x - a> of each point x and location a.
+        """
+        distance = x[:, None] - locations[None, :]
+        step = (distance > 0) | ((distance == 0) & right[:, None])
+        return step.astype(np.float64), np.where(step, distance, 0.)
+
+    force_step, force_ramp = macaulay(force_locations)
+    couple_step, couple_ramp = macaulay(couple_locations)
+    start_step, start_ramp = macaulay(starts)
+    end_step, end_ramp = macaulay(ends)
+    start_ramp2, end_ramp2 = start_ramp**2, end_ramp**2
+    start_ramp3, end_ramp3 = start_ramp2 * start_ramp, end_ramp2 * end_ramp
+
+    shear = (
+        force_step @ forces
+        + start_ramp @ w_starts + start_ramp2 / 2 @ slopes
+        - end_ramp @ w_ends - end_ramp2 / 2 @ slopes
+    )
+    sagging = (
+        force_ramp @ forces - couple_step @ couples
+        + start_ramp2 / 2 @ w_starts + start_ramp3 / 6 @ slopes
+        - end_ramp2 / 2 @ w_ends - end_ramp3 / 6 @ slopes
+    )
+    left_node = beam_model.Nodes[member.i_node.name]
+    v_0 = np.array([left_node.DY[combo_name] for combo_name in combo_names])
+    theta_0 = np.array([left_node.RZ[combo_name] for combo_name in combo_names])
+    deflection = v_0 + x[:, None] * theta_0 + (
+        force_ramp**3 / 6 @ forces - couple_ramp**2 / 2 @ couples
+        + start_ramp2**2 / 24 @ w_starts + start_ramp2 * start_ramp3 / 120 @ slopes
+        - end_ramp2**2 / 24 @ w_ends - end_ramp2 * end_ramp3 / 120 @ slopes
+    ) / EI
+
+    diagrams = {"Shear": shear, "Moment": -sagging, "Deflection": deflection}
+    results = {}
+    for idx, combo_name in enumerate(combo_names):
+        result = {"x": x}
+        for quantity, values in diagrams.items():
+            values = values[:, idx]
+            max_idx, min_idx = values.argmax(), values.argmin()
+            result[quantity] = values
+            result[f"Max {quantity}"] = values[max_idx]
+            result[f"Min {quantity}"] = values[min_idx]
+            result[f"Max {quantity} Location"] = x[max_idx]
+            result[f"Min {quantity} Location"] = x[min_idx]
+        results[combo_name] = result
+    return results
+
+
+def analyze_beam(beam_data: dict, closed_form: bool = True) -> list[dict]:
+    """
+    Returns the beam_results of the beam in 'beam_data'.
+
+    'closed_form': when True, standard beams (see beam_formulas.standard_case)
+        are solved with the closed-form solutions instead of an FE model.
+    """
+    if closed_form:
+        standard_rows = beam_formulas.standard_beam_results(beam_data)
+        if standard_rows is not None:
+            return standard_rows
+    beam_model = build_beam(beam_data)
+    beam_model.analyze()
+    return beam_results(beam_model, beam_data)
+
+
+# Part of every beam_hash: bump it when analyze_beam's results change so that
+# results cached by earlier versions are not used
+BEAM_CACHE_VERSION = 1
+
+# The beam_data keys that determine the results of an analysis
+BEAM_HASH_KEYS = ('L', 'E', 'Iz', 'Iy', 'A', 'J', 'nu', 'rho')
+
+
+def beam_hash(beam_data: dict, closed_form: bool = True) -> str:
+    """
+    Returns a sha256 hex digest identifying the analysis of the beam in
+    'beam_data' (structured as by get_structured_beam_data): its geometry,
+    material, supports and loads. The beam's name and the "Nodes" added by
+    build_beam are not part of it, and equal numbers hash the same whether
+    they are ints or floats.
+    """
+    canonical = {
+        "version": BEAM_CACHE_VERSION,
+        "closed_form": closed_form,
+        "attributes": [float(beam_data.get(key, 1.)) for key in BEAM_HASH_KEYS],
+        "supports": sorted((float(x_coord), sup_type) for x_coord, sup_type in beam_data['Supports'].items()),
+        "loads": [
+            {key: float(value) if isinstance(value, (int, float)) else value for key, value in load.items()}
+            for load in beam_data['Loads']
+        ],
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+class BeamResultCache:
+    """
+    A cache of the results of analyze_beam keyed by beam_hash, so a beam
+    that was analysed before, under any name, is not analysed again.
+
+    'maxsize': the number of beams whose results are kept in memory
+    'directory': if given, results are also pickled into this directory and
+        read back from it when they are not in memory
+    'max_bytes': the size the files in 'directory' are kept under by deleting
+        the least recently used ones. Each process only counts the files it
+        has seen, so processes sharing a directory can overshoot it briefly.
+    """
+    def __init__(self, maxsize: int = 1024, directory: str | None = None, max_bytes: int = 64 * 2**20):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.results = OrderedDict()
+        self.files = None # OrderedDict of path: size, least recently used first
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns a dict of the hit, miss and eviction counts and sizes of the cache.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.results),
+            "disk_bytes": sum(self.files.values()) if self.files else 0,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.,
+        }
+
+    def clear(self) -> None:
+        """
+        Empties the in-memory cache and resets the statistics. The on-disk
+        store is left as is.
+        """
+        self.results.clear()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key[:32]}.pkl")
+
+    def _disk_files(self) -> OrderedDict:
+        """
+        Returns the OrderedDict of the cache files in 'directory' and their
+        sizes, scanning the directory, oldest first, on the first call.
+        """
+        if self.files is None:
+            self.files = OrderedDict()
+            if os.path.isdir(self.directory):
+                entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pkl")]
+                for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+                    self.files[entry.path] = entry.stat().st_size
+        return self.files
+
+    def _read(self, key: str) -> list[dict] | None:
+        """
+        Returns the results stored on disk under 'key', or None if there are none.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                rows = pickle.load(file)
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        files = self._disk_files()
+        files[path] = files.get(path, os.path.getsize(path))
+        files.move_to_end(path)
+        return rows
+
+    def _write(self, key: str, rows: list[dict]) -> None:
+        """
+        Stores 'rows' on disk under 'key' and evicts the least recently used
+        files while the store is over 'max_bytes'.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        files = self._disk_files()
+        files[path] = os.path.getsize(path)
+        files.move_to_end(path)
+        total = sum(files.values())
+        while total > self.max_bytes and len(files) > 1:
+            old_path, size = files.popitem(last=False)
+            total -= size
+            self.evictions += 1
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    def get_results(self, beam_data: dict, closed_form: bool = True) -> list[dict]:
+        """
+        Returns the analyze_beam results of 'beam_data', analysing the beam
+        only if no beam with the same beam_hash was analysed before. The rows
+        returned are copies and carry the name in 'beam_data'.
+        """
+        key = beam_hash(beam_data, closed_form)
+        rows = self.results.get(key)
+        if rows is not None:
+            self.results.move_to_end(key)
+            self.hits += 1
+        else:
+            if self.directory is not None:
+                rows = self._read(key)
+            if rows is not None:
+                self.disk_hits += 1
+            else:
+                rows = [
+                    {field: value for field, value in row.items() if field != "Name"}
+                    for row in analyze_beam(beam_data, closed_form)
+                ]
+                self.misses += 1
+                if self.directory is not None:
+                    self._write(key, rows)
+            self.results[key] = rows
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+        return [{**row, "Name": beam_data['Name'], "Reactions": dict(row["Reactions"])} for row in rows]
+
+
+# One BeamResultCache per cache directory, shared by the analyze_beam_file
+# calls of a process
+_result_caches = {}
+
+
+def result_cache(directory: str) -> BeamResultCache:
+    """
+    Returns this process's BeamResultCache for 'directory', creating it on first use.
+    """
+    if directory not in _result_caches:
+        _result_caches[directory] = BeamResultCache(directory=directory)
+    return _result_caches[directory]
+
+
+def analyze_beam_file(filename: str, closed_form: bool = True, cache_dir: str | None = None) -> list[dict]:
+    """
+    Returns the beam_results of every beam in the beam file at 'filename',
+    each tagged with the file name. A beam that cannot be built or analysed,
+    or a file that cannot be parsed, gives a single row with its "Error" set
+    instead of raising.
+
+    'closed_form': passed to analyze_beam.
+    'cache_dir': if given, results are taken from and added to the
+        result_cache of this directory. The rows of each beam are then marked
+        "Cached" if they came from the cache.
+    """
+    cache = result_cache(cache_dir) if cache_dir is not None else None
+    rows = []
+    try:
+        for beam_data in iter_beam_records(filename):
+            try:
+                if cache is None:
+                    rows.extend(analyze_beam(beam_data, closed_form))
+                    continue
+                misses = cache.misses
+                beam_rows = cache.get_results(beam_data, closed_form)
+                for row in beam_rows:
+                    row["Cached"] = cache.misses == misses
+                rows.extend(beam_rows)
+            except Exception as error:
+                rows.append({"Name": beam_data['Name'], "Error": f"{type(error).__name__}: {error}"})
+    except Exception as error:
+        rows.append({"Name": "", "Error": f"{type(error).__name__}: {error}"})
+    for row in rows:
+        row["File"] = filename
+    return rows
+
+
+def beam_filenames(source: str, pattern: str = "*.txt") -> list[str]:
+    """
+    Returns the sorted beam file names in 'source', which may be a directory
+    (searched with 'pattern'), a glob pattern or a single file.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, pattern)))
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+    return [source]
+
+
+def analyze_beam_files(
+    source: str,
+    pattern: str = "*.txt",
+    workers: int | None = None,
+    chunksize: int = 4,
+    closed_form: bool = True,
+    cache_dir: str | None = None,
+) -> Iterator[dict]:
+    """
+    Yields the result rows (see beam_results and analyze_beam_file) of every
+    beam in the files in 'source' (see beam_filenames) as they are analysed.
+
+    'workers': the number of processes the files are spread across. 1 runs
+        in this process; None uses one process per CPU.
+    'chunksize': the number of files sent to a process at a time.
+    'closed_form', 'cache_dir': passed to analyze_beam_file.
+    """
+    filenames = beam_filenames(source, pattern)
+    analyze = functools.partial(analyze_beam_file, closed_form=closed_form, cache_dir=cache_dir)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        for filename in filenames:
+            yield from analyze(filename)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in executor.map(analyze, filenames, chunksize=chunksize):
+            yield from rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Command line entry point analysing a batch of beam files, e.g.
+        python -m eng_module.beams test_data --pattern "beam_*-wk4.txt" -o results.csv
+    """
+    parser = argparse.ArgumentParser(description="Analyse a batch of beam files.")
+    parser.add_argument("source", help="a directory, glob pattern or beam file")
+    parser.add_argument("--pattern", default="*.txt", help="file pattern used when 'source' is a directory")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: one per CPU)")
+    parser.add_argument("-o", "--output", default=None, help="csv file to write (default: standard output)")
+    parser.add_argument("--fe", action="store_true", help="analyse standard beams with FE models too")
+    parser.add_argument("--cache", default=None, help="directory of cached results to reuse and add to")
+    args = parser.parse_args(argv)
+
+    out_file = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.DictWriter(out_file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    beams_done = set()
+    beams_cached = set()
+    failures = 0
+    start = time.perf_counter()
+    try:
+        rows = analyze_beam_files(args.source, args.pattern, args.workers, closed_form=not args.fe, cache_dir=args.cache)
+        for row in rows:
+            beams_done.add((row["File"], row["Name"]))
+            if row.get("Cached"):
+                beams_cached.add((row["File"], row["Name"]))
+            failures += bool(row["Error"])
+            if "Reactions" in row:
+                row["Reactions"] = ";".join(f"{x_coord}:{rxn}" for x_coord, rxn in row["Reactions"].items())
+            writer.writerow(row)
+    finally:
+        if args.output:
+            out_file.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"Analysed {len(beams_done)} beams ({failures} failed) in {elapsed:.2f} s: "
+        f"{len(beams_done) / elapsed:.1f} beams/s",
+        file=sys.stderr,
+    )
+    if args.cache:
+        hit_rate = len(beams_cached) / len(beams_done) if beams_done else 0.
+        print(f"{len(beams_cached)} beams from the cache ({hit_rate:.0%} hit rate)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Times calculate_section_stresses over sections of arcelor_mittal.csv on a
+fixed mesh against adaptive meshing (refine_section) from its default coarse
+start, and reports the largest difference in 'sig_vm Max' between the two.
+
+Usage: python benchmarks/bench_adaptive_mesh.py [number of sections] [tolerance] [fixed mesh size]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.sections_db as sections_db
+
+ACTIONS = {"N": 1e6, "Mx": 2e8}
+
+
+def main():
+    n_sections = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    mesh_size = float(sys.argv[3]) if len(sys.argv) > 3 else 100
+    catalogue = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+    # Spread the sample across the catalogue so every family is represented
+    step = max(1, len(catalogue) // n_sections)
+    sample = catalogue.iloc[::step].head(n_sections)
+
+    start = time.perf_counter()
+    fixed = sections_db.calculate_section_stresses(sample, 355, **ACTIONS, mesh_size=mesh_size)
+    fixed_time = time.perf_counter() - start
+    start = time.perf_counter()
+    adaptive = sections_db.calculate_section_stresses(sample, 355, **ACTIONS, tolerance=tolerance)
+    adaptive_time = time.perf_counter() - start
+
+    difference = np.abs(adaptive["sig_vm Max"] / fixed["sig_vm Max"] - 1).max()
+    print(f"{len(sample)} sections, tolerance {tolerance}")
+    print(f"{'':>10}{'time (s)':>10}{'mean mesh (mm2)':>17}{'mean iterations':>17}")
+    print(f"{'fixed':>10}{fixed_time:>10.2f}{mesh_size:>17.0f}{1:>17.1f}")
+    print(f"{'adaptive':>10}{adaptive_time:>10.2f}{adaptive['mesh size'].mean():>17.0f}"
+          f"{adaptive['iterations'].mean():>17.1f}")
+    print(f"speed-up {fixed_time / adaptive_time:.2f}, largest stress difference {difference:.1%}")
+
+
+if __name__ == "__main__":
+    main()
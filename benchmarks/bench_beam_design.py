@@ -0,0 +1,100 @@
+"""
+Times size_beam on random two and three span beams and compares it with a
+naive sizing loop that rebuilds and re-analyses the PyNite model of
+build_beam with every candidate section (its Iz and self weight) and the
+EC_0_COMBS combinations until the section stops changing.
+
+Usage: python benchmarks/bench_beam_design.py [number of beams]
+"""
+import math
+import sys
+import time
+
+import numpy as np
+
+import eng_module.beam_design as beam_design
+import eng_module.beams as beams
+import eng_module.load_factors as load_factors
+
+
+def random_beam(rng: np.random.Generator, idx: int) -> dict:
+    """
+    Returns the beam data of a random beam with dead and live loads.
+    """
+    n_spans = int(rng.integers(2, 4))
+    spans = rng.uniform(3000., 7000., n_spans).round()
+    supports = np.concatenate([[0.], np.cumsum(spans)])
+    length = float(supports[-1])
+    return {
+        'Name': f"Beam {idx}",
+        'L': length, 'E': 200000., 'Iz': 1e8, 'Iy': 1., 'A': 1., 'J': 1., 'nu': 0.3, 'rho': 1.,
+        'Supports': {float(x): ('P' if x == 0 else 'R') for x in supports},
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -float(rng.uniform(5, 20)),
+             'End Magnitude': -float(rng.uniform(5, 20)), 'Start Location': 0., 'End Location': length,
+             'Case': 'Dead'},
+            {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -float(rng.uniform(1e4, 8e4)),
+             'Location': float(round(rng.uniform(0, length))), 'Case': 'Live'},
+        ],
+    }
+
+
+def naive_size(beam_data: dict, fy: float = 355.) -> tuple[str, int]:
+    """
+    Returns the section name and number of PyNite analyses of the naive sizing loop.
+    """
+    index = beam_design.default_index()
+    section_name, weight, iz, analyses = None, 0., beam_data['Iz'], 0
+    while True:
+        loads = [*beam_data['Loads'], {
+            'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -weight, 'End Magnitude': -weight,
+            'Start Location': 0., 'End Location': beam_data['L'], 'Case': 'Dead',
+        }]
+        data = dict(beam_data, Iz=iz, Loads=loads)
+        beam_model = beams.build_beam(data)
+        for name, combo in {**load_factors.EC_0_COMBS, "SLS": {"D": 1.0, "L": 1.0}}.items():
+            beam_model.add_load_combo(name, {load_factors.LOAD_CASE_NAMES[k]: f for k, f in combo.items()})
+        beam_model.analyze()
+        analyses += 1
+        member = beam_model.Members[data['Name']]
+        M_Ed = max(max(abs(member.max_moment("Mz", c)), abs(member.min_moment("Mz", c))) for c in load_factors.EC_0_COMBS)
+        V_Ed = max(max(abs(member.max_shear("Fy", c)), abs(member.min_shear("Fy", c))) for c in load_factors.EC_0_COMBS)
+        deflection = max(abs(member.max_deflection("dy", "SLS")), abs(member.min_deflection("dy", "SLS")))
+        limit = max(np.diff(sorted(data['Supports']))) / 250
+        section = index.lightest({
+            "Wpl.y": ("ge", M_Ed / fy),
+            "Avz": ("ge", V_Ed * math.sqrt(3) / fy),
+            "Iy": ("ge", iz * deflection / limit),
+        })
+        if section is None or section["Section name"] == section_name or analyses > 10:
+            return section_name, analyses
+        section_name, weight, iz = section["Section name"], beam_design.self_weight(section["kg/m"]), section["Iy"]
+
+
+def main():
+    n_beams = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = np.random.default_rng(0)
+    beam_list = [random_beam(rng, idx) for idx in range(n_beams)]
+    beam_design.default_index() # load the catalogue outside of the timings
+
+    start = time.perf_counter()
+    designs = [beam_design.size_beam(beam_data) for beam_data in beam_list]
+    fast = time.perf_counter() - start
+    start = time.perf_counter()
+    naive = [naive_size(beam_data) for beam_data in beam_list]
+    slow = time.perf_counter() - start
+
+    same = sum(design["Section"] == name for design, (name, _) in zip(designs, naive))
+    print(f"{n_beams} beams, {same} sized alike by both")
+    print(
+        f"size_beam:   {fast / n_beams * 1e3:8.2f} ms per beam, "
+        f"{np.mean([design['Iterations'] for design in designs]):.1f} iterations, 1 analysis"
+    )
+    print(
+        f"naive loop:  {slow / n_beams * 1e3:8.2f} ms per beam, "
+        f"{np.mean([analyses for _, analyses in naive]):.1f} PyNite analyses"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares extracting the shear, moment and deflection diagrams of analysed
+PyNite models with beam_diagrams against querying Member3D.shear, .moment and
+.deflection point by point, for the beam in test_data/beam_1-wk4.txt and a
+four span beam with several load cases.
+
+Usage: python benchmarks/bench_beam_diagrams.py [number of points]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+import eng_module.beams as beams
+from bench_continuous_beam import FOUR_SPAN
+
+
+def per_point(beam_model, beam_data: dict, x: np.ndarray) -> dict:
+    """
+    Returns the diagrams of every combination of 'beam_model' at 'x', one member query at a time.
+    """
+    member = beam_model.Members[beam_data['Name']]
+    results = {}
+    for combo_name in beam_model.LoadCombos:
+        results[combo_name] = {
+            "Shear": np.array([member.shear("Fy", x_coord, combo_name) for x_coord in x]),
+            "Moment": np.array([member.moment("Mz", x_coord, combo_name) for x_coord in x]),
+            "Deflection": np.array([member.deflection("dy", x_coord, combo_name) for x_coord in x]),
+        }
+    return results
+
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    balcony = next(beams.iter_beam_records(os.path.join(repo, "test_data", "beam_1-wk4.txt")))
+    print(f"{'beam':<20}{'combos':>8}{'points':>8}{'per point (s)':>16}{'beam_diagrams (s)':>20}{'ratio':>8}")
+    for beam_data in (balcony, dict(FOUR_SPAN)):
+        beam_model = beams.build_beam(beam_data)
+        beam_model.analyze()
+
+        start = time.perf_counter()
+        diagrams = beams.beam_diagrams(beam_model, beam_data, n_points=n_points)
+        fast = time.perf_counter() - start
+
+        x = next(iter(diagrams.values()))["x"]
+        start = time.perf_counter()
+        per_point(beam_model, beam_data, x)
+        slow = time.perf_counter() - start
+        print(
+            f"{beam_data['Name']:<20}{len(diagrams):>8}{len(x):>8}"
+            f"{slow:>16.4f}{fast:>20.5f}{slow / fast:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares the beams per second solved by the vectorised closed-form solutions in
+beam_formulas against the PyNite model built by fe_model_ss_cant, for batches
+of simply supported beams with a cantilever carrying random uniform loads.
+
+Usage: python benchmarks/bench_beam_formulas.py [number of beams]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.beam_formulas as beam_formulas
+import eng_module.beams as beams
+
+E = 200000.
+I = 2e8
+
+
+def main():
+    n_beams = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    w = -rng.uniform(1., 50., n_beams)
+    b = rng.uniform(3000., 9000., n_beams)
+    a = rng.uniform(0., 3000., n_beams)
+
+    print(f"{'formula':<22}{'beams':>12}{'time (s)':>12}{'beams/s':>16}")
+    for name, solve in (
+        ("simply_supported", lambda: beam_formulas.simply_supported(w, b, E * I)),
+        ("cantilever", lambda: beam_formulas.cantilever(w, a, E * I)),
+        ("propped_cantilever", lambda: beam_formulas.propped_cantilever(w, b, E * I)),
+        ("overhang", lambda: beam_formulas.overhang(w, b, a, E * I)),
+    ):
+        start = time.perf_counter()
+        solve()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22}{n_beams:>12}{elapsed:>12.3f}{n_beams / elapsed:>16.0f}")
+
+    n_fe = 20
+    start = time.perf_counter()
+    for idx in range(n_fe):
+        model = beams.fe_model_ss_cant(w[idx], b[idx], a[idx], E, I, 1., 1., 0.3)
+        model.analyze()
+    elapsed = time.perf_counter() - start
+    print(f"{'fe_model_ss_cant':<22}{n_fe:>12}{elapsed:>12.3f}{n_fe / elapsed:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
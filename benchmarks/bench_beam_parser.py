@@ -0,0 +1,80 @@
+"""
+Compares the single-pass beam parser (iter_beam_records) against the previous
+read_beam_file + get_structured_beam_data path, which read each file twice and
+converted it to numbers three times.
+
+The beams are taken from test_data/beam_1-wk4.txt, written out both as one
+file per beam and as a single file of concatenated beams.
+
+Usage: python benchmarks/bench_beam_parser.py [number of beams]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import eng_module.beams as beams
+from eng_module.utils import read_csv_file
+
+
+def legacy_structured_beam_data(filename: str) -> dict:
+    """
+    Returns the structured beam data the way load_beam_model used to parse it.
+    """
+    csvfile_data = []
+    with open(filename, "r") as csv_file:
+        for line in csv.reader(csv_file):
+            csvfile_data.append(line)
+    raw_data = read_csv_file(filename)
+    beam_dict = {'Name': raw_data[0][0]}
+    beam_dict.update(beams.parse_beam_attributes(beams.convert_to_numeric(raw_data)[1]))
+    beam_dict['Supports'] = beams.parse_supports(beams.convert_to_numeric(raw_data)[2])
+    beam_dict['Loads'] = beams.parse_loads(beams.convert_to_numeric(raw_data)[3:])
+    return beam_dict
+
+
+def main():
+    n_beams = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(repo, "test_data", "beam_1-wk4.txt")) as beam_file:
+        beam_text = beam_file.read().strip() + "\n"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        beam_dir = os.path.join(tmp, "beams")
+        os.mkdir(beam_dir)
+        filenames = []
+        for idx in range(n_beams):
+            filename = os.path.join(beam_dir, f"beam_{idx:06d}.txt")
+            with open(filename, "w") as beam_file:
+                beam_file.write(beam_text)
+            filenames.append(filename)
+        concatenated = os.path.join(tmp, "all_beams.txt")
+        with open(concatenated, "w") as beam_file:
+            beam_file.write("\n".join([beam_text] * n_beams))
+
+        start = time.perf_counter()
+        legacy = [legacy_structured_beam_data(filename) for filename in filenames]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_dir = list(beams.iter_beam_records(beam_dir))
+        dir_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_file = list(beams.iter_beam_records(concatenated))
+        file_time = time.perf_counter() - start
+
+    assert legacy == from_dir == from_file
+    print(f"{n_beams} beams")
+    print(f"{'method':<40}{'time (s)':>10}{'beams/s':>12}")
+    for label, elapsed in (
+        ("read_beam_file + get_structured_beam_data", legacy_time),
+        ("iter_beam_records (directory)", dir_time),
+        ("iter_beam_records (concatenated file)", file_time),
+    ):
+        print(f"{label:<40}{elapsed:>10.3f}{n_beams / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
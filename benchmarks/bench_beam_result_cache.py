@@ -0,0 +1,45 @@
+"""
+Times the analysis of the beam in test_data/beam_1-wk4.txt without a cache,
+and the lookups of a BeamResultCache: a miss (analysis and disk write), a hit
+in memory and a hit on disk from a new cache sharing the same directory.
+
+Usage: python benchmarks/bench_beam_result_cache.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import eng_module.beams as beams
+
+
+def per_call(function, repeats: int) -> float:
+    """
+    Returns the mean time in seconds of calling 'function' 'repeats' times.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    beam_data = next(beams.iter_beam_records(os.path.join(repo, "test_data", "beam_1-wk4.txt")))
+    with tempfile.TemporaryDirectory() as directory:
+        uncached = per_call(lambda: beams.analyze_beam(dict(beam_data)), max(repeats // 20, 1))
+        edits = iter(range(repeats))
+        cache = beams.BeamResultCache(directory=directory)
+        miss = per_call(lambda: cache.get_results(dict(beam_data, L=4800.0 + next(edits))), max(repeats // 20, 1))
+        hit = per_call(lambda: cache.get_results(beam_data), repeats)
+        disk_hit = per_call(lambda: beams.BeamResultCache(directory=directory).get_results(beam_data), repeats)
+        print(f"{'analyze_beam':<24}{uncached * 1e6:>12.1f} us")
+        print(f"{'cache miss':<24}{miss * 1e6:>12.1f} us")
+        print(f"{'cache hit (memory)':<24}{hit * 1e6:>12.1f} us")
+        print(f"{'cache hit (disk)':<24}{disk_hit * 1e6:>12.1f} us")
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
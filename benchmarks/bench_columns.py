@@ -0,0 +1,65 @@
+"""
+Times ColumnCatalogue.lightest on random column cases (buckling length and
+axial load) against every section of the bundled catalogue, and compares it
+with a scalar loop checking the sections one at a time, lightest first.
+
+Usage: python benchmarks/bench_columns.py [number of cases]
+"""
+import math
+import sys
+import time
+
+import numpy as np
+
+import eng_module.beams as beams
+import eng_module.columns as columns
+import eng_module.sections_db as sections_db
+
+
+def scalar_lightest(catalogue: columns.ColumnCatalogue, length: float, load: float) -> int:
+    """
+    Returns the position of the lightest passing section of 'catalogue' for
+    one case, checking each section in turn with scalar arithmetic.
+    """
+    for idx in range(len(catalogue)):
+        if catalogue.squash_load[idx] == 0:
+            continue
+        Afy = catalogue.A[idx] * catalogue.fy[idx]
+        chi = 1.
+        for I, alpha in ((catalogue.Iy[idx], catalogue.alpha_y[idx]), (catalogue.Iz[idx], catalogue.alpha_z[idx])):
+            slenderness = math.sqrt(Afy / beams.euler_buckling_load(length, catalogue.E, I, 1.))
+            if slenderness > 0.2:
+                phi = 0.5 * (1 + alpha * (slenderness - 0.2) + slenderness**2)
+                chi = min(chi, 1 / (phi + math.sqrt(phi**2 - slenderness**2)))
+        if load <= chi * catalogue.squash_load[idx]:
+            return idx
+    return -1
+
+
+def main():
+    n_cases = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = np.random.default_rng(0)
+    lengths = rng.uniform(2000., 10000., n_cases)
+    loads = rng.uniform(1e5, 1e7, n_cases)
+
+    start = time.perf_counter()
+    catalogue = columns.ColumnCatalogue(sections_db.load_eu_pf_sections())
+    setup = time.perf_counter() - start
+    start = time.perf_counter()
+    lightest = catalogue.lightest(lengths, loads)
+    vectorized = time.perf_counter() - start
+
+    n_scalar = min(n_cases, 200)
+    start = time.perf_counter()
+    positions = [scalar_lightest(catalogue, lengths[idx], loads[idx]) for idx in range(n_scalar)]
+    scalar = (time.perf_counter() - start) / n_scalar * n_cases
+    assert positions == list(lightest["Position"][:n_scalar])
+
+    print(f"{n_cases} cases x {len(catalogue)} sections (catalogue set up in {setup * 1e3:.1f} ms)")
+    print(f"ColumnCatalogue.lightest: {vectorized:.3f} s ({n_cases / vectorized:,.0f} cases/s)")
+    print(f"Scalar loop (estimated from {n_scalar} cases): {scalar:.2f} s ({n_cases / scalar:,.0f} cases/s)")
+    print(f"Speed-up: {scalar / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares the models per second analysed by ContinuousBeam against the PyNite
+FEModel3D built by build_beam, for the beam in test_data/beam_1-wk4.txt and a
+four span beam with several load cases.
+
+Usage: python benchmarks/bench_continuous_beam.py [seconds per method]
+"""
+import os
+import sys
+import time
+
+import eng_module.beams as beams
+from eng_module.continuous_beam import ContinuousBeam
+
+FOUR_SPAN = {
+    'Name': 'Four span',
+    'L': 24000.0, 'E': 200000.0, 'Iz': 4e8, 'Iy': 1.0, 'A': 1.0, 'J': 1.0, 'nu': 0.3, 'rho': 1.0,
+    'Supports': {0.0: 'P', 6000.0: 'R', 12000.0: 'R', 18000.0: 'R', 24000.0: 'R'},
+    'Loads': [
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -20.0, 'End Magnitude': -20.0,
+         'Start Location': 0.0, 'End Location': 24000.0, 'Case': 'Dead'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -15.0, 'End Magnitude': -15.0,
+         'Start Location': 0.0, 'End Location': 12000.0, 'Case': 'Live'},
+        {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -40000.0, 'Location': 15000.0, 'Case': 'Live'},
+        {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': 5.0, 'End Magnitude': 5.0,
+         'Start Location': 0.0, 'End Location': 24000.0, 'Case': 'Wind'},
+    ],
+}
+
+
+def models_per_second(analyse, beam_data: dict, seconds: float) -> float:
+    """
+    Returns the number of times per second 'analyse' runs on 'beam_data'.
+    """
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        analyse(dict(beam_data))
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def pynite(beam_data: dict) -> None:
+    beam_model = beams.build_beam(beam_data)
+    beam_model.analyze()
+
+
+def continuous(beam_data: dict) -> None:
+    ContinuousBeam(beam_data).analyze()
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    balcony = next(beams.iter_beam_records(os.path.join(repo, "test_data", "beam_1-wk4.txt")))
+    print(f"{'beam':<20}{'PyNite (models/s)':>20}{'ContinuousBeam (models/s)':>28}{'ratio':>8}")
+    for beam_data in (balcony, FOUR_SPAN):
+        slow = models_per_second(pynite, beam_data, seconds)
+        fast = models_per_second(continuous, beam_data, seconds)
+        print(f"{beam_data['Name']:<20}{slow:>20.1f}{fast:>28.1f}{fast / slow:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Times FleetAssignment on random multi-site pours: the first solve, re-solves
+after changing one input, and a repeated solve of inputs already seen. The
+fleet is compared with sizing each site on its own from its nearest plant
+with calculate_mixers_needed.
+
+Usage: python benchmarks/bench_fleet_assignment.py [number of plants] [number of sites]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "concrete_transport_calculator"))
+
+import concrete_transport_calculator as ctc
+import fleet_assignment
+
+COSTS = {"Putzmeister P 8 HR": 1.0, "Putzmeister P 9 HR": 1.1, "Putzmeister P 10 HR": 1.2,
+         "Putzmeister P 12 HR": 1.4, "Everdigm ETM 12": 1.35}
+
+
+def main():
+    n_plants = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_sites = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = np.random.default_rng(0)
+    plants = {f"Plant {idx}": float(rate) for idx, rate in enumerate(rng.uniform(120, 250, n_plants).round())}
+    sites = {f"Site {idx}": (float(rate), 60.) for idx, rate in enumerate(rng.uniform(15, 50, n_sites).round())}
+    distances = {(plant, site): float(rng.uniform(2, 25)) for plant in plants for site in sites}
+
+    model = fleet_assignment.FleetAssignment(plants, sites, distances, costs=COSTS)
+    results = model.solve()
+    print(f"{n_plants} plants, {n_sites} sites, {len(COSTS)} mixer types: {results['Status']} "
+          f"cost {results['Cost']:.2f} with {sum(results['Mixers'].values())} mixers in {results['Time'] * 1e3:.0f} ms")
+
+    # Each site on its own from its nearest plant with the cheapest mixer per m3/hr
+    separate = 0.
+    for site, (rate, pumping_rate) in sites.items():
+        plant = min(plants, key=lambda plant: distances[(plant, site)])
+        single = fleet_assignment.FleetAssignment({plant: plants[plant]}, {site: (rate, pumping_rate)},
+                                                  {(plant, site): distances[(plant, site)]})
+        per_mixer = single.rates[:, 0]
+        best = int(np.argmin(np.array(list(COSTS.values())) / per_mixer))
+        separate += list(COSTS.values())[best] * ctc.calculate_mixers_needed(rate, per_mixer[best])
+    print(f"Sizing each site separately: cost {separate:.2f}")
+
+    changes = [
+        ("site rate", lambda: model.set_site("Site 0", required_rate=sites["Site 0"][0] + 10)),
+        ("distance", lambda: model.set_distance("Plant 0", "Site 1", 30.)),
+        ("plant rate", lambda: model.set_plant("Plant 1", plants["Plant 1"] * 0.8)),
+        ("mixer cost", lambda: model.set_mixer("Everdigm ETM 12", cost=1.2)),
+    ]
+    for name, change in changes:
+        start = time.perf_counter()
+        change()
+        results = model.solve()
+        print(f"Re-solve after a {name} change: {(time.perf_counter() - start) * 1e3:.0f} ms ({results['Status']})")
+
+    model.set_site("Site 0", required_rate=sites["Site 0"][0])
+    model.set_distance("Plant 0", "Site 1", distances[("Plant 0", "Site 1")])
+    model.set_plant("Plant 1", plants["Plant 1"])
+    model.set_mixer("Everdigm ETM 12", cost=COSTS["Everdigm ETM 12"])
+    start = time.perf_counter()
+    model.solve()
+    print(f"Solve of the original inputs again: {(time.perf_counter() - start) * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
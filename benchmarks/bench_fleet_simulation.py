@@ -0,0 +1,37 @@
+"""
+Times simulate_fleet on a full-day pour (hundreds of mixer trips) with and
+without recording the timelines and queue series.
+
+Usage: python benchmarks/bench_fleet_simulation.py [volume in m3]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "concrete_transport_calculator"))
+
+import fleet_simulation
+
+
+def main():
+    volume = float(sys.argv[1]) if len(sys.argv) > 1 else 2000.
+    kwargs = dict(
+        num_mixers=30, mixer_volume=10, total_volume=volume, transit_time=35,
+        batch_plant_rate=120, pumping_rate=40, num_plants=2, num_pumps=3, maneuver_allowance=20,
+    )
+    results = fleet_simulation.simulate_fleet(**kwargs)
+    for record in (True, False):
+        repeats = 50
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fleet_simulation.simulate_fleet(**kwargs, record=record)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"record={record}: {elapsed * 1e3:.2f} ms per pour, {elapsed / results['Trips'] * 1e6:.1f} us per trip")
+    print(
+        f"{results['Trips']} trips over {results['Duration'] / 60:.1f} h at {results['Pour rate']:.1f} m3/hr, "
+        f"pump idle {results['Pump idle time'].round(1)} min"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares three ways of analysing a four span beam with eight load cases for
+many load combinations:
+    - PyNite: the FEModel3D of build_beam with every combination added, which
+      is solved once per combination
+    - re-solve: a ContinuousBeam of the factored loads of each combination
+    - superposition: ContinuousBeam.analyze_combinations, which solves each
+      load case once and superposes the combinations
+
+Usage: python benchmarks/bench_load_combinations.py [number of combinations]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.beams as beams
+import eng_module.continuous_beam as continuous_beam
+import eng_module.load_factors as load_factors
+
+LOAD_CASES = ["Dead", "Live", "Wind", "Snow", "Earthquake", "Live 2", "Wind 2", "Crane"]
+
+
+def many_case_beam() -> dict:
+    """
+    Returns the beam data of a four span beam with a load in each of LOAD_CASES.
+    """
+    loads = []
+    for idx, load_case in enumerate(LOAD_CASES):
+        start = 3000.0 * (idx % 4)
+        loads.append({
+            'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0 - idx, 'End Magnitude': -5.0 - idx,
+            'Start Location': start, 'End Location': start + 12000.0, 'Case': load_case,
+        })
+        loads.append({
+            'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0 * (idx + 1),
+            'Location': 1500.0 + 2500.0 * idx, 'Case': load_case,
+        })
+    return {
+        'Name': 'Many cases',
+        'L': 24000.0, 'E': 200000.0, 'Iz': 4e8, 'Iy': 1.0, 'A': 1.0, 'J': 1.0, 'nu': 0.3, 'rho': 1.0,
+        'Supports': {0.0: 'P', 6000.0: 'R', 12000.0: 'R', 18000.0: 'R', 24000.0: 'R'},
+        'Loads': loads,
+    }
+
+
+def load_combos(n_combos: int) -> dict[str, dict[str, float]]:
+    """
+    Returns EC_0_COMBS followed by random combinations of LOAD_CASES, 'n_combos' in all.
+    """
+    rng = np.random.default_rng(0)
+    combos = dict(load_factors.EC_0_COMBS)
+    while len(combos) < n_combos:
+        factors = rng.choice([0., 0.5, 0.9, 1.0, 1.05, 1.35, 1.5], size=len(LOAD_CASES))
+        combos[f"C{len(combos)}"] = {case: float(f) for case, f in zip(LOAD_CASES, factors) if f}
+    return combos
+
+
+def pynite(beam_data: dict, combos: dict) -> None:
+    beam_model = beams.build_beam(dict(beam_data))
+    for name, combo in combos.items():
+        beam_model.add_load_combo(name, {load_factors.LOAD_CASE_NAMES.get(k, k): f for k, f in combo.items()})
+    beam_model.analyze()
+
+
+def re_solve(beam_data: dict, combos: dict) -> None:
+    for name, combo in combos.items():
+        factors = {load_factors.LOAD_CASE_NAMES.get(k, k): f for k, f in combo.items()}
+        loads = [
+            {**load, 'Case': name, **{
+                key: load[key] * factors.get(load['Case'], 0.)
+                for key in ('Magnitude', 'Start Magnitude', 'End Magnitude') if key in load
+            }}
+            for load in beam_data['Loads']
+        ]
+        continuous_beam.ContinuousBeam(dict(beam_data, Loads=loads)).analyze()
+
+
+def superposition(beam_data: dict, combos: dict) -> None:
+    results = continuous_beam.ContinuousBeam(beam_data).analyze_combinations(combos)
+    continuous_beam.envelope(results)
+
+
+def main():
+    n_combos = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    beam_data = many_case_beam()
+    combos = load_combos(n_combos)
+    print(f"{len(LOAD_CASES)} load cases, {len(combos)} combinations")
+    print(f"{'method':<16}{'time (s)':>12}{'combinations/s':>18}")
+    for name, analyse in (("PyNite", pynite), ("re-solve", re_solve), ("superposition", superposition)):
+        start = time.perf_counter()
+        analyse(beam_data, combos)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16}{elapsed:>12.4f}{len(combos) / elapsed:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares the load time and memory footprint of load_eu_pf_sections against the
+previous implementation, which re-read the csv on every call and scaled the
+properties one column at a time.
+
+Usage: python benchmarks/bench_load_eu_pf_sections.py [catalogue csv]
+"""
+import sys
+import timeit
+
+import pandas as pd
+
+import eng_module.sections_db as sections_db
+
+
+def legacy_load_eu_pf_sections(filename: str) -> pd.DataFrame:
+    """
+    Returns the catalogue the way load_eu_pf_sections used to build it.
+    """
+    cm = 1e1
+    df = pd.read_csv(filename).rename(columns=sections_db.CSV_COLUMNS)
+    df = df.loc[~df['h'].isna()]
+    # The workbook route left every column as object dtype
+    df = df.astype(object)
+    df.A = df.A * cm**2
+    df.Iy = df.Iy * cm**4
+    df['Wel.y'] = df['Wel.y'] * cm**3
+    df['Wpl.y'] = df['Wpl.y'] * cm**3
+    df.iy = df.iy * cm
+    df.Avz =  df.Avz * cm**2
+    df.Iz = df.Iz * cm**4
+    df['Wel.z'] =  df['Wel.z'] * cm**3
+    df['Wpl.z'] = df['Wpl.z'] * cm**3
+    df.iz = df.iz * cm
+    df.Ss = df.Ss * cm
+    df.It = df.It * cm**4
+    df.Iw = df.Iw * cm**6 * 1e3
+    return df
+
+
+def best_of(func, number: int) -> float:
+    """
+    Returns the best time per call of 'func' in seconds.
+    """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else sections_db.BUNDLED_CATALOGUE
+    legacy = legacy_load_eu_pf_sections(source)
+    current = sections_db.load_eu_pf_sections(source)
+
+    # Typical screening operation: filter on two properties and sort by mass
+    def legacy_query():
+        sub = legacy.loc[(legacy.Iy >= 2e8) & (legacy['Wpl.y'] >= 1e6)]
+        return sub.sort_values("Iy")
+
+    def current_query():
+        sub = current.loc[(current.Iy >= 2e8) & (current['Wpl.y'] >= 1e6)]
+        return sub.sort_values("Iy")
+
+    rows = [
+        ("memory (kB)",
+         legacy.memory_usage(deep=True).sum() / 1e3,
+         current.memory_usage(deep=True).sum() / 1e3),
+        ("load (ms)",
+         best_of(lambda: legacy_load_eu_pf_sections(source), 20) * 1e3,
+         best_of(lambda: sections_db.load_eu_pf_sections(source), 20) * 1e3),
+        ("filter + sort (ms)",
+         best_of(legacy_query, 200) * 1e3,
+         best_of(current_query, 200) * 1e3),
+    ]
+    print(f"Catalogue: {source} ({len(current)} sections)")
+    print(f"{'':<20}{'legacy':>12}{'current':>12}{'ratio':>8}")
+    for label, old, new in rows:
+        print(f"{label:<20}{old:>12.3f}{new:>12.3f}{old / new:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
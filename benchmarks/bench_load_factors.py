@@ -0,0 +1,61 @@
+"""
+Compares the factored load envelope of many members from factored_envelope
+against calling max_factored_load and min_factored_load for each member, for
+the combinations in EC_0_COMBS, then counts the EN 1990 combinations from
+eurocode_combinations with and without pruning for more and more actions.
+
+Usage: python benchmarks/bench_load_factors.py [number of members]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.load_factors as load_factors
+
+
+def main():
+    n_members = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    loads = rng.uniform(-50., 200., (n_members, 3))
+
+    start = time.perf_counter()
+    looped = []
+    for d_load, l_load, w_load in loads.tolist():
+        member = {"D_load": d_load, "L_load": l_load, "W_load": w_load}
+        looped.append((
+            load_factors.max_factored_load(member, load_factors.EC_0_COMBS),
+            load_factors.min_factored_load(member, load_factors.EC_0_COMBS),
+        ))
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    enveloped = load_factors.factored_envelope(loads)
+    matrix_time = time.perf_counter() - start
+
+    looped = np.array(looped)
+    assert np.allclose(looped[:, 0], enveloped["Max"]) and np.allclose(looped[:, 1], enveloped["Min"])
+    print(f"{n_members} members, {len(load_factors.EC_0_COMBS)} combinations")
+    print(f"max/min_factored_load loop: {loop_time:.3f} s ({n_members / loop_time:.0f} members/s)")
+    print(f"factored_envelope:          {matrix_time:.4f} s ({n_members / matrix_time:.0f} members/s)")
+    print(f"speed up: {loop_time / matrix_time:.0f}x")
+
+    print(f"\n{'actions':<10}{'6.10':>8}{'pruned':>8}{'6.10a/b':>10}{'pruned':>8}")
+    categories = ["Category A", "Wind", "Snow", "Category E", "Temperature"]
+    for n_variable in range(1, len(categories) + 1):
+        actions = [{"Name": "Dead", "Type": "Permanent"}, {"Name": "Finishes", "Type": "Permanent"}]
+        actions += [
+            {"Name": category, "Type": "Variable", **load_factors.PSI_FACTORS[category]}
+            for category in categories[:n_variable]
+        ]
+        signs = {action["Name"]: 1 for action in actions}
+        signs["Finishes"] = -1
+        counts = []
+        for expressions in (("6.10",), ("6.10a", "6.10b")):
+            counts.append(len(load_factors.eurocode_combinations(actions, expressions)))
+            counts.append(len(load_factors.eurocode_combinations(actions, expressions, signs=signs)))
+        print(f"{len(actions):<10}{counts[0]:>8}{counts[1]:>8}{counts[2]:>10}{counts[3]:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Times monte_carlo_fleet, reporting the simulated pours per second in this
+process and on a process pool, and prints the pump starvation probability
+and delivered rate percentiles per fleet size.
+
+Usage: python benchmarks/bench_monte_carlo_fleet.py [pours per fleet size]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "concrete_transport_calculator"))
+
+import fleet_simulation
+
+POUR = dict(
+    mixer_volume=10, total_volume=1000, transit_time=30, batch_plant_rate=120,
+    pumping_rate=40, num_plants=2, num_pumps=2, maneuver_allowance=20,
+)
+
+
+def main():
+    n_pours = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fleet_sizes = list(range(6, 17, 2))
+    n_total = n_pours * len(fleet_sizes)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        results = fleet_simulation.monte_carlo_fleet(fleet_sizes, n_pours=n_pours, seed=0, workers=workers, **POUR)
+        elapsed = time.perf_counter() - start
+        print(f"{workers} worker(s): {n_total} pours of {POUR['total_volume'] / POUR['mixer_volume']:.0f} trips "
+              f"in {elapsed:.2f} s ({n_total / elapsed:,.0f} pours/s)")
+
+    print("Fleet  P(starved)  " + "  ".join(f"P{p:g} rate" for p in results["Percentiles"]))
+    for fleet_size, probability, rates in zip(
+        results["Fleet size"], results["Starvation probability"], results["Rate percentiles"]
+    ):
+        print(f"{fleet_size:5d}  {probability:10.3f}  " + "  ".join(f"{rate:8.1f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
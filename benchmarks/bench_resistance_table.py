@@ -0,0 +1,52 @@
+"""
+Times design resistance lookups from the persisted ResistanceTable against
+recomputing them from the catalogue row for every query, and the cost of
+building the table from scratch against refreshing an up to date one.
+
+Usage: python benchmarks/bench_resistance_table.py [number of lookups]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.sections_db as sections_db
+
+
+def main():
+    n_lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sections = sections_db.load_eu_pf_sections().set_index("Section name", drop=False)
+    rng = np.random.default_rng(0)
+    names = list(rng.choice(sections.index.astype(str), n_lookups))
+
+    start = time.perf_counter()
+    table = sections_db.ResistanceTable("S355", persist=False)
+    cold = time.perf_counter() - start
+    sections_db.ResistanceTable("S355") # make sure the persisted table is current
+    start = time.perf_counter()
+    refreshed = sections_db.ResistanceTable("S355")
+    warm = time.perf_counter() - start
+    assert refreshed.rebuilt == 0
+
+    start = time.perf_counter()
+    recomputed = [
+        sections_db.compute_resistances(sections.loc[[name]], "S355")["Mc,y,Rd"].iloc[0] for name in names[:1000]
+    ]
+    recompute = (time.perf_counter() - start) / 1000 * n_lookups
+    start = time.perf_counter()
+    looked_up = [table.get(name, "Mc,y,Rd") for name in names]
+    lookup = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = table.lookup(names, "Mc,y,Rd")
+    batch_lookup = time.perf_counter() - start
+    assert np.allclose(recomputed, looked_up[:1000], equal_nan=True)
+    assert np.allclose(batch, looked_up, equal_nan=True)
+
+    print(f"Full build of {len(table)} rows: {cold * 1e3:.1f} ms, refresh of an up to date table: {warm * 1e3:.1f} ms")
+    print(f"Recompute per query: {recompute / n_lookups * 1e6:.1f} us")
+    print(f"ResistanceTable.get: {lookup / n_lookups * 1e6:.2f} us ({recompute / lookup:.0f}x faster)")
+    print(f"ResistanceTable.lookup: {batch_lookup / n_lookups * 1e6:.2f} us per section")
+
+
+if __name__ == "__main__":
+    main()
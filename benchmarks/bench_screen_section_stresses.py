@@ -0,0 +1,57 @@
+"""
+Compares a full-catalogue stress screen done with the finite element check on
+every section (calculate_section_stresses) against the two-stage screen
+(screen_section_stresses) on arcelor_mittal.csv.
+
+A finite element solve of the whole catalogue takes hours, so by default the
+time per solve is measured on a sample of the sections and both end-to-end
+times are projected from it. Pass --full to run the two-stage screen for real.
+
+Usage: python benchmarks/bench_screen_section_stresses.py [sample size] [--full]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.sections_db as sections_db
+
+FY = 355
+ACTIONS = {"N": 1e6, "Mx": 2e8}
+MESH_SIZE = 100
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--full"]
+    sample_size = int(args[0]) if args else 8
+    catalogue = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+
+    start = time.perf_counter()
+    estimate = sections_db.estimate_vonmises_stress(catalogue, **ACTIONS)
+    estimate_time = time.perf_counter() - start
+    n_fe = int(np.count_nonzero(np.abs(estimate / FY - 1) <= sections_db.SCREEN_BAND))
+
+    step = max(1, len(catalogue) // sample_size)
+    sample = catalogue.iloc[::step].head(sample_size)
+    start = time.perf_counter()
+    sections_db.calculate_section_stresses(sample, FY, **ACTIONS, mesh_size=MESH_SIZE)
+    fe_time = (time.perf_counter() - start) / len(sample)
+
+    print(f"{len(catalogue)} sections, actions {ACTIONS}, fy = {FY} MPa")
+    print(f"estimate stage:           {estimate_time * 1e3:.2f} ms for the whole catalogue")
+    print(f"finite element solves:    {n_fe} needed, {len(catalogue) - n_fe} avoided")
+    print(f"time per FE solve:        {fe_time:.2f} s (mean of {len(sample)} sections)")
+    full_time = fe_time * len(catalogue)
+    screen_time = estimate_time + fe_time * n_fe
+    print(f"projected FE-only screen: {full_time / 60:.1f} min")
+    print(f"projected two-stage:      {screen_time / 60:.1f} min")
+    print(f"projected speed-up:       {full_time / screen_time:.1f}x")
+
+    if "--full" in sys.argv:
+        start = time.perf_counter()
+        sections_db.screen_section_stresses(catalogue, FY, **ACTIONS, mesh_size=MESH_SIZE, workers=None)
+        print(f"measured two-stage:       {(time.perf_counter() - start) / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
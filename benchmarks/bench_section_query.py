@@ -0,0 +1,75 @@
+"""
+Compares SectionIndex against the sections_filter + sort_by_weight pipeline
+on a batch of random design queries of the form
+    Iy >= X and Wpl.y >= Y and kg/m <= Z, lightest first
+
+Usage: python benchmarks/bench_section_query.py [number of queries]
+"""
+import sys
+import time
+
+import numpy as np
+
+import eng_module.sections_db as sections_db
+
+
+def legacy_lightest(sections, Iy, Wply, mass):
+    """
+    Returns the name of the lightest section found with the old pipeline.
+    """
+    sub = sections_db.sections_filter(sections, "ge", **{"Iy": Iy, "Wpl.y": Wply})
+    sub = sections_db.sections_filter(sub, "le", **{"kg/m": mass})
+    sub = sections_db.sort_by_weight(sub)
+    return None if sub.empty else sub["Section name"].iloc[0]
+
+
+def main():
+    n_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sections = sections_db.load_eu_pf_sections()
+    rng = np.random.default_rng(0)
+    Iy = rng.uniform(1e7, 2e9, n_queries)
+    Wply = Iy / rng.uniform(150, 600, n_queries)
+    mass = rng.uniform(50, 600, n_queries)
+
+    start = time.perf_counter()
+    index = sections_db.SectionIndex(sections)
+    build_time = time.perf_counter() - start
+
+    # The old pipeline prints for every empty result; only time a subset
+    n_legacy = min(n_queries, 300)
+    start = time.perf_counter()
+    legacy = [legacy_lightest(sections, Iy[i], Wply[i], mass[i]) for i in range(n_legacy)]
+    legacy_time = (time.perf_counter() - start) / n_legacy
+
+    start = time.perf_counter()
+    single = []
+    for i in range(n_queries):
+        row = index.lightest({"Iy": ("ge", Iy[i]), "Wpl.y": ("ge", Wply[i]), "kg/m": ("le", mass[i])})
+        single.append(None if row is None else row["Section name"])
+    single_time = (time.perf_counter() - start) / n_queries
+
+    start = time.perf_counter()
+    positions = index.lightest_batch({"Iy": ("ge", Iy), "Wpl.y": ("ge", Wply), "kg/m": ("le", mass)})
+    batch_time = (time.perf_counter() - start) / n_queries
+
+    names = sections["Section name"].to_numpy()
+    batch = [None if pos < 0 else names[pos] for pos in positions]
+    # Sections of equal mass may be returned in a different order, so the
+    # results are compared by mass
+    mass_of = dict(zip(sections["Section name"], sections["kg/m"]))
+    mass_of[None] = None
+    assert [mass_of[name] for name in legacy] == [mass_of[name] for name in single[:n_legacy]]
+    assert single == batch
+
+    print(f"{len(sections)} sections, {n_queries} queries (index built in {build_time * 1e3:.2f} ms)")
+    print(f"{'method':<30}{'us/query':>12}{'queries/s':>14}")
+    for label, per_query in (
+        ("sections_filter pipeline", legacy_time),
+        ("SectionIndex.lightest", single_time),
+        ("SectionIndex.lightest_batch", batch_time),
+    ):
+        print(f"{label:<30}{per_query * 1e6:>12.1f}{1 / per_query:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Times calculate_section_stresses over sections of arcelor_mittal.csv with an
+increasing number of worker processes and reports the speed-up over a single
+process.
+
+Usage: python benchmarks/bench_section_stresses.py [number of sections] [mesh size]
+"""
+import os
+import sys
+import time
+
+import eng_module.sections_db as sections_db
+
+
+def main():
+    n_sections = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    mesh_size = float(sys.argv[2]) if len(sys.argv) > 2 else 100
+    catalogue = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+    # Spread the sample across the catalogue so every family is represented
+    step = max(1, len(catalogue) // n_sections)
+    sample = catalogue.iloc[::step].head(n_sections)
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, *[2**i for i in range(1, 8) if 2**i <= cpus], cpus})
+    print(f"{len(sample)} sections, mesh size {mesh_size} mm2, {cpus} CPUs")
+    print(f"{'workers':>8}{'time (s)':>10}{'sections/s':>12}{'speed-up':>10}")
+    serial_time = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        sections_db.calculate_section_stresses(sample, 355, N=1e6, Mx=2e8, mesh_size=mesh_size, workers=workers)
+        elapsed = time.perf_counter() - start
+        serial_time = serial_time or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{len(sample) / elapsed:>12.2f}{serial_time / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
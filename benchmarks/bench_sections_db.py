@@ -0,0 +1,59 @@
+"""
+Benchmarks the start-up cost of the section catalogue in eng_module.sections_db.
+
+Each run happens in a fresh interpreter so the module import and the first
+catalogue load are measured the way a worker process sees them:
+    - cold: no binary cache, the source catalogue is parsed and the cache written
+    - warm: the binary cache from the cold run is read instead of the source
+
+Usage: python benchmarks/bench_sections_db.py [catalogue file]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+RUN = """
+import time
+t0 = time.perf_counter()
+import eng_module.sections_db as sections_db
+t1 = time.perf_counter()
+sections_db.load_catalogue({source!r})
+t2 = time.perf_counter()
+sections_db.load_catalogue({source!r})
+t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def time_start_up(source: str) -> tuple[float, float, float]:
+    """
+    Returns the (import, first load, repeat load) times in seconds measured in
+    a fresh interpreter loading the catalogue at 'source'.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", RUN.format(source=source)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return tuple(float(value) for value in output.split())
+
+
+def main():
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(repo, "arcelor_mittal.csv")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Work on a copy so the cache is written next to it and not in the repo
+        local_source = os.path.join(tmp, os.path.basename(source))
+        shutil.copy(source, local_source)
+        print(f"Catalogue: {source}")
+        print(f"{'run':<6}{'import (s)':>12}{'first load (s)':>16}{'repeat load (s)':>17}")
+        for label in ("cold", "warm"):
+            import_time, first_load, repeat_load = time_start_up(local_source)
+            print(f"{label:<6}{import_time:>12.4f}{first_load:>16.4f}{repeat_load:>17.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Times the dashboard reruns of the transport app: every mixer's one-way time
+and the bar chart, recomputed from scratch on each interaction as the app
+did, against one TransportGraph per session with the chart cached alongside
+the data as JSON, each rerun getting its own copy of the chart.
+Each interaction changes one input to one of a few values, as dragging a
+widget back and forth does.
+
+Usage: python benchmarks/bench_transport_graph.py [number of interactions]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "concrete_transport_calculator"))
+
+import concrete_transport_calculator as ctc
+import transport_graph
+
+WIDGET_VALUES = {
+    "distance": [3., 5.08, 8., 12.],
+    "speed": [10., 15., 20.],
+    "batch_plant_rate": [120., 200., 250.],
+    "pumping_rate": [15., 20., 30., 40.],
+    "maneuver_allowance": [10, 20, 30],
+    "fleet_allowance": [50, 75, 100],
+}
+
+
+def bar_chart(mixer_results):
+    """
+    Returns the one-way time bar chart of the dashboard.
+    """
+    fig = go.Figure(data=[go.Bar(x=[name for name, _ in mixer_results], y=[value for _, value in mixer_results])])
+    fig.update_layout(title="One-Way Time per Mixer", xaxis_title="Mixer Type", yaxis_title="Time (minutes)")
+    return fig
+
+
+def direct_rerun(inputs):
+    mixer_results = []
+    for name, capacity in ctc.mixer_capacities.items():
+        loading_time = ctc.calculate_loading_time(inputs["batch_plant_rate"], capacity)
+        adjusted_loading_time = ctc.calculate_adjusted_loading_time(loading_time, inputs["maneuver_allowance"])
+        transit_time = ctc.calculate_transit_time(inputs["distance"], inputs["speed"])
+        pumping_time = ctc.calculate_pumping_time(inputs["pumping_rate"], capacity)
+        gross_one_way_time = ctc.calculate_gross_one_way_time(adjusted_loading_time, transit_time, pumping_time)
+        mixer_results.append(
+            (name, ctc.calculate_total_adjusted_one_way_time(gross_one_way_time, inputs["fleet_allowance"])))
+    return bar_chart(mixer_results)
+
+
+session_graph = transport_graph.TransportGraph()
+
+
+def graph_rerun(inputs):
+    graph = session_graph
+    mixer_results = tuple(
+        (name, graph.evaluate(dict(inputs, mixer_volume=capacity), ("total_adjusted_one_way_time",))["total_adjusted_one_way_time"])
+        for name, capacity in ctc.mixer_capacities.items()
+    )
+    spec, _ = transport_graph.shared_cache.get(
+        ("one_way_figure", mixer_results), lambda results: bar_chart(results).to_json(), mixer_results)
+    return json.loads(spec)
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = np.random.default_rng(0)
+    inputs = dict(distance=5.08, speed=15., batch_plant_rate=200., theoretical_rate=200.,
+                  pumping_rate=20., maneuver_allowance=20, fleet_allowance=75)
+    interactions = []
+    for _ in range(n_interactions):
+        name = list(WIDGET_VALUES)[rng.integers(len(WIDGET_VALUES))]
+        inputs = dict(inputs, **{name: WIDGET_VALUES[name][rng.integers(len(WIDGET_VALUES[name]))]})
+        interactions.append(inputs)
+
+    timings = {}
+    # The second graph pass replays the interactions as other sessions would
+    for label, rerun in (("Recompute everything", direct_rerun), ("TransportGraph", graph_rerun),
+                         ("TransportGraph, inputs seen before", graph_rerun)):
+        start = time.perf_counter()
+        for inputs in interactions:
+            rerun(inputs)
+        timings[label] = (time.perf_counter() - start) / n_interactions
+        print(f"{label}: {timings[label] * 1e3:.3f} ms per rerun "
+              f"({timings['Recompute everything'] / timings[label]:.0f}x)")
+    print(f"Shared cache: {transport_graph.shared_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
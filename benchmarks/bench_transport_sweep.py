@@ -0,0 +1,56 @@
+"""
+Times concrete_transport_calculator.sweep over a grid of transport scenarios
+and compares it with calling the scalar calculator functions in nested loops.
+
+Usage: python benchmarks/bench_transport_sweep.py [points per axis]
+"""
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "concrete_transport_calculator"))
+
+import concrete_transport_calculator as ctc
+
+
+def scalar_cycle(volume, distance, speed, plant_rate, pumping_rate, theoretical_rate, maneuver, fleet):
+    """
+    Returns the cycle time and mixers needed of one scenario from the scalar calls.
+    """
+    loading_time = ctc.calculate_adjusted_loading_time(ctc.calculate_loading_time(plant_rate, volume), maneuver)
+    transit_time = ctc.calculate_transit_time(distance, speed)
+    gross = ctc.calculate_gross_one_way_time(loading_time, transit_time, ctc.calculate_pumping_time(pumping_rate, volume))
+    cycle = ctc.calculate_adjusted_return_time(ctc.calculate_total_adjusted_one_way_time(gross, fleet), transit_time, fleet)
+    return cycle, ctc.calculate_mixers_needed(theoretical_rate, volume * 60 / cycle)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    axes = [
+        np.linspace(1, 30, n), np.linspace(10, 60, n), np.linspace(60, 240, n), np.linspace(10, 60, n),
+        np.linspace(50, 400, n), np.linspace(0, 40, n), np.linspace(50, 100, n),
+    ]
+    start = time.perf_counter()
+    results = ctc.sweep(*axes)
+    vectorized = time.perf_counter() - start
+    n_scenarios = int(np.prod(results["Shape"]))
+
+    volumes = list(ctc.mixer_capacities.values())
+    scenarios = itertools.islice(itertools.product(range(len(volumes)), *(range(len(axis)) for axis in axes)), 5000)
+    start = time.perf_counter()
+    for idx in scenarios:
+        cycle, mixers = scalar_cycle(volumes[idx[0]], *(axis[i] for axis, i in zip(axes, idx[1:])))
+        assert cycle == results["Cycle time"][idx] and mixers == results["Mixers needed"][idx]
+    scalar = (time.perf_counter() - start) / 5000
+
+    print(f"{n_scenarios:,} scenarios {results['Shape']}")
+    print(f"sweep: {vectorized:.3f} s ({n_scenarios / vectorized / 1e6:.1f} M scenarios/s)")
+    print(f"Scalar loop: {scalar * 1e6:.1f} us per scenario ({1 / scalar:,.0f} scenarios/s)")
+    print(f"Speed-up: {scalar * n_scenarios / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+import eng_module.beams as beams
+import eng_module.sections_db as sections_db
+
+# EN 1993-1-1 Table 6.1 imperfection factors of the buckling curves
+IMPERFECTION_FACTORS = {"a0": 0.13, "a": 0.21, "b": 0.34, "c": 0.49, "d": 0.76}
+
+
+def buckling_curves(sections: pd.DataFrame, grade: str = "S355") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns arrays of the buckling curves ("a0" to "d") about the y-y and z-z
+    axes of the rolled I and H 'sections' (with "h", "b" and "tf" in mm) in
+    'grade', from EN 1993-1-1 Table 6.2.
+    """
+    h_b = sections["h"].to_numpy() / sections["b"].to_numpy()
+    tf = sections["tf"].to_numpy()
+    high_strength = grade == "S460"
+    slender = h_b > 1.2
+    thin = tf <= 40
+    thick = tf > 100
+    if high_strength:
+        curve_y = np.where(slender, np.where(thin, "a0", "a"), np.where(thick, "c", "a"))
+        curve_z = curve_y
+    else:
+        curve_y = np.where(slender, np.where(thin, "a", "b"), np.where(thick, "d", "b"))
+        curve_z = np.where(slender, np.where(thin, "b", "c"), np.where(thick, "d", "c"))
+    return curve_y, curve_z
+
+
+def reduction_factor(slenderness: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """
+    Returns the EN 1993-1-1 (6.49) reduction factor chi for the
+    non-dimensional 'slenderness' and imperfection factor 'alpha'.
+    """
+    phi = 0.5 * (1 + alpha * (slenderness - 0.2) + slenderness**2)
+    chi = 1 / (phi + np.sqrt(phi**2 - slenderness**2))
+    return np.where(slenderness <= 0.2, 1., np.minimum(chi, 1.))
+
+
+class ColumnCatalogue:
+    """
+    The flexural buckling resistances of every section of a catalogue (e.g.
+    the DataFrame returned by sections_db.load_eu_pf_sections, in mm) in one
+    steel grade, evaluated for arrays of column cases at once.
+
+    'grade': one of sections_db.STEEL_GRADES. The yield strength follows the
+        flange thickness.
+    'E': the elastic modulus (MPa)
+    'gamma_M1': the partial factor for member resistance
+
+    The sections are held lightest first in 'sections', and every matrix
+    returned has one row per case and one column per section in that order.
+    Class 4 sections (in axial compression, from the catalogue's class
+    columns) have no effective area in the catalogue, so their resistance is
+    taken as zero.
+    """
+    def __init__(
+        self,
+        sections: pd.DataFrame,
+        grade: str = "S355",
+        E: float = 210000.,
+        gamma_M1: float = 1.0,
+    ):
+        if grade not in sections_db.STEEL_GRADES:
+            raise ValueError(f"Invalid grade: {grade}. Please use one of {list(sections_db.STEEL_GRADES)}.")
+        self.grade = grade
+        self.E = E
+        self.gamma_M1 = gamma_M1
+        self.sections = sections.iloc[np.argsort(sections["kg/m"].to_numpy(), kind="stable")]
+        class_column = sections_db.STEEL_GRADES[grade][3]
+        self.fy = sections_db.yield_strength(self.sections["tf"].to_numpy(), grade)
+        self.A = self.sections["A"].to_numpy(dtype=np.float64)
+        self.Iy = self.sections["Iy"].to_numpy(dtype=np.float64)
+        self.Iz = self.sections["Iz"].to_numpy(dtype=np.float64)
+        self.mass = self.sections["kg/m"].to_numpy(dtype=np.float64)
+        self.names = self.sections["Section name"].to_numpy()
+        curve_y, curve_z = buckling_curves(self.sections, grade)
+        self.alpha_y = np.vectorize(IMPERFECTION_FACTORS.get)(curve_y)
+        self.alpha_z = np.vectorize(IMPERFECTION_FACTORS.get)(curve_z)
+        # The non-dimensional slenderness of each section per unit buckling length
+        Afy = self.A * self.fy
+        self.slenderness_y = np.sqrt(Afy / beams.euler_buckling_load(1., E, self.Iy, 1.))
+        self.slenderness_z = np.sqrt(Afy / beams.euler_buckling_load(1., E, self.Iz, 1.))
+        self.squash_load = Afy / gamma_M1
+        self.squash_load[self.sections[class_column].to_numpy() >= 4] = 0.
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def euler_loads(self, lengths_y: np.ndarray, lengths_z: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the Euler critical loads about the y-y and z-z axes of every
+        section for each of the buckling lengths 'lengths_y' and 'lengths_z'
+        (the same as 'lengths_y' by default), as matrices of shape (cases, sections).
+        """
+        lengths_y = np.atleast_1d(np.asarray(lengths_y, dtype=np.float64))[:, None]
+        lengths_z = lengths_y if lengths_z is None else np.atleast_1d(np.asarray(lengths_z, dtype=np.float64))[:, None]
+        return (
+            beams.euler_buckling_load(lengths_y, self.E, self.Iy, 1.),
+            beams.euler_buckling_load(lengths_z, self.E, self.Iz, 1.),
+        )
+
+    def resistances(self, lengths_y: np.ndarray, lengths_z: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns the EN 1993-1-1 (6.47) flexural buckling resistance Nb,Rd of
+        every section for each case, the lesser of the resistances about the
+        y-y and z-z axes, as a matrix of shape (cases, sections).
+        The slenderness sqrt(A fy / Ncr) is proportional to the buckling length.
+        """
+        lengths_y = np.atleast_1d(np.asarray(lengths_y, dtype=np.float64))[:, None]
+        lengths_z = lengths_y if lengths_z is None else np.atleast_1d(np.asarray(lengths_z, dtype=np.float64))[:, None]
+        chi_y = reduction_factor(lengths_y * self.slenderness_y, self.alpha_y)
+        chi_z = reduction_factor(lengths_z * self.slenderness_z, self.alpha_z)
+        return np.minimum(chi_y, chi_z) * self.squash_load
+
+    def utilisations(
+        self,
+        lengths_y: np.ndarray,
+        loads: np.ndarray,
+        lengths_z: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Returns the utilisation NEd / Nb,Rd of every section for each case of
+        axial load 'loads' (N, compression positive) and buckling lengths, as
+        a matrix of shape (cases, sections). It is inf for class 4 sections.
+        """
+        loads = np.atleast_1d(np.asarray(loads, dtype=np.float64))[:, None]
+        with np.errstate(divide="ignore"):
+            return loads / self.resistances(lengths_y, lengths_z)
+
+    def lightest(
+        self,
+        lengths_y: np.ndarray,
+        loads: np.ndarray,
+        lengths_z: np.ndarray | None = None,
+        chunksize: int = 1024,
+    ) -> pd.DataFrame:
+        """
+        Returns a DataFrame with one row per case of the lightest section
+        whose utilisation (see utilisations) is at most 1: its "Section name",
+        "kg/m", "Utilisation" and its "Position" in 'sections'. The position
+        is -1 and the other values empty for cases no section passes.
+
+        The cases are checked 'chunksize' at a time to bound the memory used.
+        """
+        lengths_y = np.atleast_1d(np.asarray(lengths_y, dtype=np.float64))
+        loads = np.broadcast_to(np.asarray(loads, dtype=np.float64), lengths_y.shape)
+        if lengths_z is not None:
+            lengths_z = np.broadcast_to(np.asarray(lengths_z, dtype=np.float64), lengths_y.shape)
+        positions = np.empty(len(lengths_y), dtype=int)
+        utilisation = np.empty(len(lengths_y))
+        for start in range(0, len(lengths_y), chunksize):
+            stop = start + chunksize
+            chunk = self.utilisations(
+                lengths_y[start:stop], loads[start:stop], None if lengths_z is None else lengths_z[start:stop]
+            )
+            passing = chunk <= 1.
+            first = passing.argmax(axis=1)
+            rows = np.arange(len(first))
+            positions[start:stop] = np.where(passing[rows, first], first, -1)
+            utilisation[start:stop] = chunk[rows, first]
+        found = positions >= 0
+        return pd.DataFrame({
+            "Section name": np.where(found, self.names[positions], None),
+            "kg/m": np.where(found, self.mass[positions], np.nan),
+            "Utilisation": np.where(found, utilisation, np.nan),
+            "Position": positions,
+        })
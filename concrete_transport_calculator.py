@@ -22,9 +22,28 @@ fleet_allowance = 25
 num_mixers = 8  # Or the number of mixers you want to simulate
 
 class ConcreteMixerProject:
-    def __init__(self, mixer_type):
+    def __init__(
+        self,
+        mixer_type,
+        distance=distance,
+        speed=speed,
+        batch_plant_rate=batch_plant_rate,
+        theoretical_rate=theoretical_rate,
+        maneuver_allowance=maneuver_allowance,
+        pumping_rate=pumping_rate,
+        fleet_allowance=fleet_allowance,
+    ):
         self.mixer_type = mixer_type
         self.mixer_volume = mixer_capacities[mixer_type]
+        self.distance = distance
+        self.speed = speed
+        self.batch_plant_rate = batch_plant_rate
+        self.theoretical_rate = theoretical_rate
+        self.maneuver_allowance = maneuver_allowance
+        self.pumping_rate = pumping_rate
+        self.fleet_allowance = fleet_allowance
+        self.num_batching_plants = self.calculate_batching_plants_needed(theoretical_rate, batch_plant_rate)
+        self.mixers_in_queue = 0
 
     def calculate_loading_time(self, batch_plant_rate):
      if batch_plant_rate <= 0:
@@ -91,35 +110,58 @@ class ConcreteMixerProject:
         return adjusted_return_time
     
     def generate_timeline(self):
+        """
+        Returns the timeline, timestamps (minutes) and queue sizes of one trip
+        of a single mixer: loading, transit to site, pumping and return, then
+        at most one batching slot of waiting if every plant is busy. The
+        return ends at the adjusted return time, so the fleet allowance of
+        the whole trip is taken on the way back. See
+        concrete_transport_calculator/fleet_simulation.py for fleets of
+        mixers sharing plants and pumps.
+        """
         timeline = [(0, 0)]  # Mixer starts at 0
         timestamps = []
         queue_sizes = []
         current_timestamp = 0
         self.mixers_in_queue = 0  # Initialize the queue
+        loading_time = self.calculate_loading_time(self.batch_plant_rate) * 60  # Convert to minutes
+        adjusted_loading_time = self.calculate_adjusted_loading_time(loading_time, self.maneuver_allowance)
+        transit_time = self.calculate_transit_time(self.distance, self.speed)
+        pumping_time = self.calculate_pumping_time(self.pumping_rate) * 60  # Convert to minutes
+        gross_one_way_time = self.calculate_gross_one_way_time(adjusted_loading_time, transit_time, pumping_time)
+        adjusted_return_time = self.calculate_adjusted_return_time(
+            self.calculate_total_adjusted_one_way_time(gross_one_way_time, self.fleet_allowance),
+            transit_time, self.fleet_allowance,
+        )
 
         # Initial Loading 
         start_loading = current_timestamp 
-        end_loading = current_timestamp + self.calculate_adjusted_loading_time(self.loading_time, self.maneuver_allowance)
+        end_loading = current_timestamp + adjusted_loading_time
         timeline.extend([(start_loading, 0), (end_loading, 0)]) 
         timestamps.extend([start_loading, end_loading])
         queue_sizes.extend([self.mixers_in_queue, self.mixers_in_queue]) 
         self.mixers_in_queue += 1 
+        current_timestamp = end_loading
 
-        # ... Transit to Site, Pumping at Site, Return Transit ...
+        # Transit to Site and Pumping at Site
+        for duration in (transit_time, pumping_time):
+            timeline.extend([(current_timestamp, 1), (current_timestamp + duration, 1)])
+            timestamps.extend([current_timestamp, current_timestamp + duration])
+            queue_sizes.extend([self.mixers_in_queue, self.mixers_in_queue])
+            current_timestamp += duration
 
         # Mixer returning, update queue
         start_return = current_timestamp
-        end_return = current_timestamp + self.calculate_adjusted_return_time(self.total_adjusted_one_way_time, self.transit_time, self.fleet_allowance)
+        end_return = start_loading + adjusted_return_time
         timeline.extend([(start_return, 0), (end_return, 0)])
         current_timestamp = end_return
         timestamps.extend([start_return, end_return])
         queue_sizes.extend([self.mixers_in_queue, self.mixers_in_queue])
 
-        # Potential Wait in Queue
-        while self.mixers_in_queue >= self.num_batching_plants: 
-            wait_time = self.calculate_adjusted_loading_time(self.loading_time, self.maneuver_allowance)
-            timeline.extend([(current_timestamp, 0), (current_timestamp + wait_time, 0)])
-            current_timestamp += wait_time  
+        # Potential Wait in Queue: one batching slot frees a plant
+        if self.mixers_in_queue >= self.num_batching_plants: 
+            timeline.extend([(current_timestamp, 0), (current_timestamp + adjusted_loading_time, 0)])
+            current_timestamp += adjusted_loading_time  
             timestamps.extend([current_timestamp, current_timestamp])
             queue_sizes.extend([self.mixers_in_queue, self.mixers_in_queue]) 
 
@@ -1,7 +1,36 @@
+import json
+
 import streamlit as st
-from concrete_transport_calculator import mixer_capacities, calculate_loading_time, calculate_adjusted_loading_time,  calculate_transit_time, calculate_pumping_time, calculate_mixers_needed, calculate_batching_plants_needed, calculate_mixers_loaded_per_hour, calculate_effective_hourly_rate, calculate_gross_one_way_time, calculate_total_adjusted_one_way_time, calculate_adjusted_return_time
+from concrete_transport_calculator import mixer_capacities
+from transport_graph import TransportGraph, shared_cache
 import plotly.graph_objects as go
 
+def build_one_way_figure(mixer_results):
+    fig = go.Figure(data=[go.Bar(
+        x=[name for name, _ in mixer_results],
+        y=[time for _, time in mixer_results]
+    )])
+
+    fig.update_layout(title="One-Way Time per Mixer",
+                      xaxis_title="Mixer Type",
+                      yaxis_title="Time (minutes)")
+    return fig
+
+def one_way_figure_spec(mixer_results):
+    return build_one_way_figure(mixer_results).to_json()
+
+def one_way_figure(mixer_results):
+    # The chart is cached as JSON with the results it shows, so it is built
+    # once for all sessions and each rerun gets its own copy to display
+    spec, _ = shared_cache.get(("one_way_figure", mixer_results), one_way_figure_spec, mixer_results)
+    return json.loads(spec)
+
+def session_graph():
+    # The dependency graph is built once per session, not on every rerun
+    if "transport_graph" not in st.session_state:
+        st.session_state.transport_graph = TransportGraph()
+    return st.session_state.transport_graph
+
 def dashboard_page():
     st.title("Concrete Mixer Dashboard") 
     #User Inputs
@@ -21,25 +50,15 @@ def dashboard_page():
         fleet_allowance = st.number_input("Fleet Allowance (%)", value=25)
     
     def calculate_and_update_chart(distance, speed, batch_plant_rate, theoretical_rate, maneuver_allowance, pumping_rate, fleet_allowance):
-        mixer_results = {}
-        for name, capacity in mixer_capacities.items():
-            loading_time = calculate_loading_time(batch_plant_rate, capacity)
-            adjusted_loading_time = calculate_adjusted_loading_time(loading_time, maneuver_allowance)
-            transit_time = calculate_transit_time(distance, speed)
-            pumping_time = calculate_pumping_time(pumping_rate, capacity)
-            gross_one_way_time = calculate_gross_one_way_time(adjusted_loading_time, transit_time, pumping_time)
-            adjusted_one_way_time = calculate_total_adjusted_one_way_time(gross_one_way_time, fleet_allowance)
-            mixer_results[name] = adjusted_one_way_time
-    
-        fig = go.Figure(data=[go.Bar(
-            x=list(mixer_results.keys()),
-            y=list(mixer_results.values())
-        )])
-    
-        fig.update_layout(title="One-Way Time per Mixer",
-                          xaxis_title="Mixer Type",
-                          yaxis_title="Time (minutes)")  
-        return fig 
+        # Only the quantities downstream of a changed input are recomputed
+        graph = session_graph()
+        inputs = dict(distance=distance, speed=speed, batch_plant_rate=batch_plant_rate, theoretical_rate=theoretical_rate,
+                      maneuver_allowance=maneuver_allowance, pumping_rate=pumping_rate, fleet_allowance=fleet_allowance)
+        mixer_results = tuple(
+            (name, graph.evaluate(dict(inputs, mixer_volume=capacity), ("total_adjusted_one_way_time",))["total_adjusted_one_way_time"])
+            for name, capacity in mixer_capacities.items()
+        )
+        return one_way_figure(mixer_results)
     fig = calculate_and_update_chart(distance, speed, batch_plant_rate, theoretical_rate, maneuver_allowance, pumping_rate, fleet_allowance)
     st.plotly_chart(fig)
 
@@ -77,16 +96,21 @@ def mixer_details_page():
 
     if st.button("Show Detailed Results"):
         mixer_volume = mixer_capacities[mixer_type]
-        loading_time = calculate_loading_time(batch_plant_rate, mixer_volume)
-        adjusted_loading_time = calculate_adjusted_loading_time(loading_time, maneuver_allowance)
-        transit_time = calculate_transit_time(distance, speed)
-        pumping_time = calculate_pumping_time(pumping_rate, mixer_volume)
-        plants_needed = calculate_batching_plants_needed(theoretical_rate, batch_plant_rate)
-        mixers_loaded_per_hour=calculate_mixers_loaded_per_hour(adjusted_loading_time, theoretical_rate, batch_plant_rate)
-        hourly_rate = calculate_effective_hourly_rate(mixers_loaded_per_hour, mixer_volume)
-        gross_one_way_time = calculate_gross_one_way_time(adjusted_loading_time, transit_time, pumping_time)
-        total_adjusted_one_way_time = calculate_total_adjusted_one_way_time(gross_one_way_time, fleet_allowance)
-        adjusted_return_time = calculate_adjusted_return_time(total_adjusted_one_way_time, transit_time, fleet_allowance)
+        results = session_graph().evaluate(dict(
+            mixer_volume=mixer_volume, distance=distance, speed=speed, batch_plant_rate=batch_plant_rate,
+            theoretical_rate=theoretical_rate, pumping_rate=pumping_rate,
+            maneuver_allowance=maneuver_allowance, fleet_allowance=fleet_allowance,
+        ))
+        loading_time = results["loading_time"]
+        adjusted_loading_time = results["adjusted_loading_time"]
+        transit_time = results["transit_time"]
+        pumping_time = results["pumping_time"]
+        plants_needed = results["plants_needed"]
+        mixers_loaded_per_hour = results["mixers_loaded_per_hour"]
+        hourly_rate = results["hourly_rate"]
+        gross_one_way_time = results["gross_one_way_time"]
+        total_adjusted_one_way_time = results["total_adjusted_one_way_time"]
+        adjusted_return_time = results["adjusted_return_time"]
 
     st.subheader("Results")
     col1, col2 = st.columns(2)
@@ -22,29 +22,29 @@ fleet_allowance = 75
 num_mixers = 8  # Or the number of mixers you want to simulate
 
 def calculate_loading_time(batch_plant_rate, mixer_volume):
-  if batch_plant_rate <= 0:
+  if np.any(np.asarray(batch_plant_rate) <= 0):
     raise ValueError("Batch plant rate cannot be zero or negative")
   return np.ceil(mixer_volume / (batch_plant_rate/60)).astype(int)
 
 def calculate_adjusted_loading_time(loading_time, maneuver_allowance):
-  if maneuver_allowance < 0:
+  if np.any(np.asarray(maneuver_allowance) < 0):
     raise ValueError("Maneuver allowance cannot be negative")
   return np.ceil(loading_time * (1 + maneuver_allowance/100)).astype(int)
 
 def calculate_transit_time(distance, speed):
-  if distance <= 0:
+  if np.any(np.asarray(distance) <= 0):
     raise ValueError("Distance cannot be zero or negative")
-  if speed <= 0:
+  if np.any(np.asarray(speed) <= 0):
     raise ValueError("Speed cannot be zero or negative")
   return np.ceil((distance / speed * 60)).astype(int) 
 
 def calculate_pumping_time(pumping_rate, mixer_volume):
-  if pumping_rate <= 0:
+  if np.any(np.asarray(pumping_rate) <= 0):
     raise ValueError("ConcretePumping rate cannot be zero or negative")
   return np.ceil(mixer_volume / pumping_rate*60).astype(int)
 
 def calculate_mixers_needed(theoretical_rate, effective_rate):
-  if theoretical_rate <= 0:
+  if np.any(np.asarray(theoretical_rate) <= 0):
     raise ValueError("Theoretical rate cannot be zero or negative")
   return np.ceil(theoretical_rate / effective_rate).astype(int)
 
@@ -63,11 +63,57 @@ def calculate_gross_one_way_time(loading_time, transit_time, pumping_time):
   return loading_time + transit_time + pumping_time
 
 def calculate_total_adjusted_one_way_time(gross_one_way_time, fleet_allowance):
-  if fleet_allowance < 0:
+  if np.any(np.asarray(fleet_allowance) < 0):
     raise ValueError("Fleet allowance cannot be negative")
   return np.ceil(gross_one_way_time / (fleet_allowance/100)).astype(int)
 
 def calculate_adjusted_return_time(total_adjusted_one_way_time, transit_time, fleet_allowance):
   return total_adjusted_one_way_time + transit_time
-    
-    
\ No newline at end of file
+
+# Every function above accepts arrays as well as scalars (validating every
+# entry), so a grid of scenarios is evaluated in one pass. sweep evaluates
+# them on open grids: each intermediate result only spans the axes it depends
+# on and is broadcast to the full scenario tensor at the end.
+SWEEP_AXES = ("Mixer", "Distance", "Speed", "Batch plant rate", "Pumping rate",
+              "Theoretical rate", "Maneuver allowance", "Fleet allowance")
+
+def sweep(distance, speed, batch_plant_rate, pumping_rate, theoretical_rate,
+          maneuver_allowance, fleet_allowance, mixers=mixer_capacities):
+  """
+  Returns a dict of the transport calculation for every combination of the
+  values (scalars or 1D arrays) of the arguments and of the mixer types in
+  'mixers' (name: capacity in m3). Each result is an array with one axis per
+  entry of SWEEP_AXES, e.g. result["Mixers needed"][m, d, s, b, p, t, a, f]:
+      - "Loading time", "Adjusted loading time", "Transit time",
+        "Pumping time", "Gross one-way time", "Adjusted one-way time",
+        "Cycle time" (the adjusted return time), all in minutes
+      - "Batching plants needed", "Mixers loaded per hour",
+        "Effective hourly rate" (m3/hr)
+      - "Mixers needed": the fleet to supply 'theoretical_rate' with each
+        mixer delivering its capacity once per cycle
+  The dict also holds the "Mixers" names and the "Shape" of the tensor.
+  The results are read-only broadcast views, so they share memory.
+  """
+  volumes = np.array(list(mixers.values()), dtype=float)
+  values = [np.atleast_1d(np.asarray(value, dtype=float)) for value in
+            (distance, speed, batch_plant_rate, pumping_rate, theoretical_rate, maneuver_allowance, fleet_allowance)]
+  volume, distance, speed, batch_plant_rate, pumping_rate, theoretical_rate, maneuver_allowance, fleet_allowance = np.ix_(volumes, *values)
+
+  results = {}
+  results["Loading time"] = calculate_loading_time(batch_plant_rate, volume)
+  results["Adjusted loading time"] = calculate_adjusted_loading_time(results["Loading time"], maneuver_allowance)
+  results["Transit time"] = calculate_transit_time(distance, speed)
+  results["Pumping time"] = calculate_pumping_time(pumping_rate, volume)
+  results["Batching plants needed"] = calculate_batching_plants_needed(theoretical_rate, batch_plant_rate)
+  results["Mixers loaded per hour"] = calculate_mixers_loaded_per_hour(results["Adjusted loading time"], theoretical_rate, batch_plant_rate)
+  results["Effective hourly rate"] = calculate_effective_hourly_rate(results["Mixers loaded per hour"], volume)
+  results["Gross one-way time"] = calculate_gross_one_way_time(results["Adjusted loading time"], results["Transit time"], results["Pumping time"])
+  results["Adjusted one-way time"] = calculate_total_adjusted_one_way_time(results["Gross one-way time"], fleet_allowance)
+  results["Cycle time"] = calculate_adjusted_return_time(results["Adjusted one-way time"], results["Transit time"], fleet_allowance)
+  results["Mixers needed"] = calculate_mixers_needed(theoretical_rate, volume * 60 / results["Cycle time"])
+
+  shape = (len(volumes),) + tuple(len(value) for value in values)
+  results = {name: np.broadcast_to(result, shape) for name, result in results.items()}
+  results["Mixers"] = list(mixers)
+  results["Shape"] = shape
+  return results
@@ -0,0 +1,211 @@
+import copy
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_array
+
+from concrete_transport_calculator import (
+    mixer_capacities, calculate_loading_time, calculate_adjusted_loading_time, calculate_transit_time,
+    calculate_pumping_time, calculate_gross_one_way_time, calculate_total_adjusted_one_way_time,
+    calculate_adjusted_return_time,
+)
+
+MILP_STATUS = {0: "Optimal", 1: "Limit reached", 2: "Infeasible", 3: "Unbounded", 4: "Error"}
+
+
+class FleetAssignment:
+    """
+    The assignment of mixers of several capacities to the routes between
+    batching plants and sites that meets every site's required concrete rate
+    at the least fleet cost, as a mixed integer program:
+
+        minimise    sum(cost[k] * x[k, r])
+        subject to  sum over plants of rate[k, r] * x[k, r] >= required rate  (each site)
+                    sum over sites of rate[k, r] * x[k, r] <= plant rate      (each plant)
+                    sum over routes of x[k, r] <= available[k]               (each mixer type)
+
+    where x[k, r] is the number of mixers of type k on route r and rate[k, r]
+    the concrete a mixer delivers per hour, its capacity once per cycle time
+    of the calculator (calculate_adjusted_return_time).
+
+    'plants': {plant: batch plant rate (m3/hr)}
+    'sites': {site: (required rate (m3/hr), pumping rate (m3/hr))}
+    'distances': {(plant, site): distance (km)}; pairs left out have no route
+    'mixers': {mixer type: capacity (m3)}
+    'costs': {mixer type: cost of one mixer}, 1 for every mixer by default
+        (the fewest mixers)
+    'available': {mixer type: number of mixers}, unlimited by default
+    'max_solutions': the number of solutions memoised by solve
+
+    The set_* methods change one input and only recalculate the delivery
+    rates it affects. solve always solves the whole program again; it only
+    memoises its answers by their inputs, so inputs set back to ones solved
+    before (one of the last 'max_solutions') are answered without solving.
+    """
+    def __init__(
+        self,
+        plants: dict[str, float],
+        sites: dict[str, tuple[float, float]],
+        distances: dict[tuple[str, str], float],
+        speed: float = 15.,
+        mixers: dict[str, float] = mixer_capacities,
+        costs: dict[str, float] | None = None,
+        available: dict[str, int] | None = None,
+        maneuver_allowance: float = 20,
+        fleet_allowance: float = 75,
+        max_solutions: int = 64,
+    ):
+        self.plants = list(plants)
+        self.sites = list(sites)
+        self.mixers = list(mixers)
+        self.routes = [route for route in distances if route[0] in plants and route[1] in sites]
+        self.speed = speed
+        self.maneuver_allowance = maneuver_allowance
+        self.fleet_allowance = fleet_allowance
+        self.volumes = np.array([mixers[mixer] for mixer in self.mixers], dtype=float)
+        self.plant_rates = np.array([plants[plant] for plant in self.plants], dtype=float)
+        self.required_rates = np.array([sites[site][0] for site in self.sites], dtype=float)
+        self.pumping_rates = np.array([sites[site][1] for site in self.sites], dtype=float)
+        self.distances = np.array([distances[route] for route in self.routes], dtype=float)
+        self.route_plants = np.array([self.plants.index(plant) for plant, _ in self.routes], dtype=int)
+        self.route_sites = np.array([self.sites.index(site) for _, site in self.routes], dtype=int)
+        costs = costs or {}
+        available = available or {}
+        self.costs = np.array([costs.get(mixer, 1.) for mixer in self.mixers], dtype=float)
+        self.available = np.array([available.get(mixer, np.inf) for mixer in self.mixers], dtype=float)
+        self.rates = np.empty((len(self.mixers), len(self.routes)))
+        self._update_rates(np.arange(len(self.routes)))
+        self.max_solutions = max_solutions
+        self._solutions = OrderedDict()
+
+    def _update_rates(self, routes: np.ndarray) -> None:
+        """
+        Recalculates the delivery rate (m3/hr) of one mixer of each type on
+        each of 'routes' (route positions).
+        """
+        if len(routes) == 0:
+            return
+        volume = self.volumes[:, None]
+        loading_time = calculate_adjusted_loading_time(
+            calculate_loading_time(self.plant_rates[self.route_plants[routes]], volume), self.maneuver_allowance
+        )
+        transit_time = calculate_transit_time(self.distances[routes], self.speed)
+        pumping_time = calculate_pumping_time(self.pumping_rates[self.route_sites[routes]], volume)
+        gross_one_way_time = calculate_gross_one_way_time(loading_time, transit_time, pumping_time)
+        cycle_time = calculate_adjusted_return_time(
+            calculate_total_adjusted_one_way_time(gross_one_way_time, self.fleet_allowance),
+            transit_time, self.fleet_allowance,
+        )
+        self.rates[:, routes] = volume * 60 / cycle_time
+
+    def set_site(self, site: str, required_rate: float | None = None, pumping_rate: float | None = None) -> None:
+        """
+        Changes the required rate and/or the pumping rate of 'site'.
+        """
+        idx = self.sites.index(site)
+        if required_rate is not None:
+            self.required_rates[idx] = required_rate
+        if pumping_rate is not None:
+            self.pumping_rates[idx] = pumping_rate
+            self._update_rates(np.flatnonzero(self.route_sites == idx))
+
+    def set_plant(self, plant: str, rate: float) -> None:
+        """
+        Changes the batch plant rate of 'plant'.
+        """
+        idx = self.plants.index(plant)
+        self.plant_rates[idx] = rate
+        self._update_rates(np.flatnonzero(self.route_plants == idx))
+
+    def set_distance(self, plant: str, site: str, distance: float) -> None:
+        """
+        Changes the distance of the existing route from 'plant' to 'site'.
+        """
+        idx = self.routes.index((plant, site))
+        self.distances[idx] = distance
+        self._update_rates(np.array([idx]))
+
+    def set_mixer(self, mixer: str, cost: float | None = None, available: float | None = None) -> None:
+        """
+        Changes the cost and/or the number available of the mixers of type 'mixer'.
+        """
+        idx = self.mixers.index(mixer)
+        if cost is not None:
+            self.costs[idx] = cost
+        if available is not None:
+            self.available[idx] = available
+
+    def _key(self, *options) -> bytes:
+        return repr(options).encode() + b"".join(array.tobytes() for array in (
+            self.rates, self.required_rates, self.plant_rates, self.costs, self.available
+        ))
+
+    def solve(self, time_limit: float = 1., mip_rel_gap: float = 0.005) -> dict:
+        """
+        Returns a dict of the least cost assignment, to within 'mip_rel_gap'
+        of the optimum cost (closing the last fraction of a percent can take
+        many times longer):
+            - "Status": "Optimal", "Infeasible", "Limit reached" (the best
+              assignment found in 'time_limit' seconds) or "Error"
+            - "Cost", "Mixers": the fleet cost and {mixer type: number}
+            - "Assignment": a list of dicts of the "Mixer", "Plant", "Site",
+              "Number" and "Rate" (m3/hr delivered) of each route and
+              mixer type used
+            - "Site rates", "Plant rates": {name: the rate delivered from or to it}
+            - "Time": the solve time (s), 0 for a memoised answer
+        The dict returned is the caller's own: changing it does not change
+        later answers.
+        """
+        key = self._key(time_limit, mip_rel_gap)
+        if key in self._solutions:
+            self._solutions.move_to_end(key)
+            return dict(copy.deepcopy(self._solutions[key]), Time=0.)
+        start = time.perf_counter()
+        n_mixers, n_routes = self.rates.shape
+        n_vars = n_mixers * n_routes
+        # Variables are x[k, r] flattened with the routes varying fastest
+        columns = np.arange(n_vars)
+        route_of = np.tile(np.arange(n_routes), n_mixers)
+        mixer_of = np.repeat(np.arange(n_mixers), n_routes)
+        rates = self.rates.ravel()
+        site_rows = csr_array((rates, (self.route_sites[route_of], columns)), shape=(len(self.sites), n_vars))
+        plant_rows = csr_array((rates, (self.route_plants[route_of], columns)), shape=(len(self.plants), n_vars))
+        mixer_rows = csr_array((np.ones(n_vars), (mixer_of, columns)), shape=(n_mixers, n_vars))
+        constraints = [
+            LinearConstraint(site_rows, self.required_rates, np.inf),
+            LinearConstraint(plant_rows, 0., self.plant_rates),
+        ]
+        if np.isfinite(self.available).any():
+            constraints.append(LinearConstraint(mixer_rows, 0., self.available))
+        solution = milp(
+            np.repeat(self.costs, n_routes),
+            constraints=constraints,
+            integrality=np.ones(n_vars),
+            bounds=Bounds(0., np.repeat(self.available, n_routes)),
+            options={"time_limit": time_limit, "mip_rel_gap": mip_rel_gap},
+        )
+
+        results = {"Status": MILP_STATUS.get(solution.status, "Error"), "Cost": np.nan, "Mixers": {}, "Assignment": [],
+                   "Site rates": {}, "Plant rates": {}}
+        if solution.x is not None:
+            counts = np.round(solution.x).reshape(n_mixers, n_routes).astype(int)
+            delivered = counts * self.rates
+            results["Cost"] = float(np.sum(counts.sum(axis=1) * self.costs))
+            results["Mixers"] = {mixer: int(count) for mixer, count in zip(self.mixers, counts.sum(axis=1)) if count}
+            for k, r in zip(*np.nonzero(counts)):
+                plant, site = self.routes[r]
+                results["Assignment"].append({
+                    "Mixer": self.mixers[k], "Plant": plant, "Site": site,
+                    "Number": int(counts[k, r]), "Rate": float(delivered[k, r]),
+                })
+            route_rates = delivered.sum(axis=0)
+            results["Site rates"] = dict(zip(self.sites, np.bincount(self.route_sites, route_rates, len(self.sites))))
+            results["Plant rates"] = dict(zip(self.plants, np.bincount(self.route_plants, route_rates, len(self.plants))))
+        results["Time"] = time.perf_counter() - start
+        if results["Status"] in ("Optimal", "Infeasible"):
+            self._solutions[key] = copy.deepcopy(results)
+            if len(self._solutions) > self.max_solutions:
+                self._solutions.popitem(last=False)
+        return results
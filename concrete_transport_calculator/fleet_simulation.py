@@ -0,0 +1,347 @@
+import heapq
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Activities of the mixer timelines, in the order a trip goes through them
+ACTIVITIES = ("Plant queue", "Loading", "Transit", "Site queue", "Pumping", "Return")
+
+# Event kinds, ordered so that at equal times resources are released before
+# they are requested
+_LOADED, _PUMPED, _ARRIVE_PLANT, _ARRIVE_SITE = range(4)
+
+
+# Distributions of the factors (mean 1, coefficient of variation 'cv') applied
+# to the nominal duration of an activity on each trip
+DISTRIBUTIONS = {
+    "fixed": lambda rng, cv, size: np.ones(size),
+    "lognormal": lambda rng, cv, size: rng.lognormal(-math.log1p(cv**2) / 2, math.sqrt(math.log1p(cv**2)), size),
+    "gamma": lambda rng, cv, size: rng.gamma(1 / cv**2, cv**2, size) if cv > 0 else np.ones(size),
+    "uniform": lambda rng, cv, size: rng.uniform(1 - math.sqrt(3) * cv, 1 + math.sqrt(3) * cv, size),
+    "triangular": lambda rng, cv, size: rng.triangular(1 - math.sqrt(6) * cv, 1, 1 + math.sqrt(6) * cv, size),
+}
+
+# The (distribution, cv) of the durations of each activity. "Return" takes
+# the distribution of "Transit" unless it is given.
+DEFAULT_VARIABILITY = {
+    "Loading": ("lognormal", 0.1),
+    "Transit": ("lognormal", 0.25),
+    "Pumping": ("lognormal", 0.15),
+}
+
+
+def sample_factors(
+    variability: dict[str, tuple[str, float]],
+    rng: np.random.Generator,
+    trips: int,
+) -> dict[str, list[float]]:
+    """
+    Returns a dict of the duration factors of the "Loading", "Transit",
+    "Pumping" and "Return" of each of 'trips' trips drawn from 'rng' with the
+    (distribution, cv) of each activity in 'variability' (see DISTRIBUTIONS).
+    Activities not in 'variability' keep their nominal durations.
+    """
+    factors = {}
+    for activity in ("Loading", "Transit", "Pumping", "Return"):
+        spec = variability.get(activity)
+        if spec is None and activity == "Return":
+            spec = variability.get("Transit")
+        name, cv = spec if spec is not None else ("fixed", 0.)
+        if name not in DISTRIBUTIONS:
+            raise ValueError(f"Invalid distribution: {name}. Please use one of {list(DISTRIBUTIONS)}.")
+        factors[activity] = np.maximum(DISTRIBUTIONS[name](rng, cv, trips), 0.).tolist()
+    return factors
+
+
+class _Resource:
+    """
+    A pool of identical servers (batching plants or pumps) with a FIFO queue,
+    recording the queue length over time and the busy time of each server.
+    """
+    def __init__(self, count: int, record: bool):
+        self.free = list(range(count))
+        self.queue = deque()
+        self.busy = np.zeros(count)
+        self.server_end = [None] * count
+        self.longest_gap = 0.
+        self.first_start = math.inf
+        self.last_end = 0.
+        self.record = record
+        self.queue_times = [0.]
+        self.queue_lengths = [0]
+
+    def _log_queue(self, time: float) -> None:
+        if self.record:
+            self.queue_times.append(time)
+            self.queue_lengths.append(len(self.queue))
+
+    def request(self, time: float, mixer: int) -> int | None:
+        """
+        Returns a free server for 'mixer' at 'time', or None after queueing it.
+        """
+        if self.free:
+            return self.free.pop()
+        self.queue.append((mixer, time))
+        self._log_queue(time)
+        return None
+
+    def release(self, time: float, server: int) -> tuple[int, float] | None:
+        """
+        Frees 'server' at 'time' and returns the (mixer, queued since) next
+        in the queue, which takes the server, or None if the queue is empty.
+        """
+        if self.queue:
+            waiting = self.queue.popleft()
+            self._log_queue(time)
+            return waiting
+        self.free.append(server)
+        return None
+
+    def serve(self, start: float, end: float, server: int) -> None:
+        if self.server_end[server] is not None:
+            self.longest_gap = max(self.longest_gap, start - self.server_end[server])
+        self.server_end[server] = end
+        self.busy[server] += end - start
+        self.first_start = min(self.first_start, start)
+        self.last_end = max(self.last_end, end)
+
+
+def simulate_fleet(
+    num_mixers: int,
+    mixer_volume: float,
+    total_volume: float,
+    transit_time: float,
+    batch_plant_rate: float,
+    pumping_rate: float,
+    num_plants: int = 1,
+    num_pumps: int = 1,
+    maneuver_allowance: float = 0,
+    return_time: float | None = None,
+    record: bool = True,
+    variability: dict[str, tuple[str, float]] | None = None,
+    rng: np.random.Generator | None = None,
+) -> dict:
+    """
+    Returns a dict of the results of a discrete-event simulation of a pour of
+    'total_volume' (m3) by 'num_mixers' mixers of 'mixer_volume' (m3) shuttling
+    between 'num_plants' batching plants of 'batch_plant_rate' (m3/hr each)
+    and a site with 'num_pumps' pumps of 'pumping_rate' (m3/hr each).
+
+    Times are in minutes from the start, when every mixer is at the plants.
+    Each trip is:
+        Plant queue -> Loading -> Transit -> Site queue -> Pumping -> Return
+    The loading time is increased by 'maneuver_allowance' (%), the journey to
+    site takes 'transit_time' and the journey back 'return_time' (the same by
+    default). Plants and pumps serve the mixers first come, first served.
+    Mixers are dispatched until the whole volume is loaded; the last load
+    carries what remains.
+
+    If 'variability' is given (see sample_factors), the duration of each
+    activity of each trip is its nominal duration times a factor drawn
+    from 'rng' (a new unseeded generator by default).
+
+    The dict holds:
+        - "Duration": the end of the last pumping
+        - "Trips", "Volume": the number of loads and the volume delivered
+        - "Pour rate": the volume pumped per hour of pumping (m3/hr)
+        - "Pump idle time": the time each pump stood idle between the first
+          and last pumping on site, an array
+        - "Longest pump gap": the longest time any pump waited for a mixer
+        - "Plant utilisation", "Pump utilisation": the busy fraction of
+          the plants and pumps over the duration
+        - "Plant queue", "Site queue": arrays (times, lengths) of the number
+          of mixers waiting, stepping at each time
+        - "Timelines": for each mixer, a list of (start, end, activity)
+    Set 'record' to False to skip the timelines and queue series, e.g. when
+    the simulation is run many times in a planning loop.
+    """
+    if num_mixers <= 0 or num_plants <= 0 or num_pumps <= 0:
+        raise ValueError("The numbers of mixers, plants and pumps must be positive")
+    if mixer_volume <= 0 or total_volume <= 0:
+        raise ValueError("Mixer and total volumes must be positive")
+    if batch_plant_rate <= 0 or pumping_rate <= 0:
+        raise ValueError("Batch plant and pumping rates must be positive")
+    if transit_time < 0 or maneuver_allowance < 0:
+        raise ValueError("Transit time and maneuver allowance cannot be negative")
+    if return_time is None:
+        return_time = transit_time
+    # Counted up front so that float residue in the volumes cannot add a trip
+    n_trips = math.ceil(total_volume / mixer_volume - 1e-9)
+    loading_factor = 60 / batch_plant_rate * (1 + maneuver_allowance / 100)
+    pumping_factor = 60 / pumping_rate
+    if variability is None:
+        factors = None
+    else:
+        factors = sample_factors(variability, rng or np.random.default_rng(), n_trips)
+        loading_factors, transit_factors = factors["Loading"], factors["Transit"]
+        pumping_factors, return_factors = factors["Pumping"], factors["Return"]
+
+    plants = _Resource(num_plants, record)
+    pumps = _Resource(num_pumps, record)
+    timelines = [[] for _ in range(num_mixers)]
+    loads = [0.] * num_mixers # the volume each mixer carries
+    mixer_trips = [0] * num_mixers # the trip each mixer is on
+    remaining = total_volume
+    trips = 0
+    events = [] # (time, kind, sequence, mixer, server)
+    sequence = 0
+
+    def schedule(time: float, kind: int, mixer: int, server: int = -1) -> None:
+        nonlocal sequence
+        heapq.heappush(events, (time, kind, sequence, mixer, server))
+        sequence += 1
+
+    def start_loading(time: float, mixer: int, server: int, queued_since: float) -> None:
+        nonlocal remaining, trips
+        trips += 1
+        load = mixer_volume if trips < n_trips else remaining
+        remaining = remaining - load if trips < n_trips else 0.
+        loads[mixer] = load
+        mixer_trips[mixer] = trips - 1
+        duration = load * loading_factor
+        if factors is not None:
+            duration *= loading_factors[trips - 1]
+        end = time + duration
+        plants.serve(time, end, server)
+        if record:
+            if time > queued_since:
+                timelines[mixer].append((queued_since, time, "Plant queue"))
+            timelines[mixer].append((time, end, "Loading"))
+        schedule(end, _LOADED, mixer, server)
+
+    def start_pumping(time: float, mixer: int, server: int, queued_since: float) -> None:
+        duration = loads[mixer] * pumping_factor
+        if factors is not None:
+            duration *= pumping_factors[mixer_trips[mixer]]
+        end = time + duration
+        pumps.serve(time, end, server)
+        if record:
+            if time > queued_since:
+                timelines[mixer].append((queued_since, time, "Site queue"))
+            timelines[mixer].append((time, end, "Pumping"))
+        schedule(end, _PUMPED, mixer, server)
+
+    for mixer in range(num_mixers):
+        schedule(0., _ARRIVE_PLANT, mixer)
+
+    while events:
+        time, kind, _, mixer, server = heapq.heappop(events)
+        if kind == _ARRIVE_PLANT:
+            if trips >= n_trips:
+                continue # the mixer is stood down
+            server = plants.request(time, mixer)
+            if server is not None:
+                start_loading(time, mixer, server, time)
+        elif kind == _LOADED:
+            waiting = plants.release(time, server)
+            # Mixers queued once the volume is all loaded are stood down
+            while waiting is not None and trips >= n_trips:
+                waiting = plants.release(time, server)
+            if waiting is not None:
+                start_loading(time, waiting[0], server, waiting[1])
+            duration = transit_time if factors is None else transit_time * transit_factors[mixer_trips[mixer]]
+            if record:
+                timelines[mixer].append((time, time + duration, "Transit"))
+            schedule(time + duration, _ARRIVE_SITE, mixer)
+        elif kind == _ARRIVE_SITE:
+            server = pumps.request(time, mixer)
+            if server is not None:
+                start_pumping(time, mixer, server, time)
+        else: # _PUMPED
+            waiting = pumps.release(time, server)
+            if waiting is not None:
+                start_pumping(time, waiting[0], server, waiting[1])
+            if trips < n_trips:
+                duration = return_time if factors is None else return_time * return_factors[mixer_trips[mixer]]
+                if record:
+                    timelines[mixer].append((time, time + duration, "Return"))
+                schedule(time + duration, _ARRIVE_PLANT, mixer)
+
+    duration = pumps.last_end
+    pumping_window = pumps.last_end - pumps.first_start
+    results = {
+        "Duration": duration,
+        "Trips": trips,
+        "Volume": total_volume - remaining,
+        "Pour rate": (total_volume - remaining) / pumping_window * 60 if pumping_window > 0 else math.inf,
+        "Pump idle time": pumping_window - pumps.busy,
+        "Longest pump gap": pumps.longest_gap,
+        "Plant utilisation": plants.busy.sum() / (num_plants * duration),
+        "Pump utilisation": pumps.busy.sum() / (num_pumps * duration),
+    }
+    if record:
+        results["Plant queue"] = (np.array(plants.queue_times), np.array(plants.queue_lengths))
+        results["Site queue"] = (np.array(pumps.queue_times), np.array(pumps.queue_lengths))
+        results["Timelines"] = timelines
+    return results
+
+
+def _simulate_batch(pour: dict, n_pours: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Returns an array of the ("Pour rate", "Longest pump gap", "Duration") of
+    'n_pours' simulations of 'pour' (the simulate_fleet arguments) drawn
+    from 'seed'.
+    """
+    rng = np.random.default_rng(seed)
+    results = np.empty((n_pours, 3))
+    for idx in range(n_pours):
+        pour_results = simulate_fleet(**pour, rng=rng, record=False)
+        results[idx] = pour_results["Pour rate"], pour_results["Longest pump gap"], pour_results["Duration"]
+    return results
+
+
+def monte_carlo_fleet(
+    fleet_sizes: list[int],
+    n_pours: int = 1000,
+    seed: int = 0,
+    variability: dict[str, tuple[str, float]] = DEFAULT_VARIABILITY,
+    starvation_gap: float = 10.,
+    percentiles: tuple[float, ...] = (5, 50, 95),
+    workers: int | None = None,
+    batch_size: int = 50,
+    **pour,
+) -> dict:
+    """
+    Returns a dict of the results of 'n_pours' simulated pours (see
+    simulate_fleet, called with 'variability' and the arguments in 'pour'
+    other than the number of mixers) for each of 'fleet_sizes':
+        - "Fleet size": the array of 'fleet_sizes'
+        - "Starvation probability": the fraction of pours in which a pump
+          waited longer than 'starvation_gap' minutes for a mixer
+        - "Rate percentiles", "Duration percentiles": arrays of shape
+          (fleet sizes, percentiles) of the pour rate (m3/hr) and duration
+          (minutes) at each of 'percentiles'
+        - "Percentiles": 'percentiles'
+
+    The pours are run in batches of 'batch_size' on a pool of 'workers'
+    processes (one per CPU by default; 1 runs them in this process). Each
+    batch draws from its own child of the SeedSequence of 'seed', so the
+    results only depend on 'seed', 'n_pours' and 'batch_size', not on the
+    number of workers.
+    """
+    fleet_sizes = np.atleast_1d(np.asarray(fleet_sizes, dtype=int))
+    batches = [min(batch_size, n_pours - start) for start in range(0, n_pours, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(fleet_sizes) * len(batches))
+    tasks = [
+        (dict(pour, num_mixers=int(fleet_size), variability=variability), n_batch, seeds[f * len(batches) + b])
+        for f, fleet_size in enumerate(fleet_sizes)
+        for b, n_batch in enumerate(batches)
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        outcomes = [_simulate_batch(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(_simulate_batch, *zip(*tasks)))
+    outcomes = np.concatenate(outcomes).reshape(len(fleet_sizes), n_pours, 3)
+    return {
+        "Fleet size": fleet_sizes,
+        "Starvation probability": (outcomes[:, :, 1] > starvation_gap).mean(axis=1),
+        "Rate percentiles": np.percentile(outcomes[:, :, 0], percentiles, axis=1).T,
+        "Duration percentiles": np.percentile(outcomes[:, :, 2], percentiles, axis=1).T,
+        "Percentiles": tuple(percentiles),
+    }
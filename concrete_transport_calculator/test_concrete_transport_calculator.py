@@ -1,3 +1,8 @@
+import itertools
+
+import numpy as np
+import pytest
+
 import concrete_transport_calculator as ctc  # Import script
 
 
@@ -46,3 +51,27 @@ def test_calculate_total_adjusted_one_way_time():
 # Test Function for calculate_adjusted_return_time
 def test_calculate_adjusted_return_time():
     assert ctc.calculate_adjusted_return_time(64, 15, 75) == 79
+
+# Test the functions on arrays of inputs
+def test_array_inputs():
+    assert list(ctc.calculate_transit_time(np.array([5, 10]), np.array([20, 15]))) == [15, 40]
+    assert list(ctc.calculate_loading_time(np.array([200, 100]), 10)) == [3, 6]
+    with pytest.raises(ValueError):
+        ctc.calculate_transit_time(np.array([5, 0]), 20)
+    with pytest.raises(ValueError):
+        ctc.calculate_adjusted_loading_time(3, np.array([20, -5]))
+
+# Test the sweep against the scalar functions
+def test_sweep():
+    distances, speeds, plant_rates = [2.5, 8], [15, 40], [90, 200]
+    results = ctc.sweep(distances, speeds, plant_rates, 20, [100, 250], 20, [60, 75])
+    assert results["Shape"] == (len(ctc.mixer_capacities), 2, 2, 2, 1, 2, 1, 2)
+    for m, volume in enumerate(ctc.mixer_capacities.values()):
+        for d, s, b, t, f in itertools.product(range(2), repeat=5):
+            loading_time = ctc.calculate_adjusted_loading_time(ctc.calculate_loading_time(plant_rates[b], volume), 20)
+            transit_time = ctc.calculate_transit_time(distances[d], speeds[s])
+            gross = ctc.calculate_gross_one_way_time(loading_time, transit_time, ctc.calculate_pumping_time(20, volume))
+            one_way = ctc.calculate_total_adjusted_one_way_time(gross, [60, 75][f])
+            cycle = ctc.calculate_adjusted_return_time(one_way, transit_time, [60, 75][f])
+            assert results["Cycle time"][m, d, s, b, 0, t, 0, f] == cycle
+            assert results["Mixers needed"][m, d, s, b, 0, t, 0, f] == ctc.calculate_mixers_needed([100, 250][t], volume * 60 / cycle)
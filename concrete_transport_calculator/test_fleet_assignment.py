@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+
+import concrete_transport_calculator as ctc
+import fleet_assignment as fa
+
+
+def test_single_route_matches_calculator():
+    model = fa.FleetAssignment({"Plant": 200}, {"Site": (150, 60)}, {("Plant", "Site"): 5.08}, mixers={"P 10": 10})
+    loading_time = ctc.calculate_adjusted_loading_time(ctc.calculate_loading_time(200, 10), 20)
+    transit_time = ctc.calculate_transit_time(5.08, 15)
+    gross = ctc.calculate_gross_one_way_time(loading_time, transit_time, ctc.calculate_pumping_time(60, 10))
+    cycle = ctc.calculate_adjusted_return_time(ctc.calculate_total_adjusted_one_way_time(gross, 75), transit_time, 75)
+    results = model.solve()
+    assert results["Status"] == "Optimal"
+    assert results["Mixers"] == {"P 10": ctc.calculate_mixers_needed(150, 10 * 60 / cycle)}
+    assert results["Site rates"]["Site"] >= 150
+
+
+def test_shared_plants_and_fleet_limits():
+    plants = {"North": 100, "South": 100}
+    sites = {"A": (120, 60), "B": (50, 60)}
+    distances = {("North", "A"): 4, ("South", "A"): 9, ("North", "B"): 6, ("South", "B"): 3}
+    model = fa.FleetAssignment(plants, sites, distances, available={"Everdigm ETM 12": 3})
+    results = model.solve(mip_rel_gap=0)
+    assert results["Status"] == "Optimal"
+    assert all(results["Site rates"][site] >= rate - 1e-6 for site, (rate, _) in sites.items())
+    assert all(results["Plant rates"][plant] <= rate + 1e-6 for plant, rate in plants.items())
+    assert results["Mixers"].get("Everdigm ETM 12", 0) <= 3
+    assert {row["Plant"] for row in results["Assignment"] if row["Site"] == "A"} == {"North", "South"}
+    assert math.isclose(results["Cost"], sum(results["Mixers"].values()))
+
+    model.set_site("A", required_rate=300)
+    assert model.solve()["Status"] == "Infeasible" # beyond the plants' 200 m3/hr
+
+
+def test_incremental_updates():
+    plants = {"North": 150, "South": 120}
+    sites = {"A": (60, 40), "B": (45, 30), "C": (30, 30)}
+    distances = {(plant, site): 3. + idx for idx, (plant, site) in enumerate(
+        (plant, site) for plant in plants for site in sites)}
+    model = fa.FleetAssignment(plants, sites, distances)
+    first = model.solve()
+
+    model.set_distance("North", "B", 20.)
+    model.set_plant("South", 90.)
+    model.set_site("C", pumping_rate=45.)
+    model.set_mixer("Putzmeister P 8 HR", cost=0.5)
+    changed = model.solve()
+    fresh = fa.FleetAssignment(
+        {"North": 150, "South": 90}, dict(sites, C=(30, 45)), dict(distances) | {("North", "B"): 20.},
+        costs={"Putzmeister P 8 HR": 0.5},
+    )
+    assert np.array_equal(model.rates, fresh.rates)
+    assert math.isclose(changed["Cost"], fresh.solve()["Cost"])
+
+    model.set_distance("North", "B", distances[("North", "B")])
+    model.set_plant("South", 120.)
+    model.set_site("C", pumping_rate=30.)
+    model.set_mixer("Putzmeister P 8 HR", cost=1.)
+    again = model.solve()
+    assert again["Time"] == 0. and again["Cost"] == first["Cost"]
+
+    # Memoised answers are copies and only the latest few are kept
+    again["Mixers"].clear()
+    again["Assignment"][0]["Number"] = -1
+    repeat = model.solve()
+    assert repeat["Mixers"] == first["Mixers"] and repeat["Assignment"] == first["Assignment"]
+    first["Site rates"].clear()
+    assert model.solve()["Site rates"]
+    small = fa.FleetAssignment(plants, sites, distances, max_solutions=1)
+    small.solve()
+    small.set_plant("South", 90.)
+    small.solve()
+    small.set_plant("South", 120.)
+    assert len(small._solutions) == 1 and small.solve()["Time"] > 0.
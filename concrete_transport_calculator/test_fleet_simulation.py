@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+import pytest
+
+import fleet_simulation as fs
+
+
+def max_overlap(intervals):
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    count = peak = 0
+    for _, step in events:
+        count += step
+        peak = max(peak, count)
+    return peak
+
+
+def test_single_mixer_cycle():
+    # 10 m3 loads: 3 min loading, 20 min transit, 30 min pumping, 15 min return
+    results = fs.simulate_fleet(1, 10, 35, 20, 200, 20, return_time=15)
+    assert results["Trips"] == 4 and results["Volume"] == 35
+    cycle = 3 + 20 + 30 + 15
+    assert math.isclose(results["Duration"], 3 * cycle + 1.5 + 20 + 15)  # last load is 5 m3
+    assert [activity for *_, activity in results["Timelines"][0][:4]] == ["Loading", "Transit", "Pumping", "Return"]
+    assert results["Plant queue"][1].max() == 0 and results["Site queue"][1].max() == 0
+    assert math.isclose(results["Pump idle time"][0], results["Duration"] - 3 - 20 - 35 * 3)
+
+
+def test_exact_multiple_volumes():
+    # Float residue of the loads must not add an empty trip
+    for mixer_volume, total_volume in ((7.2, 21.6), (9.6, 28.8), (8.4, 33.6), (10.8, 43.2)):
+        results = fs.simulate_fleet(3, mixer_volume, total_volume, 10, 100, 20)
+        assert results["Trips"] == round(total_volume / mixer_volume)
+        assert math.isclose(results["Volume"], total_volume)
+        pumped = [end - start for timeline in results["Timelines"] for start, end, activity in timeline
+                  if activity == "Pumping"]
+        assert len(pumped) == results["Trips"] and min(pumped) > 0
+
+
+def test_pump_limited_pour():
+    results = fs.simulate_fleet(12, 10, 600, 20, 200, 30, num_pumps=1, maneuver_allowance=20)
+    assert math.isclose(results["Pour rate"], 30.)
+    assert results["Pump idle time"][0] == 0
+    assert results["Site queue"][1].max() > 0
+
+
+def test_timelines_respect_resources():
+    results = fs.simulate_fleet(15, 8, 1000, 25, 90, 45, num_plants=2, num_pumps=3, maneuver_allowance=20)
+    loading, pumping = [], []
+    for timeline in results["Timelines"]:
+        for (_, end, _), (start, _, _) in zip(timeline, timeline[1:]):
+            assert math.isclose(end, start)  # each activity follows the last
+        loading += [(start, end) for start, end, activity in timeline if activity == "Loading"]
+        pumping += [(start, end) for start, end, activity in timeline if activity == "Pumping"]
+    assert max_overlap(loading) <= 2 and max_overlap(pumping) <= 3
+    assert len(loading) == results["Trips"] == 125
+    quiet = fs.simulate_fleet(15, 8, 1000, 25, 90, 45, num_plants=2, num_pumps=3, maneuver_allowance=20, record=False)
+    assert "Timelines" not in quiet and quiet["Duration"] == results["Duration"]
+    assert np.allclose(quiet["Pump idle time"], results["Pump idle time"])
+
+
+def test_simulate_fleet_invalid():
+    with pytest.raises(ValueError):
+        fs.simulate_fleet(0, 10, 100, 20, 200, 20)
+    with pytest.raises(ValueError):
+        fs.simulate_fleet(4, 10, 100, 20, 0, 20)
+
+
+POUR = dict(mixer_volume=10, total_volume=600, transit_time=30, batch_plant_rate=120, pumping_rate=40,
+            num_plants=2, num_pumps=2, maneuver_allowance=20)
+
+
+def test_variability():
+    nominal = fs.simulate_fleet(8, **POUR)
+    fixed = fs.simulate_fleet(8, **POUR, variability={"Transit": ("fixed", 0.3)})
+    assert fixed["Duration"] == nominal["Duration"]
+    first = fs.simulate_fleet(8, **POUR, variability=fs.DEFAULT_VARIABILITY, rng=np.random.default_rng(3))
+    second = fs.simulate_fleet(8, **POUR, variability=fs.DEFAULT_VARIABILITY, rng=np.random.default_rng(3))
+    assert first["Timelines"] == second["Timelines"] and first["Duration"] != nominal["Duration"]
+    factors = fs.sample_factors({"Loading": ("gamma", 0.2), "Transit": ("uniform", 0.1)}, np.random.default_rng(0), 20000)
+    assert math.isclose(np.mean(factors["Loading"]), 1., rel_tol=0.01)
+    assert math.isclose(np.std(factors["Return"]), 0.1, rel_tol=0.05)
+    assert factors["Pumping"] == [1.] * 20000
+    with pytest.raises(ValueError):
+        fs.sample_factors({"Loading": ("cauchy", 0.2)}, np.random.default_rng(0), 10)
+
+
+def test_monte_carlo_fleet():
+    results = fs.monte_carlo_fleet([4, 8, 14], n_pours=40, seed=7, workers=1, batch_size=15, **POUR)
+    assert results["Rate percentiles"].shape == (3, 3)
+    assert results["Starvation probability"][0] == 1. and results["Starvation probability"][2] < 0.5
+    assert (np.diff(results["Rate percentiles"][:, 1]) > 0).all()
+    pooled = fs.monte_carlo_fleet([4, 8, 14], n_pours=40, seed=7, workers=2, batch_size=15, **POUR)
+    for key in ("Starvation probability", "Rate percentiles", "Duration percentiles"):
+        assert np.array_equal(results[key], pooled[key])
+
+    # A total volume an exact multiple of the mixer volume samples one factor per trip
+    exact = fs.monte_carlo_fleet([3], n_pours=10, workers=1, mixer_volume=7.2, total_volume=21.6, transit_time=10,
+                                 batch_plant_rate=100, pumping_rate=20)
+    assert np.isfinite(exact["Rate percentiles"]).all()
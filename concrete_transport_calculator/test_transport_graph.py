@@ -0,0 +1,50 @@
+import pytest
+
+import concrete_transport_calculator as ctc
+import transport_graph as tg
+
+INPUTS = dict(mixer_volume=10, distance=5.08, speed=15, batch_plant_rate=200, theoretical_rate=200,
+              pumping_rate=20, maneuver_allowance=20, fleet_allowance=75)
+
+
+def test_evaluate_matches_calculator():
+    results = tg.TransportGraph(cache=tg.ComputationCache()).evaluate(INPUTS)
+    loading_time = ctc.calculate_adjusted_loading_time(ctc.calculate_loading_time(200, 10), 20)
+    transit_time = ctc.calculate_transit_time(5.08, 15)
+    gross = ctc.calculate_gross_one_way_time(loading_time, transit_time, ctc.calculate_pumping_time(20, 10))
+    one_way = ctc.calculate_total_adjusted_one_way_time(gross, 75)
+    assert results["total_adjusted_one_way_time"] == one_way
+    assert results["adjusted_return_time"] == ctc.calculate_adjusted_return_time(one_way, transit_time, 75)
+    assert results["hourly_rate"] == ctc.calculate_effective_hourly_rate(
+        ctc.calculate_mixers_loaded_per_hour(loading_time, 200, 200), 10)
+
+
+def test_only_downstream_quantities_recomputed():
+    graph = tg.TransportGraph(cache=tg.ComputationCache())
+    graph.evaluate(INPUTS)
+    assert len(graph.recomputed) == len(tg.TRANSPORT_GRAPH)
+    graph.evaluate(dict(INPUTS, pumping_rate=30))
+    assert graph.recomputed == graph.downstream("pumping_rate") == [
+        "pumping_time", "gross_one_way_time", "total_adjusted_one_way_time", "adjusted_return_time"]
+    graph.evaluate(INPUTS)
+    assert graph.recomputed == []
+    graph.evaluate(dict(INPUTS, distance=8), outputs=("transit_time",))
+    assert graph.recomputed == ["transit_time"]
+
+
+def test_shared_bounded_cache():
+    cache = tg.ComputationCache(maxsize=12)
+    tg.TransportGraph(cache=cache).evaluate(INPUTS)
+    other_session = tg.TransportGraph(cache=cache)
+    other_session.evaluate(INPUTS)
+    assert other_session.recomputed == []
+    assert cache.stats()["hits"] == len(tg.TRANSPORT_GRAPH)
+    for speed in range(20, 30):
+        other_session.evaluate(dict(INPUTS, speed=speed))
+    assert len(cache) == 12
+
+
+def test_graph_cycle():
+    graph = {"a": (abs, ("b",)), "b": (abs, ("a",))}
+    with pytest.raises(ValueError):
+        tg.TransportGraph(graph)
@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from concrete_transport_calculator import (
+    calculate_loading_time, calculate_adjusted_loading_time, calculate_transit_time, calculate_pumping_time,
+    calculate_batching_plants_needed, calculate_mixers_loaded_per_hour, calculate_effective_hourly_rate,
+    calculate_gross_one_way_time, calculate_total_adjusted_one_way_time, calculate_adjusted_return_time,
+)
+
+# The inputs of the calculation, as named in the app
+INPUTS = ("mixer_volume", "distance", "speed", "batch_plant_rate", "theoretical_rate",
+          "pumping_rate", "maneuver_allowance", "fleet_allowance")
+
+# Each quantity of the calculation: the pure function giving it and the
+# inputs or quantities it is called with, in order
+TRANSPORT_GRAPH = {
+    "loading_time": (calculate_loading_time, ("batch_plant_rate", "mixer_volume")),
+    "adjusted_loading_time": (calculate_adjusted_loading_time, ("loading_time", "maneuver_allowance")),
+    "transit_time": (calculate_transit_time, ("distance", "speed")),
+    "pumping_time": (calculate_pumping_time, ("pumping_rate", "mixer_volume")),
+    "plants_needed": (calculate_batching_plants_needed, ("theoretical_rate", "batch_plant_rate")),
+    "mixers_loaded_per_hour": (calculate_mixers_loaded_per_hour,
+                               ("adjusted_loading_time", "theoretical_rate", "batch_plant_rate")),
+    "hourly_rate": (calculate_effective_hourly_rate, ("mixers_loaded_per_hour", "mixer_volume")),
+    "gross_one_way_time": (calculate_gross_one_way_time, ("adjusted_loading_time", "transit_time", "pumping_time")),
+    "total_adjusted_one_way_time": (calculate_total_adjusted_one_way_time, ("gross_one_way_time", "fleet_allowance")),
+    "adjusted_return_time": (calculate_adjusted_return_time,
+                             ("total_adjusted_one_way_time", "transit_time", "fleet_allowance")),
+}
+
+
+class ComputationCache:
+    """
+    A bounded, thread-safe least-recently-used cache of the results of pure
+    functions keyed by hashable keys, shared by every session of the app.
+
+    'maxsize': the number of results kept
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns a dict of the hit and miss counts of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.results),
+            "hit_rate": self.hits / lookups if lookups else 0.,
+        }
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets the statistics.
+        """
+        with self.lock:
+            self.results.clear()
+            self.hits = self.misses = 0
+
+    def get(self, key: tuple, function: Callable, *args) -> tuple[object, bool]:
+        """
+        Returns (function(*args), True) if the result for 'key' had to be
+        computed or (the cached result, False) otherwise.
+        """
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return self.results[key], False
+            self.misses += 1
+        result = function(*args) # outside the lock: other sessions are not held up
+        with self.lock:
+            self.results[key] = result
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+        return result, True
+
+
+shared_cache = ComputationCache()
+
+
+class TransportGraph:
+    """
+    Evaluates the quantities of 'graph' (see TRANSPORT_GRAPH) from a dict of
+    the INPUTS. Each quantity is memoised in 'cache' (the process-wide
+    shared_cache by default) by the values it is called with, so after one
+    input changes only the quantities downstream of it are recomputed and
+    inputs seen before, by any session, are served from the cache.
+    """
+    def __init__(self, graph: dict = TRANSPORT_GRAPH, cache: ComputationCache | None = None):
+        self.graph = graph
+        self.cache = shared_cache if cache is None else cache
+        self.order = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in self.order or name not in graph:
+                return
+            if name in visiting:
+                raise ValueError(f"The graph has a cycle through {name}")
+            visiting.add(name)
+            for dependency in graph[name][1]:
+                visit(dependency)
+            visiting.discard(name)
+            self.order.append(name)
+
+        for name in graph:
+            visit(name)
+        # The inputs and quantities each quantity depends on, directly or not
+        self._dependencies = {}
+        for name in self.order:
+            found = set()
+            for dependency in graph[name][1]:
+                found |= {dependency} | self._dependencies.get(dependency, set())
+            self._dependencies[name] = frozenset(found)
+        self.recomputed = []
+
+    def dependencies(self, name: str) -> set[str]:
+        """
+        Returns the names of the inputs and quantities 'name' depends on.
+        """
+        return set(self._dependencies.get(name, ()))
+
+    def downstream(self, name: str) -> list[str]:
+        """
+        Returns the quantities depending on 'name', in evaluation order.
+        """
+        return [quantity for quantity in self.order if name in self.dependencies(quantity)]
+
+    def evaluate(self, inputs: dict, outputs: tuple[str, ...] | None = None) -> dict:
+        """
+        Returns a dict of 'inputs' and the quantities in 'outputs' (all of
+        them by default) with the quantities they depend on. The names of
+        the quantities that had to be computed are left in 'recomputed'.
+        """
+        needed = set(self.order) if outputs is None else set(outputs).union(*(self._dependencies[name] for name in outputs))
+        values = dict(inputs)
+        self.recomputed = []
+        for name in self.order:
+            if name not in needed:
+                continue
+            function, dependencies = self.graph[name]
+            args = tuple(values[dependency] for dependency in dependencies)
+            values[name], computed = self.cache.get((function, args), function, *args)
+            if computed:
+                self.recomputed.append(name)
+        return values
@@ -0,0 +1,326 @@
+import numpy as np
+from scipy.linalg import cho_solve_banded, cholesky_banded
+
+import eng_module.load_factors as load_factors
+
+# Degrees of freedom restrained by each support type: (vertical, rotation)
+SUPPORT_RESTRAINTS = {
+    "P": (True, False),
+    "R": (True, False),
+    "F": (True, True),
+}
+
+# Consistent nodal loads [Fi, Mi, Fj, Mj] of a linearly varying load over an
+# element of length L, per unit load intensity at the i end and at the j end
+# (each row is multiplied by the powers of L in LOAD_POWERS)
+LOAD_COEFFS_I = np.array([7 / 20, 1 / 20, 3 / 20, -1 / 30])
+LOAD_COEFFS_J = np.array([3 / 20, 1 / 30, 7 / 20, -1 / 20])
+LOAD_POWERS = np.array([1, 2, 1, 2])
+
+
+class ContinuousBeam:
+    """
+    A straight, in-plane Euler-Bernoulli beam analysed by the direct stiffness
+    method with two degrees of freedom (vertical deflection and rotation) per
+    node. It is a lightweight alternative to the FEModel3D built by
+    beams.build_beam for beams with vertical ("Fy") loads only.
+
+    'beam_data': a dict structured as by beams.get_structured_beam_data. The
+        bending stiffness is E * Iz; supports may be "P", "R" or "F" and loads
+        "Point" or "Dist".
+
+    Nodes are placed at the beam ends, the supports and every load
+    discontinuity, so each element carries a linearly varying load only and
+    the results between nodes are exact. The banded stiffness matrix is
+    factorised once, on construction.
+
+    Signs follow PyNite's member results so the two are interchangeable:
+    loads, reactions and deflections are positive upwards, and the shear and
+    moment are those returned by Member3D.shear("Fy") and Member3D.moment("Mz").
+    """
+    def __init__(self, beam_data: dict):
+        self.name = beam_data['Name']
+        self.length = beam_data['L']
+        self.EI = beam_data['E'] * beam_data['Iz']
+        self.supports = dict(sorted(beam_data['Supports'].items()))
+        self.loads = beam_data['Loads']
+
+        self.load_cases = []
+        node_locations = {0.0, float(self.length), *self.supports}
+        for load in self.loads:
+            if load['Direction'] != "Fy":
+                raise ValueError(f"Only 'Fy' loads can be analysed, not '{load['Direction']}'.")
+            if load['Type'] == "Point":
+                node_locations.add(load['Location'])
+            elif load['Type'] == "Dist":
+                node_locations.update((load['Start Location'], load['End Location']))
+            else:
+                raise ValueError(f"Invalid load type: {load['Type']}. Please use 'Point' or 'Dist'.")
+            if load['Case'] not in self.load_cases:
+                self.load_cases.append(load['Case'])
+        self.nodes = np.array(sorted(x for x in node_locations if 0 <= x <= self.length))
+        self.element_lengths = np.diff(self.nodes)
+
+        n_dof = 2 * len(self.nodes)
+        self.restrained = np.zeros(n_dof, dtype=bool)
+        for sup_loc, sup_type in self.supports.items():
+            if sup_type not in SUPPORT_RESTRAINTS:
+                raise ValueError(f"Invalid support type: {sup_type}. Please use one of {list(SUPPORT_RESTRAINTS)}.")
+            node = self.node_index(sup_loc)
+            self.restrained[2 * node:2 * node + 2] |= SUPPORT_RESTRAINTS[sup_type]
+        self.support_dofs = np.array([2 * self.node_index(sup_loc) for sup_loc in self.supports], dtype=int)
+
+        self.element_stiffness = self._element_stiffness()
+        self.factor = self._factorise()
+        self.solves = 0 # the number of calls to solve
+
+    def node_index(self, x: float) -> int:
+        """
+        Returns the index of the node at 'x'.
+        """
+        return int(np.searchsorted(self.nodes, x))
+
+    def _element_stiffness(self) -> np.ndarray:
+        """
+        Returns an array of shape (number of elements, 4, 4) of the element
+        stiffness matrices for the degrees of freedom [v_i, theta_i, v_j, theta_j].
+        """
+        L = self.element_lengths[:, None, None]
+        k = np.array([
+            [12, 6, -12, 6],
+            [6, 4, -6, 2],
+            [-12, -6, 12, -6],
+            [6, 2, -6, 4],
+        ], dtype=np.float64)
+        # Powers of L dividing each term: EI/L**3, EI/L**2 and EI/L
+        powers = np.array([
+            [3, 2, 3, 2],
+            [2, 1, 2, 1],
+            [3, 2, 3, 2],
+            [2, 1, 2, 1],
+        ])
+        return self.EI * k / L**powers
+
+    def _factorise(self) -> np.ndarray:
+        """
+        Returns the banded Cholesky factor of the stiffness matrix, with each
+        restrained degree of freedom replaced by an identity row and column.
+        """
+        n_dof = len(self.restrained)
+        bandwidth = 3
+        banded = np.zeros((bandwidth + 1, n_dof))
+        # Upper banded storage: K[i, j] is held at banded[bandwidth + i - j, j]
+        for a in range(4):
+            for b in range(a, 4):
+                rows = 2 * np.arange(len(self.element_lengths)) + a
+                cols = rows + (b - a)
+                np.add.at(banded, (bandwidth + rows - cols, cols), self.element_stiffness[:, a, b])
+        for dof in np.flatnonzero(self.restrained):
+            for offset in range(1, bandwidth + 1):
+                if dof + offset < n_dof:
+                    banded[bandwidth - offset, dof + offset] = 0. # row 'dof'
+                if dof - offset >= 0:
+                    banded[bandwidth - offset, dof] = 0. # column 'dof'
+            banded[bandwidth, dof] = 1.
+        unstable = ValueError(f"Beam '{self.name}' is unstable: check its supports.")
+        try:
+            factor = cholesky_banded(banded)
+        except np.linalg.LinAlgError:
+            raise unstable from None
+        # A mechanism shows up as a pivot lost to round-off rather than a failure
+        if np.any(factor[bandwidth]**2 < 1e-10 * banded[bandwidth]):
+            raise unstable
+        return factor
+
+    def case_loads(self, load_cases: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the loads of 'load_cases' as three arrays with one column per
+        load case:
+            - the point loads at each degree of freedom, shape (number of dofs, cases)
+            - the distributed load intensity at the start of each element and
+            - at the end of each element, shape (number of elements, cases)
+        """
+        n_cases = len(load_cases)
+        case_index = {case: idx for idx, case in enumerate(load_cases)}
+        point_loads = np.zeros((len(self.restrained), n_cases))
+        q_start = np.zeros((len(self.element_lengths), n_cases))
+        q_end = np.zeros((len(self.element_lengths), n_cases))
+        starts, ends = self.nodes[:-1], self.nodes[1:]
+        for load in self.loads:
+            if load['Case'] not in case_index:
+                continue
+            case = case_index[load['Case']]
+            if load['Type'] == "Point":
+                if 0 <= load['Location'] <= self.length:
+                    point_loads[2 * self.node_index(load['Location']), case] += load['Magnitude']
+                continue
+            x1, x2 = load['Start Location'], load['End Location']
+            w1, w2 = load['Start Magnitude'], load['End Magnitude']
+            if x2 <= x1:
+                continue
+            covered = (starts >= x1) & (ends <= x2)
+            slope = (w2 - w1) / (x2 - x1)
+            q_start[covered, case] += w1 + slope * (starts[covered] - x1)
+            q_end[covered, case] += w1 + slope * (ends[covered] - x1)
+        return point_loads, q_start, q_end
+
+    def solve(self, load_cases: list[str] | None = None) -> dict[str, np.ndarray]:
+        """
+        Returns a dict of the solution of 'load_cases' (all of the beam's load
+        cases by default), with one column per load case:
+            - "Displacements": the nodal [v, theta] values, shape (number of dofs, cases)
+            - "End Forces": the forces [Fi, Mi, Fj, Mj] applied by the nodes
+              to each element, shape (number of elements, 4, cases)
+            - "q start", "q end": the element load intensities (see case_loads)
+            - "Reactions": the vertical support reactions, shape (supports, cases)
+        All of the load cases are solved together with the one factorisation.
+        """
+        if load_cases is None:
+            load_cases = self.load_cases
+        self.solves += 1
+        point_loads, q_start, q_end = self.case_loads(load_cases)
+        L = self.element_lengths[:, None, None]
+        equivalent = (
+            LOAD_COEFFS_I[None, :, None] * q_start[:, None, :]
+            + LOAD_COEFFS_J[None, :, None] * q_end[:, None, :]
+        ) * L**LOAD_POWERS[None, :, None]
+
+        n_elements = len(self.element_lengths)
+        element_dofs = 2 * np.arange(n_elements)[:, None] + np.arange(4)
+        forces = point_loads.copy()
+        np.add.at(forces, element_dofs, equivalent)
+        forces[self.restrained] = 0.
+        displacements = cho_solve_banded((self.factor, False), forces)
+
+        end_forces = np.einsum("eab,ebc->eac", self.element_stiffness, displacements[element_dofs]) - equivalent
+        nodal_forces = np.zeros_like(point_loads)
+        np.add.at(nodal_forces, element_dofs, end_forces)
+        reactions = (nodal_forces - point_loads)[self.support_dofs]
+        return {
+            "Displacements": displacements,
+            "End Forces": end_forces,
+            "q start": q_start,
+            "q end": q_end,
+            "Reactions": reactions,
+        }
+
+    def evaluate(self, solution: dict[str, np.ndarray], x: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns a dict of the "Shear", "Moment" and "Deflection" of 'solution'
+        (from solve) at the locations 'x', each of shape (len(x), cases). The
+        piecewise polynomials of each element are evaluated for all locations
+        at once.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        element = np.clip(np.searchsorted(self.nodes, x, side="right") - 1, 0, len(self.element_lengths) - 1)
+        s = (x - self.nodes[element])[:, None]
+        L = self.element_lengths[element][:, None]
+        end_forces = solution["End Forces"][element]
+        f_i, m_i = end_forces[:, 0, :], end_forces[:, 1, :]
+        q_1 = solution["q start"][element]
+        dq = solution["q end"][element] - q_1
+        v_i = solution["Displacements"][2 * element]
+        theta_i = solution["Displacements"][2 * element + 1]
+
+        shear = f_i + q_1 * s + dq * s**2 / (2 * L)
+        sagging = -m_i + f_i * s + q_1 * s**2 / 2 + dq * s**3 / (6 * L)
+        deflection = v_i + theta_i * s + (
+            -m_i * s**2 / 2 + f_i * s**3 / 6 + q_1 * s**4 / 24 + dq * s**5 / (120 * L)
+        ) / self.EI
+        return {"Shear": shear, "Moment": -sagging, "Deflection": deflection}
+
+    def combine(self, solution: dict[str, np.ndarray], factors: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the solution of the load combinations given by 'factors', an
+        array of shape (cases, combinations) of the factor applied to each load
+        case of 'solution' (from solve) in each combination. Every part of a
+        solution is linear in the loads, so the combinations are superposed
+        rather than solved and 'evaluate' accepts the result as it is.
+        """
+        return {key: value @ factors for key, value in solution.items()}
+
+    def diagram_points(self, n_points: int = 101) -> np.ndarray:
+        """
+        Returns n_points locations evenly spaced along the beam with the nodes added.
+        """
+        return np.union1d(np.linspace(0, self.length, n_points), self.nodes)
+
+    def _results(self, names: list[str], x: np.ndarray, diagrams: dict, reactions: np.ndarray) -> dict[str, dict]:
+        """
+        Returns the dict of results described in 'analyze' of the load cases or
+        combinations 'names', the columns of 'diagrams' and 'reactions'.
+        """
+        results = {}
+        for idx, name in enumerate(names):
+            results[name] = {
+                "x": x,
+                "Shear": diagrams["Shear"][:, idx],
+                "Moment": diagrams["Moment"][:, idx],
+                "Deflection": diagrams["Deflection"][:, idx],
+                "Reactions": dict(zip(self.supports, reactions[:, idx])),
+            }
+        return results
+
+    def analyze(self, n_points: int = 101) -> dict[str, dict]:
+        """
+        Returns a dict keyed by load case of the results of each of the beam's
+        load cases. Each result is a dict of:
+            - "x": the n_points locations along the beam, with the nodes added
+            - "Shear", "Moment", "Deflection": arrays of the values at "x"
+            - "Reactions": a dict of the vertical reaction keyed by support location
+        """
+        x = self.diagram_points(n_points)
+        solution = self.solve()
+        return self._results(self.load_cases, x, self.evaluate(solution, x), solution["Reactions"])
+
+    def analyze_combinations(
+        self,
+        load_combos: dict[str, dict[str, float]] = load_factors.EC_0_COMBS,
+        n_points: int = 101,
+        case_names: dict[str, str] = load_factors.LOAD_CASE_NAMES,
+    ) -> dict[str, dict]:
+        """
+        Returns a dict keyed by load combination of the results (as described
+        in 'analyze') of each of 'load_combos'. See
+        load_factors.combination_matrix for how 'case_names' maps the
+        combinations' load types onto the beam's load cases.
+
+        Each load case is solved and evaluated once; the combinations are then
+        superposed from the load case results with one matrix product.
+        """
+        x = self.diagram_points(n_points)
+        solution = self.solve()
+        diagrams = self.evaluate(solution, x)
+        factors = load_factors.combination_matrix(self.load_cases, load_combos, case_names)
+        combined = {name: values @ factors for name, values in diagrams.items()}
+        return self._results(list(load_combos), x, combined, solution["Reactions"] @ factors)
+
+
+def envelope(results: dict[str, dict]) -> dict:
+    """
+    Returns the envelope of 'results' (from ContinuousBeam.analyze or
+    ContinuousBeam.analyze_combinations) as a dict of:
+        - "x": the locations along the beam
+        - "Max Shear", "Min Shear", "Max Moment", ...: arrays of the extreme
+          values at "x" over all of 'results'
+        - "Max Shear Combo", "Min Shear Combo", ...: arrays of the names of the
+          governing load case or combination at "x"
+        - "Max Reactions", "Min Reactions": dicts of the extreme reactions
+          keyed by support location
+    """
+    names = np.array(list(results))
+    first = next(iter(results.values()))
+    enveloped = {"x": first["x"]}
+    for quantity in ("Shear", "Moment", "Deflection"):
+        values = np.stack([result[quantity] for result in results.values()])
+        max_idx, min_idx = values.argmax(axis=0), values.argmin(axis=0)
+        columns = np.arange(values.shape[1])
+        enveloped[f"Max {quantity}"] = values[max_idx, columns]
+        enveloped[f"Min {quantity}"] = values[min_idx, columns]
+        enveloped[f"Max {quantity} Combo"] = names[max_idx]
+        enveloped[f"Min {quantity} Combo"] = names[min_idx]
+    supports = list(first["Reactions"])
+    reactions = np.array([[result["Reactions"][x] for x in supports] for result in results.values()])
+    enveloped["Max Reactions"] = dict(zip(supports, reactions.max(axis=0)))
+    enveloped["Min Reactions"] = dict(zip(supports, reactions.min(axis=0)))
+    return enveloped
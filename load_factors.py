@@ -1,3 +1,7 @@
+import itertools
+
+import numpy as np
+
 EC_0_COMBS={
     "LC1":{"D":1.35},
     "LC2":{"D":1.35,"L":1.5},
@@ -6,6 +10,15 @@ EC_0_COMBS={
     "LC5":{"D":1.0,"W":1.5}
 }
 
+# The load case names used in beam files for the load types of EC_0_COMBS
+LOAD_CASE_NAMES={
+    "D":"Dead",
+    "L":"Live",
+    "W":"Wind",
+    "E":"Earthquake",
+    "S":"Snow",
+}
+
 def factor_load(
     D_load: float = 0., 
     D: float = 0., 
@@ -48,4 +61,229 @@ def min_factored_load(
     for load_combo in load_combos.values():
         factored=factor_load(**loads,**load_combo)
         acc.append(factored)
-    return min(acc)
\ No newline at end of file
+    return min(acc)
+
+
+def combination_matrix(
+        load_cases:list[str],
+        load_combos:dict[str,dict[str,float]],
+        case_names:dict[str,str]=LOAD_CASE_NAMES,
+)->np.ndarray:
+    """
+    Returns an array of shape (len(load_cases), len(load_combos)) of the factor
+    applied to each of 'load_cases' in each of 'load_combos'. A combination may
+    name a load case directly or by its load type in 'case_names' (e.g. "D" for
+    "Dead"); factors of load cases not in 'load_cases' are ignored.
+    """
+    case_index={load_case: idx for idx, load_case in enumerate(load_cases)}
+    factors=np.zeros((len(load_cases), len(load_combos)))
+    for combo_idx, load_combo in enumerate(load_combos.values()):
+        for load_case, factor in load_combo.items():
+            load_case=load_case if load_case in case_index else case_names.get(load_case)
+            if load_case in case_index:
+                factors[case_index[load_case], combo_idx]+=factor
+    return factors
+
+
+def combination_load_types(load_combos:dict[str,dict[str,float]])->list[str]:
+    """
+    Returns the load types named in 'load_combos' in the order they first appear.
+    """
+    names={}
+    for load_combo in load_combos.values():
+        names.update(dict.fromkeys(load_combo))
+    return list(names)
+
+
+def factored_loads(
+        loads:np.ndarray,
+        load_combos:dict[str,dict[str,float]]=EC_0_COMBS,
+        load_types:list[str]|None=None,
+)->np.ndarray:
+    """
+    Returns an array of shape (members, len(load_combos)) of the factored load
+    of each member in each of 'load_combos'.
+
+    'loads': an array of shape (members, len(load_types)) of the unfactored
+        load of each load type on each member
+    'load_types': the load type names of the columns of 'loads', which may be
+        any names used in 'load_combos'. Defaults to combination_load_types.
+    """
+    if load_types is None:
+        load_types=combination_load_types(load_combos)
+    loads=np.asarray(loads, dtype=np.float64)
+    if loads.shape[-1]!=len(load_types):
+        raise ValueError(f"'loads' has {loads.shape[-1]} load types but {len(load_types)} are named: {load_types}.")
+    return loads @ combination_matrix(load_types, load_combos, case_names={})
+
+
+def factored_envelope(
+        loads:np.ndarray,
+        load_combos:dict[str,dict[str,float]]=EC_0_COMBS,
+        load_types:list[str]|None=None,
+)->dict[str,np.ndarray]:
+    """
+    Returns the envelope of the factored loads (see factored_loads) of each
+    member as a dict of arrays with one value per member:
+        - "Max", "Min": the maximum and minimum factored load
+        - "Max Combo", "Min Combo": the names of the governing load combinations
+    and "Factored", the array of shape (members, combinations) of all of the
+    factored loads.
+    """
+    factored=factored_loads(loads, load_combos, load_types)
+    names=np.array(list(load_combos))
+    max_idx=factored.argmax(axis=-1)
+    min_idx=factored.argmin(axis=-1)
+    return {
+        "Max": np.take_along_axis(factored, max_idx[..., None], axis=-1)[..., 0],
+        "Min": np.take_along_axis(factored, min_idx[..., None], axis=-1)[..., 0],
+        "Max Combo": names[max_idx],
+        "Min Combo": names[min_idx],
+        "Factored": factored,
+    }
+
+
+# EN 1990 partial factors for the STR/GEO limit states (Table A1.2(B)) and
+# the reduction factor xi of expression 6.10b
+GAMMA_G_SUP=1.35
+GAMMA_G_INF=1.0
+GAMMA_Q=1.5
+XI=0.85
+
+# EN 1990 Table A1.1 combination factors of variable actions on buildings
+PSI_FACTORS={
+    "Category A":{"psi_0":0.7,"psi_1":0.5,"psi_2":0.3},
+    "Category B":{"psi_0":0.7,"psi_1":0.5,"psi_2":0.3},
+    "Category C":{"psi_0":0.7,"psi_1":0.7,"psi_2":0.6},
+    "Category D":{"psi_0":0.7,"psi_1":0.7,"psi_2":0.6},
+    "Category E":{"psi_0":1.0,"psi_1":0.9,"psi_2":0.8},
+    "Category F":{"psi_0":0.7,"psi_1":0.7,"psi_2":0.6},
+    "Category G":{"psi_0":0.7,"psi_1":0.5,"psi_2":0.3},
+    "Category H":{"psi_0":0.0,"psi_1":0.0,"psi_2":0.0},
+    "Snow":{"psi_0":0.5,"psi_1":0.2,"psi_2":0.0},
+    "Snow above 1000 m":{"psi_0":0.7,"psi_1":0.5,"psi_2":0.2},
+    "Wind":{"psi_0":0.6,"psi_1":0.2,"psi_2":0.0},
+    "Temperature":{"psi_0":0.6,"psi_1":0.5,"psi_2":0.0},
+}
+
+# For each EN 1990 combination expression: the unfavourable and favourable
+# factors of the permanent actions, and the factors of the leading and the
+# accompanying variable actions, as functions of an action (None: no
+# leading action)
+COMBINATION_EXPRESSIONS={
+    "6.10":(
+        lambda action: action.get("gamma_sup",GAMMA_G_SUP),
+        lambda action: action.get("gamma_inf",GAMMA_G_INF),
+        lambda action: action.get("gamma_Q",GAMMA_Q),
+        lambda action: action.get("gamma_Q",GAMMA_Q)*action["psi_0"],
+    ),
+    "6.10a":(
+        lambda action: action.get("gamma_sup",GAMMA_G_SUP),
+        lambda action: action.get("gamma_inf",GAMMA_G_INF),
+        None,
+        lambda action: action.get("gamma_Q",GAMMA_Q)*action["psi_0"],
+    ),
+    "6.10b":(
+        lambda action: XI*action.get("gamma_sup",GAMMA_G_SUP),
+        lambda action: action.get("gamma_inf",GAMMA_G_INF),
+        lambda action: action.get("gamma_Q",GAMMA_Q),
+        lambda action: action.get("gamma_Q",GAMMA_Q)*action["psi_0"],
+    ),
+    "6.14b":(lambda action: 1.0, lambda action: 1.0, lambda action: 1.0, lambda action: action["psi_0"]),
+    "6.15b":(lambda action: 1.0, lambda action: 1.0, lambda action: action["psi_1"], lambda action: action["psi_2"]),
+    "6.16b":(lambda action: 1.0, lambda action: 1.0, None, lambda action: action["psi_2"]),
+}
+
+
+def eurocode_combinations(
+        actions:list[dict],
+        expressions:tuple[str,...]=("6.10",),
+        signs:dict[str,int]|None=None,
+)->dict[str,dict[str,float]]:
+    """
+    Returns a dict of the EN 1990 load combinations of 'actions', in the same
+    form as EC_0_COMBS, keyed by a description of each combination
+    (e.g. "6.10: 1.35 Dead + 1.5 Live + 0.9 Wind").
+
+    'actions': a list of dicts, each with a "Name" and a "Type" of
+        "Permanent" or "Variable". Variable actions also need "psi_0",
+        "psi_1" and "psi_2" (see PSI_FACTORS). "gamma_sup", "gamma_inf" and
+        "gamma_Q" override the default partial factors of an action.
+    'expressions': the combination expressions to generate, any of
+        COMBINATION_EXPRESSIONS. Use ("6.10a", "6.10b") for the less
+        favourable of 6.10a and 6.10b.
+    'signs': when given, the combinations dominated for these signs of load
+        effect are pruned (see prune_combinations).
+
+    Each permanent action is taken as unfavourable and as favourable and
+    each variable action in turn as the leading action, with the others
+    either accompanying it or omitted (as when favourable). Combinations
+    that repeat another's factors are dropped.
+    """
+    permanent=[action for action in actions if action["Type"]=="Permanent"]
+    variable=[action for action in actions if action["Type"]=="Variable"]
+    if len(permanent)+len(variable)!=len(actions):
+        raise ValueError("Each action's 'Type' must be 'Permanent' or 'Variable'.")
+    load_combos={}
+    seen=set()
+    for expression in expressions:
+        unfavourable,favourable,leading,accompanying=COMBINATION_EXPRESSIONS[expression]
+        permanent_options=[
+            [(action["Name"],unfavourable(action)),(action["Name"],favourable(action))]
+            for action in permanent
+        ]
+        lead_options=[None] if leading is None else [None,*range(len(variable))]
+        for lead in lead_options:
+            variable_options=[]
+            for idx,action in enumerate(variable):
+                if idx==lead:
+                    variable_options.append([(action["Name"],leading(action))])
+                elif lead is None and leading is not None:
+                    # The permanent actions alone, all variable actions favourable
+                    variable_options.append([(action["Name"],0.)])
+                else:
+                    variable_options.append([(action["Name"],accompanying(action)),(action["Name"],0.)])
+            for factors in itertools.product(*permanent_options,*variable_options):
+                load_combo={name: round(factor,6) for name, factor in factors if factor}
+                key=tuple(sorted(load_combo.items()))
+                if key in seen:
+                    continue
+                seen.add(key)
+                description=" + ".join(f"{factor:g} {name}" for name, factor in load_combo.items())
+                load_combos[f"{expression}: {description}"]=load_combo
+    if signs is not None:
+        load_combos=prune_combinations(load_combos, signs)
+    return load_combos
+
+
+def prune_combinations(
+        load_combos:dict[str,dict[str,float]],
+        signs:dict[str,int],
+)->dict[str,dict[str,float]]:
+    """
+    Returns 'load_combos' without the combinations that cannot govern the
+    maximum of a load effect to which each load type contributes with the
+    sign in 'signs': +1 if its loads increase the effect, -1 if they reduce
+    it. Load types missing from 'signs' (or with a sign of 0) have an unknown
+    effect. Negate 'signs' to prune for the minimum of the load effect.
+
+    A combination is dropped if another one has a factor at least as large
+    on every load type with a sign of +1, at most as large on every load type
+    with a sign of -1, the same factor on every load type of unknown effect,
+    and is not identical to it (of identical combinations the first is kept).
+    """
+    names=list(load_combos)
+    load_types=combination_load_types(load_combos)
+    factors=combination_matrix(load_types, load_combos, case_names={}).T
+    sign=np.array([signs.get(load_type,0) for load_type in load_types])
+    known=sign!=0
+    effect=factors[:,known]*sign[known]
+    unknown=factors[:,~known]
+    kept={}
+    for idx,name in enumerate(names):
+        at_least=(effect>=effect[idx]).all(axis=1) & (unknown==unknown[idx]).all(axis=1)
+        better=at_least & (effect>effect[idx]).any(axis=1)
+        repeated=at_least & (effect==effect[idx]).all(axis=1) & (np.arange(len(names))<idx)
+        if not (better.any() or repeated.any()):
+            kept[name]=load_combos[name]
+    return kept
@@ -0,0 +1,110 @@
+import copy
+import math
+
+import numpy as np
+import pytest
+
+import eng_module.beam_design as beam_design
+import eng_module.beams as beams
+import eng_module.continuous_beam as continuous_beam
+import eng_module.load_factors as load_factors
+import eng_module.sections_db as sections_db
+
+
+def check_section(beam_data, section, grade="S355", deflection_ratio=250):
+    """
+    Returns the bending, shear and deflection utilisations of 'section' on
+    the beam, re-analysed with the section's own stiffness and self weight.
+    """
+    fy = sections_db.yield_strength(section["tf"], grade)
+    weight = beam_design.self_weight(section["kg/m"])
+    loads = [*beam_data['Loads'], {
+        'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -weight, 'End Magnitude': -weight,
+        'Start Location': 0., 'End Location': beam_data['L'], 'Case': 'Dead',
+    }]
+    model = continuous_beam.ContinuousBeam(dict(beam_data, Iz=section["Iy"], Loads=loads))
+    uls = model.analyze_combinations(load_factors.EC_0_COMBS, n_points=201)
+    sls = model.analyze_combinations({"SLS": {case: 1.0 for case in model.load_cases}}, n_points=201)["SLS"]
+    M_Ed = max(np.abs(result["Moment"]).max() for result in uls.values())
+    V_Ed = max(np.abs(result["Shear"]).max() for result in uls.values())
+    limits = beam_design.deflection_limits(beam_data, sls["x"], deflection_ratio)
+    return (
+        M_Ed / (section["Wpl.y"] * fy),
+        V_Ed * math.sqrt(3) / (section["Avz"] * fy),
+        (np.abs(sls["Deflection"]) / limits).max(),
+    )
+
+
+def test_size_beam():
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    beam_data['E'] = 200000.
+    design = beam_design.size_beam(beam_data)
+    assert design["Converged"] and design["Analyses"] == 1
+    index = beam_design.default_index()
+    chosen = index.select({"kg/m": ("ge", 0.)})
+    chosen = chosen[chosen["Section name"] == design["Section"]].iloc[0]
+    utilisations = check_section(beam_data, chosen)
+    assert max(utilisations) <= 1.
+    assert math.isclose(utilisations[0], design["Bending utilisation"], rel_tol=1e-9)
+    assert math.isclose(utilisations[2], design["Deflection utilisation"], rel_tol=1e-9)
+    # Every lighter section fails one of the checks
+    for _, section in index.select({"kg/m": ("lt", chosen["kg/m"])}).iterrows():
+        assert max(check_section(beam_data, section)) > 1.
+
+
+def test_size_beam_thick_flanges():
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    beam_data['E'] = 200000.
+    heavy = copy.deepcopy(beam_data)
+    for load in heavy['Loads']:
+        for key in ('Magnitude', 'Start Magnitude', 'End Magnitude'):
+            if key in load:
+                load[key] *= 100
+    design = beam_design.size_beam(heavy)
+    index = beam_design.default_index()
+    chosen = index.select({"kg/m": ("ge", 0.)})
+    chosen = chosen[chosen["Section name"] == design["Section"]].iloc[0]
+    # Over 40 mm the flanges yield at 335 MPa, not 355 MPa
+    assert chosen["tf"] > 40
+    assert math.isclose(design["Shear utilisation"], design["V Ed"] * math.sqrt(3) / (chosen["Avz"] * 335.))
+    assert design["Shear utilisation"] <= 1.
+    # The lightest section at a flat 355 MPa has thick flanges and fails
+    flat = index.lightest({
+        "Wpl.y": ("ge", design["M Ed"] / 355.), "Avz": ("ge", design["V Ed"] * math.sqrt(3) / 355.),
+    })
+    assert flat["tf"] > 40 and flat["kg/m"] < chosen["kg/m"]
+    assert design["V Ed"] * math.sqrt(3) / (flat["Avz"] * 335.) > 1.
+
+    with pytest.raises(ValueError):
+        beam_design.size_beam(beam_data, max_iterations=0)
+
+
+def test_size_beam_live_load_only():
+    # The self weight is a permanent action even when the beam has no "Dead" case
+    length, q = 6000., 20.
+    beam_data = {
+        'Name': "Live only", 'L': length, 'E': 200000., 'Iz': 1e8, 'Supports': {0.: 'P', length: 'R'},
+        'Loads': [{'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -q, 'End Magnitude': -q,
+                   'Start Location': 0., 'End Location': length, 'Case': 'Live'}],
+    }
+    design = beam_design.size_beam(beam_data)
+    weight = beam_design.self_weight(design["kg/m"])
+    assert math.isclose(design["M Ed"], (1.35 * weight + 1.5 * q) * length**2 / 8, rel_tol=1e-6)
+    assert math.isclose(design["V Ed"], (1.35 * weight + 1.5 * q) * length / 2, rel_tol=1e-6)
+    sls = beam_design.combination_factors(["Live", beam_design.SELF_WEIGHT], {"SLS": {"Live": 1.0}})
+    assert list(sls[:, 0]) == [1.0, 1.0]
+    assert design["Analyses"] == 1
+
+
+def test_deflection_limits():
+    beam_data = {'L': 10000., 'Supports': {2000.: 'P', 8000.: 'R'}}
+    limits = beam_design.deflection_limits(beam_data, np.array([0., 1999., 5000., 9000., 10000.]))
+    assert list(limits) == [16., 16., 24., 16., 16.]
+
+
+def test_size_beam_files():
+    designs = beam_design.size_beam_files("test_data", pattern="beam_*.txt")
+    sized = designs[designs["Error"] == ""]
+    assert list(sized["Name"]) == ["Balcony transfer"]
+    assert sized["Iterations"].iloc[0] >= 2
+    assert len(designs) == 5
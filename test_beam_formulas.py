@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+import eng_module.beam_formulas as beam_formulas
+import eng_module.beams as beams
+import eng_module.continuous_beam as continuous_beam
+
+
+def uniform_beam(supports, L=6000.0, loads=(-20.0, 8.0)):
+    return {
+        'Name': 'Standard',
+        'L': L, 'E': 200000.0, 'Iz': 2e8, 'Iy': 1.0, 'A': 1.0, 'J': 1.0, 'nu': 0.3, 'rho': 1.0,
+        'Supports': supports,
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': w, 'End Magnitude': w,
+             'Start Location': 0.0, 'End Location': L, 'Case': case}
+            for w, case in zip(loads, ("Dead", "Wind"))
+        ],
+    }
+
+
+def test_simply_supported():
+    results = beam_formulas.simply_supported(np.array([-10., -20.]), np.array([4000., 6000.]), 1e12)
+    assert np.allclose(results["R1"], [20000., 60000.])
+    assert np.allclose(results["Min Moment"], [-10 * 4000**2 / 8, -20 * 6000**2 / 8])
+    assert np.allclose(results["Max Shear"], [20000., 60000.])
+    assert np.allclose(results["Min Deflection"], [-5 * 10 * 4000**4 / 384e12, -5 * 20 * 6000**4 / 384e12])
+    uplift = beam_formulas.simply_supported(10., 4000., 1e12)
+    assert math.isclose(uplift["Max Moment"], 10 * 4000**2 / 8)
+    assert math.isclose(uplift["Max Deflection"], 5 * 10 * 4000**4 / 384e12)
+
+
+def test_cubic_roots():
+    roots = beam_formulas.cubic_roots(
+        np.array([1., 2., 1.]), np.array([-6., 0., 0.]), np.array([11., 0., 1.]), np.array([-6., -16., 0.])
+    )
+    assert np.allclose(np.sort(roots[0]), [1., 2., 3.])
+    assert math.isclose(roots[1, 0], 2.) and np.isnan(roots[1, 1:]).all()
+    assert math.isclose(roots[2, 0], 0., abs_tol=1e-12)
+
+
+def test_overhang_reactions():
+    results = beam_formulas.overhang(np.full(3, -50.), 4500., np.array([0., 2350., 5000.]), 1e12)
+    assert np.allclose(results["R1"] + results["R2"], 50. * (4500. + np.array([0., 2350., 5000.])))
+    assert math.isclose(results["R2"][1], 260680.55555555556)
+    assert results["R1"][2] < 0 # uplift at the end support
+
+
+def test_standard_beam_results_match_continuous_beam():
+    L, s = 6000.0, 4200.0
+    layouts = [
+        {0.0: 'P', L: 'R'},
+        {0.0: 'F'},
+        {L: 'F'},
+        {0.0: 'F', L: 'R'},
+        {0.0: 'P', L: 'F'},
+        {0.0: 'P', s: 'R'},
+        {L - s: 'P', L: 'R'},
+        {0.0: 'P', 1500.0: 'R'},
+    ]
+    for supports in layouts:
+        beam_data = uniform_beam(supports)
+        rows = beam_formulas.standard_beam_results(beam_data)
+        model = continuous_beam.ContinuousBeam(beam_data)
+        solution = model.solve()
+        # Either side of each support catches the jumps in the shear
+        x = np.concatenate([np.linspace(0, L, 6001), np.array(list(supports)) + 1e-6, np.array(list(supports)) - 1e-6])
+        diagrams = model.evaluate(solution, np.clip(x, 0, L))
+        for idx, row in enumerate(rows):
+            for name in ("Moment", "Shear", "Deflection"):
+                values = diagrams[name][:, idx]
+                scale = np.abs(values).max()
+                assert math.isclose(row[f"Max {name}"], values.max(), abs_tol=1e-5 * scale), (supports, name)
+                assert math.isclose(row[f"Min {name}"], values.min(), abs_tol=1e-5 * scale), (supports, name)
+            for x_coord, reaction in zip(model.supports, solution["Reactions"][:, idx]):
+                assert math.isclose(row["Reactions"][x_coord], reaction, rel_tol=1e-9)
+
+
+def test_standard_beam_results_match_pynite():
+    beam_data = uniform_beam({0.0: 'P', 4500.0: 'R'}, L=6850.0)
+    rows = beam_formulas.standard_beam_results(beam_data)
+    beam_model = beams.build_beam(beam_data)
+    beam_model.analyze()
+    for row, fe_row in zip(rows, beams.beam_results(beam_model, beam_data)):
+        assert row["Combo"] == fe_row["Combo"]
+        for key in ("Max Moment", "Min Moment", "Max Shear", "Min Shear", "Max Deflection", "Min Deflection"):
+            assert math.isclose(row[key], fe_row[key], rel_tol=1e-3, abs_tol=1e-6), key
+        for x_coord, reaction in fe_row["Reactions"].items():
+            assert math.isclose(row["Reactions"][x_coord], reaction, rel_tol=1e-6)
+
+
+def test_standard_case():
+    assert beam_formulas.standard_case(uniform_beam({0.0: 'P', 3000.0: 'R', 6000.0: 'R'})) is None
+    partial_load = uniform_beam({0.0: 'P', 6000.0: 'R'})
+    partial_load['Loads'][0]['End Location'] = 3000.0
+    assert beam_formulas.standard_case(partial_load) is None
+    formula, lengths, mirrored, load_cases, w = beam_formulas.standard_case(uniform_beam({1800.0: 'P', 6000.0: 'R'}))
+    assert formula is beam_formulas.overhang
+    assert lengths == (4200.0, 1800.0) and mirrored
+    assert load_cases == ["Dead", "Wind"] and list(w) == [-20.0, 8.0]
@@ -1,6 +1,8 @@
 import eng_module.beams as beams
 import math
 import csv
+import numpy as np
+import os
 
 def test_get_spans():
     beam1_span=4000,2500
@@ -219,4 +221,115 @@ def test_parse_beam_attributes():
  'A': 43900,
  'J': 11900000.0,
  'nu': 0.3,
- 'rho': 1.0}
\ No newline at end of file
+ 'rho': 1.0}
+def test_iter_beam_records():
+    beam_dict = beams.get_structured_beam_data(beams.read_beam_file("test_data/beam_1-wk4.txt"))
+    assert list(beams.iter_beam_records("test_data/beam_1-wk4.txt")) == [beam_dict]
+
+def test_parse_beam_lines():
+    beam_lines = [
+        "Balcony transfer",
+        "4800,24500,1200000000,1,1",
+        "1000:P,3800:R",
+        "POINT:Fy,-10000,4800,case:Live",
+        "DIST:Fy,30,30,0,4800,case:Dead",
+        "Roof beam",
+        "6000,200000,80000000",
+        "0:P,6000:R",
+        "DIST:Fy,-5,-5,0,6000,case:Dead",
+        "",
+        "Short beam",
+        "2000,200000,1000000",
+        "0:F",
+    ]
+    records = list(beams.parse_beam_lines(beam_lines))
+    assert [record['Name'] for record in records] == ["Balcony transfer", "Roof beam", "Short beam"]
+    assert records[0] == beams.get_structured_beam_data(beams.read_beam_file("test_data/beam_1-wk4.txt"))
+    assert records[1]['Supports'] == {0.0: 'P', 6000.0: 'R'}
+    assert records[1]['Loads'][0]['End Location'] == 6000.0
+    assert records[2]['Loads'] == []
+
+def test_parse_beam_lines_errors():
+    beam_lines = ["Beam", "4800,24500,1200000000", "1000:P,3800:Q"]
+    try:
+        list(beams.parse_beam_lines(beam_lines, "bad_beam.txt"))
+    except beams.BeamFileError as error:
+        assert error.line_number == 3
+        assert str(error).startswith("bad_beam.txt, line 3")
+    else:
+        assert False, "BeamFileError not raised"
+
+def test_analyze_beam_files():
+    rows = list(beams.analyze_beam_files("test_data", pattern="beam_*.txt", workers=1))
+    results = {row['Combo']: row for row in rows if not row['Error']}
+    assert set(results) == {"Live", "Dead"}
+    assert math.isclose(results["Live"]["Min Deflection"], -0.4308390022675728, rel_tol=1e-6)
+    assert math.isclose(results["Live"]["Reactions"][3800.0], 13571.428571428572, rel_tol=1e-6)
+    # The older format files cannot be parsed but do not stop the batch
+    failed = [row for row in rows if row['Error']]
+    assert len(failed) == 4
+    assert all(row['Error'].startswith("BeamFileError") for row in failed)
+
+    parallel = list(beams.analyze_beam_files("test_data/beam_*.txt", workers=2))
+    assert parallel == rows
+
+def test_beam_hash():
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    renamed = dict(beam_data, Name="Another name", Supports={3800: 'R', 1000: 'P'})
+    assert beams.beam_hash(beam_data) == beams.beam_hash(renamed)
+    edited = dict(beam_data, L=4900.0)
+    assert beams.beam_hash(beam_data) != beams.beam_hash(edited)
+    assert beams.beam_hash(beam_data) != beams.beam_hash(beam_data, closed_form=False)
+
+def test_beam_result_cache(tmp_path):
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    cache = beams.BeamResultCache(maxsize=1, directory=str(tmp_path), max_bytes=10**6)
+    rows = cache.get_results(beam_data)
+    assert rows == beams.analyze_beam(dict(beam_data))
+    again = cache.get_results(dict(beam_data, Name="Copy"))
+    assert [row["Name"] for row in again] == ["Copy", "Copy"]
+    assert again[0]["Reactions"] == rows[0]["Reactions"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    other = dict(beam_data, L=4900.0)
+    cache.get_results(other)
+    assert len(cache) == 1 # beam_data evicted from memory
+    assert cache.get_results(beam_data) == rows
+    assert cache.stats()["disk_hits"] == 1
+    assert math.isclose(cache.stats()["hit_rate"], 0.5)
+
+    # The files on disk are kept under max_bytes, the oldest going first
+    small = beams.BeamResultCache(directory=str(tmp_path), max_bytes=1)
+    small.get_results(dict(beam_data, L=5000.0))
+    assert small.stats()["evictions"] == 2
+    assert len(os.listdir(tmp_path)) == 1
+
+def test_analyze_beam_files_cache(tmp_path):
+    first = list(beams.analyze_beam_files("test_data/beam_1-wk4.txt", workers=1, cache_dir=str(tmp_path)))
+    second = list(beams.analyze_beam_files("test_data/beam_1-wk4.txt", workers=1, cache_dir=str(tmp_path)))
+    assert not any(row["Cached"] for row in first)
+    assert all(row["Cached"] for row in second)
+    assert [{**row, "Cached": None} for row in first] == [{**row, "Cached": None} for row in second]
+
+def test_beam_diagrams():
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    beam_model = beams.build_beam(beam_data)
+    beam_model.analyze()
+    member = beam_model.Members[beam_data['Name']]
+    diagrams = beams.beam_diagrams(beam_model, beam_data, n_points=1001)
+    assert set(diagrams) == {"Live", "Dead"}
+    for combo_name, result in diagrams.items():
+        x = result["x"]
+        # Supports and load ends are sampled on both sides
+        assert (x == 1000.0).sum() == 2 and (x == 3800.0).sum() == 2
+        smooth = np.flatnonzero(~np.isin(x, [0.0, 1000.0, 3800.0, 4800.0]))[::37]
+        for quantity, method, direction in (
+            ("Shear", member.shear, "Fy"), ("Moment", member.moment, "Mz"), ("Deflection", member.deflection, "dy"),
+        ):
+            expected = [method(direction, x_coord, combo_name) for x_coord in x[smooth]]
+            assert np.allclose(result[quantity][smooth], expected, rtol=1e-9, atol=1e-6)
+    live = diagrams["Live"]
+    assert math.isclose(live["Min Deflection"], -0.4308390022675728, rel_tol=1e-9)
+    assert live["Min Deflection Location"] == 4800.0
+    assert math.isclose(live["Max Shear"], 10000.0) and live["Max Shear Location"] == 3800.0
+    assert math.isclose(diagrams["Dead"]["Min Moment"], member.min_moment("Mz", "Dead"), rel_tol=1e-6)
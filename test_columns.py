@@ -1 +1,67 @@
+import math
+
+import numpy as np
+
+import eng_module.beams as beams
 import eng_module.columns as columns
+import eng_module.sections_db as sections_db
+
+SECTIONS = sections_db.load_eu_pf_sections()
+
+
+def test_reduction_factor():
+    # EN 1993-1-1 Table 6.1 / Figure 6.4 values
+    chi = columns.reduction_factor(np.array([0.1, 1.0, 1.0, 2.0]), np.array([0.34, 0.34, 0.21, 0.49]))
+    assert chi[0] == 1.
+    assert math.isclose(chi[1], 0.5970, rel_tol=1e-3)
+    assert math.isclose(chi[2], 0.6656, rel_tol=1e-3)
+    assert math.isclose(chi[3], 0.1962, rel_tol=1e-3)
+
+
+def test_buckling_curves():
+    catalogue = SECTIONS.set_index("Section name")
+    curve_y, curve_z = columns.buckling_curves(catalogue.loc[["IPE 300", "HE 300 B"]])
+    assert list(curve_y) == ["a", "b"] and list(curve_z) == ["b", "c"]
+    curve_y, curve_z = columns.buckling_curves(catalogue.loc[["IPE 300"]], "S460")
+    assert list(curve_y) == ["a0"] and list(curve_z) == ["a0"]
+
+
+def test_column_catalogue_resistances():
+    catalogue = columns.ColumnCatalogue(SECTIONS)
+    assert (np.diff(catalogue.mass) >= 0).all()
+    lengths = np.array([2500., 6000.])
+    Ncr_y, Ncr_z = catalogue.euler_loads(lengths)
+    assert Ncr_z.shape == (2, len(catalogue))
+    assert math.isclose(Ncr_z[1, 10], beams.euler_buckling_load(6000., 210000., catalogue.Iz[10], 1.))
+
+    # A scalar check of one section
+    idx = int(np.flatnonzero(catalogue.names == "HE 200 B")[0])
+    section = catalogue.sections.iloc[idx]
+    A, fy = section["A"], 355.
+    expected = []
+    for length in lengths:
+        chi = min(
+            columns.reduction_factor(math.sqrt(A * fy / beams.euler_buckling_load(length, 210000., I, 1.)), alpha)
+            for I, alpha in ((section["Iy"], 0.34), (section["Iz"], 0.49))
+        )
+        expected.append(chi * A * fy)
+    assert np.allclose(catalogue.resistances(lengths)[:, idx], expected)
+    # Class 4 sections never pass
+    slender = catalogue.sections["Class axial S355"].to_numpy() >= 4
+    assert np.isinf(catalogue.utilisations(lengths, [1e5, 1e5])[:, slender]).all()
+
+
+def test_column_catalogue_lightest():
+    catalogue = columns.ColumnCatalogue(SECTIONS)
+    rng = np.random.default_rng(1)
+    lengths = rng.uniform(2000., 9000., 50)
+    loads = rng.uniform(1e5, 8e6, 50)
+    lightest = catalogue.lightest(lengths, loads, chunksize=16)
+    utilisations = catalogue.utilisations(lengths, loads)
+    for case, row in lightest.iterrows():
+        passing = np.flatnonzero(utilisations[case] <= 1.)
+        assert row["Position"] == passing[0]
+        assert row["Section name"] == catalogue.names[passing[0]]
+        assert row["Utilisation"] <= 1.
+    impossible = catalogue.lightest([10000.], [1e9])
+    assert impossible["Position"][0] == -1 and impossible["Section name"][0] is None
@@ -0,0 +1,25 @@
+import math
+
+import eng_module.concrete_transport_calculator as ctc
+
+
+def test_generate_timeline():
+    project = ctc.ConcreteMixerProject("Putzmeister P 10 HR", distance=5.08, speed=15, batch_plant_rate=200,
+                                       theoretical_rate=200, maneuver_allowance=20, pumping_rate=20,
+                                       fleet_allowance=25)
+    timeline, timestamps, queue_sizes = project.generate_timeline()
+    loading, transit, pumping = 10 / 200 * 60 * 1.2, 5080 / (15 * 60), 10 / 20 * 60
+    one_way = (loading + transit + pumping) * 1.25
+    assert math.isclose(timestamps[1], loading)
+    assert math.isclose(timestamps[5], loading + transit + pumping)
+    # The return ends after the calculator's adjusted return time
+    assert math.isclose(timestamps[7], one_way + transit * 1.25)
+    assert math.isclose(timestamps[7], project.calculate_adjusted_return_time(one_way, transit, 25))
+    # One batching plant: the mixer waits one batching slot to load again
+    assert math.isclose(timeline[-1][0], timestamps[7] + loading)
+    assert queue_sizes == [0, 0, 1, 1, 1, 1, 1, 1, 1, 1]
+    assert project.mixers_in_queue == 0
+
+    two_plants = ctc.ConcreteMixerProject("Putzmeister P 10 HR", theoretical_rate=400)
+    assert two_plants.num_batching_plants == 2
+    assert len(two_plants.generate_timeline()[1]) == 8
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+
+import eng_module.beams as beams
+import eng_module.continuous_beam as continuous_beam
+
+
+def pynite_diagrams(beam_data, load_case, x):
+    beam_model = beams.build_beam(dict(beam_data))
+    beam_model.analyze()
+    member = beam_model.Members[beam_data['Name']]
+    shear = [member.shear("Fy", x_coord, load_case) for x_coord in x]
+    moment = [member.moment("Mz", x_coord, load_case) for x_coord in x]
+    deflection = [member.deflection("dy", x_coord, load_case) for x_coord in x]
+    return np.array(shear), np.array(moment), np.array(deflection)
+
+
+def test_continuous_beam_matches_pynite_test_data():
+    beam_data = next(beams.iter_beam_records("test_data/beam_1-wk4.txt"))
+    results = continuous_beam.ContinuousBeam(beam_data).analyze()
+    assert math.isclose(results["Live"]["Deflection"].min(), -0.4308390022675728, rel_tol=1e-9)
+    assert math.isclose(results["Live"]["Reactions"][3800.0], 13571.428571428572, rel_tol=1e-9)
+    for load_case, result in results.items():
+        shear, moment, deflection = pynite_diagrams(beam_data, load_case, result["x"])
+        assert np.allclose(result["Shear"], shear, rtol=1e-6, atol=1e-6)
+        assert np.allclose(result["Moment"], moment, rtol=1e-6, atol=1e-3)
+        assert np.allclose(result["Deflection"], deflection, rtol=1e-6, atol=1e-12)
+
+
+def test_continuous_beam_matches_pynite_multi_span():
+    beam_data = {
+        'Name': 'Three span',
+        'L': 15000.0, 'E': 200000.0, 'Iz': 3e8, 'Iy': 1.0, 'A': 1.0, 'J': 1.0, 'nu': 0.3, 'rho': 1.0,
+        'Supports': {0.0: 'F', 5000.0: 'R', 9000.0: 'P', 13000.0: 'R'},
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -10.0, 'End Magnitude': -10.0,
+             'Start Location': 1000.0, 'End Location': 12000.0, 'Case': 'Dead'},
+            {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -50000.0, 'Location': 14200.0, 'Case': 'Live'},
+            {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': 20000.0, 'Location': 2500.0, 'Case': 'Live'},
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5.0, 'End Magnitude': -5.0,
+             'Start Location': 0.0, 'End Location': 15000.0, 'Case': 'Live'},
+        ],
+    }
+    results = continuous_beam.ContinuousBeam(beam_data).analyze(n_points=61)
+    for load_case, result in results.items():
+        shear, moment, deflection = pynite_diagrams(beam_data, load_case, result["x"])
+        assert np.allclose(result["Shear"], shear, rtol=1e-6, atol=1e-3)
+        assert np.allclose(result["Moment"], moment, rtol=1e-6, atol=1.)
+        assert np.allclose(result["Deflection"], deflection, rtol=1e-6, atol=1e-9)
+    assert math.isclose(sum(results["Live"]["Reactions"].values()), 50000 - 20000 + 5 * 15000)
+
+
+def test_continuous_beam_varying_load():
+    beam_data = {
+        'Name': 'Varying load',
+        'L': 15000.0, 'E': 200000.0, 'Iz': 3e8, 'Iy': 1.0, 'A': 1.0, 'J': 1.0, 'nu': 0.3, 'rho': 1.0,
+        'Supports': {0.0: 'P', 15000.0: 'R'},
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -10.0, 'End Magnitude': -25.0,
+             'Start Location': 1000.0, 'End Location': 12000.0, 'Case': 'Dead'},
+        ],
+    }
+    result = continuous_beam.ContinuousBeam(beam_data).analyze(n_points=61)["Dead"]
+    shear, moment, deflection = pynite_diagrams(beam_data, "Dead", result["x"])
+    assert np.allclose(result["Shear"], shear, rtol=1e-6, atol=1e-3)
+    assert np.allclose(result["Moment"], moment, rtol=1e-6, atol=1.)
+    assert np.allclose(result["Deflection"], deflection, rtol=1e-6, atol=1e-9)
+
+    # Statics still hold when the varying load spans several supports
+    beam_data['Supports'] = {0.0: 'P', 5000.0: 'R', 9000.0: 'P', 13000.0: 'R'}
+    result = continuous_beam.ContinuousBeam(beam_data).analyze()["Dead"]
+    assert math.isclose(sum(result["Reactions"].values()), (10 + 25) / 2 * 11000)
+    assert abs(result["Moment"][-1]) < 1e-6
+
+
+def test_continuous_beam_unstable():
+    beam_data = {
+        'Name': 'Mechanism', 'L': 4000.0, 'E': 200000.0, 'Iz': 1e8,
+        'Supports': {2000.0: 'P'},
+        'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -1000.0, 'Location': 0.0, 'Case': 'Live'}],
+    }
+    try:
+        continuous_beam.ContinuousBeam(beam_data)
+    except ValueError as error:
+        assert "unstable" in str(error)
+    else:
+        assert False, "ValueError not raised"
+
+
+def test_continuous_beam_combinations():
+    beam_data = {
+        'Name': 'Two span',
+        'L': 10000.0, 'E': 200000.0, 'Iz': 2e8,
+        'Supports': {0.0: 'P', 6000.0: 'R', 10000.0: 'R'},
+        'Loads': [
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -8.0, 'End Magnitude': -8.0,
+             'Start Location': 0.0, 'End Location': 10000.0, 'Case': 'Dead'},
+            {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -30000.0, 'Location': 3000.0, 'Case': 'Live'},
+            {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': 4.0, 'End Magnitude': 2.0,
+             'Start Location': 6000.0, 'End Location': 10000.0, 'Case': 'Wind'},
+        ],
+    }
+    model = continuous_beam.ContinuousBeam(beam_data)
+    results = model.analyze_combinations(n_points=51)
+    assert list(results) == ["LC1", "LC2", "LC3", "LC4", "LC5"]
+
+    # Each combination matches the beam solved with its factored loads
+    factors = {"Dead": 1.35, "Live": 1.05, "Wind": 1.5} # LC3
+    factored = dict(beam_data, Loads=[
+        {**load, 'Case': 'LC3', **{
+            key: load[key] * factors[load['Case']]
+            for key in ('Magnitude', 'Start Magnitude', 'End Magnitude') if key in load
+        }}
+        for load in beam_data['Loads']
+    ])
+    expected = continuous_beam.ContinuousBeam(factored).analyze(n_points=51)["LC3"]
+    for quantity in ("Shear", "Moment", "Deflection"):
+        assert np.allclose(results["LC3"][quantity], expected[quantity], rtol=1e-9, atol=1e-6)
+    for x_coord, reaction in expected["Reactions"].items():
+        assert math.isclose(results["LC3"]["Reactions"][x_coord], reaction, rel_tol=1e-9)
+
+    enveloped = continuous_beam.envelope(results)
+    moments = np.stack([result["Moment"] for result in results.values()])
+    assert np.array_equal(enveloped["Max Moment"], moments.max(axis=0))
+    assert np.array_equal(enveloped["Min Moment"], moments.min(axis=0))
+    idx = int(np.argmin(enveloped["Min Deflection"]))
+    governing = enveloped["Min Deflection Combo"][idx]
+    assert results[governing]["Deflection"][idx] == enveloped["Min Deflection"][idx]
+    assert enveloped["Max Reactions"][6000.0] == max(result["Reactions"][6000.0] for result in results.values())
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+import eng_module.load_factors as load_factors
+
+
+def test_max_min_factored_load():
+    assert math.isclose(load_factors.max_factored_load(load_factors.load, load_factors.EC_0_COMBS), 378.)
+    assert math.isclose(load_factors.min_factored_load(load_factors.load, load_factors.EC_0_COMBS), 130.)
+
+
+def test_combination_matrix():
+    factors = load_factors.combination_matrix(["Dead", "Wind"], load_factors.EC_0_COMBS)
+    assert factors.shape == (2, 5)
+    assert list(factors[0]) == [1.35, 1.35, 1.35, 1.35, 1.0]
+    assert list(factors[1]) == [0., 0., 1.5, 0.9, 1.5]
+
+
+def test_factored_envelope():
+    rng = np.random.default_rng(1)
+    loads = rng.uniform(-100., 200., (50, 3))
+    enveloped = load_factors.factored_envelope(loads)
+    for member_loads, max_load, min_load, max_combo in zip(
+        loads, enveloped["Max"], enveloped["Min"], enveloped["Max Combo"]
+    ):
+        member = {"D_load": member_loads[0], "L_load": member_loads[1], "W_load": member_loads[2]}
+        assert math.isclose(max_load, load_factors.max_factored_load(member, load_factors.EC_0_COMBS))
+        assert math.isclose(min_load, load_factors.min_factored_load(member, load_factors.EC_0_COMBS))
+        assert math.isclose(
+            max_load, load_factors.factor_load(**member, **load_factors.EC_0_COMBS[max_combo])
+        )
+
+
+def test_factored_loads_any_load_types():
+    combos = {"ULS": {"Self weight": 1.35, "Crane": 1.5}, "SLS": {"Self weight": 1.0, "Crane": 1.0}}
+    factored = load_factors.factored_loads([[10., 4.], [2., -1.]], combos)
+    assert np.allclose(factored, [[19.5, 14.], [1.2, 1.]])
+    enveloped = load_factors.factored_envelope([[4., 10.]], combos, load_types=["Crane", "Self weight"])
+    assert list(enveloped["Max Combo"]) == ["ULS"]
+    try:
+        load_factors.factored_loads([[1., 2., 3.]], combos)
+    except ValueError:
+        pass
+    else:
+        assert False, "ValueError not raised"
+
+
+ACTIONS = [
+    {"Name": "Dead", "Type": "Permanent"},
+    {"Name": "Live", "Type": "Variable", **load_factors.PSI_FACTORS["Category A"]},
+    {"Name": "Wind", "Type": "Variable", **load_factors.PSI_FACTORS["Wind"]},
+    {"Name": "Snow", "Type": "Variable", **load_factors.PSI_FACTORS["Snow"]},
+]
+
+
+def test_eurocode_combinations():
+    load_combos = load_factors.eurocode_combinations(ACTIONS[:2])
+    assert list(load_combos.values()) == [
+        {"Dead": 1.35}, {"Dead": 1.0}, {"Dead": 1.35, "Live": 1.5}, {"Dead": 1.0, "Live": 1.5},
+    ]
+    load_combos = load_factors.eurocode_combinations(ACTIONS[:3], ("6.10a", "6.10b"))
+    assert load_combos["6.10a: 1.35 Dead + 1.05 Live + 0.9 Wind"] == {"Dead": 1.35, "Live": 1.05, "Wind": 0.9}
+    assert math.isclose(load_combos["6.10b: 1.1475 Dead + 1.5 Wind"]["Dead"], 0.85 * 1.35)
+    quasi_permanent = load_factors.eurocode_combinations(ACTIONS, ("6.16b",))
+    assert {"Dead": 1.0, "Live": 0.3} in quasi_permanent.values()
+    assert all("Wind" not in load_combo for load_combo in quasi_permanent.values())
+
+
+def test_prune_combinations():
+    load_combos = load_factors.eurocode_combinations(ACTIONS)
+    signs = {"Dead": 1, "Live": 1, "Wind": -1, "Snow": 1}
+    pruned = load_factors.eurocode_combinations(ACTIONS, signs=signs)
+    assert len(pruned) == 2 < len(load_combos)
+    # The pruned combinations give the same envelope for loads with those signs
+    rng = np.random.default_rng(2)
+    load_types = ["Dead", "Live", "Wind", "Snow"]
+    loads = rng.uniform(0., 100., (200, 4)) * np.array([signs[name] for name in load_types])
+    everything = load_factors.factored_envelope(loads, load_combos, load_types)
+    assert np.allclose(load_factors.factored_envelope(loads, pruned, load_types)["Max"], everything["Max"])
+    negated = load_factors.prune_combinations(load_combos, {name: -sign for name, sign in signs.items()})
+    assert np.allclose(load_factors.factored_envelope(loads, negated, load_types)["Min"], everything["Min"])
+    # Nothing is dominated when no signs are known
+    assert load_factors.prune_combinations(load_combos, {}) == load_combos
@@ -1,12 +1,18 @@
+import math
+import os
+import threading
+
+import numpy as np
 import pandas as pd
 
-from eng_module.sections_db import df, section_filter, sort_by_weight
+import eng_module.sections_db as sections_db
+from eng_module.sections_db import df, sections_filter, sort_by_weight
 
 
 def test_load_eu_pf_sections():
     eu_pf = df
-    assert si_df.iloc[0, 0] == "IPE 750 x 220"
-    assert us_df.iloc[1, 0] == "IPE 750 x 196"
+    assert eu_pf.iloc[0, 0] == "IPE 750 x 220"
+    assert eu_pf.iloc[1, 0] == "IPE 750 x 196"
 
 
 def test_values_greater_than():
@@ -19,11 +25,11 @@ def test_values_greater_than():
         ],
         columns=["Type", "Section", "Ix", "Sy"],
     )
-    selection = section_filter(test_df, "ge", Ix=400)
+    selection = sections_filter(test_df, "ge", Ix=400)
     assert selection.iloc[0, 1] == "C"
     assert selection.iloc[1, 1] == "D"
 
-    selection = section_filter(test_df, "le", Sy=300)
+    selection = sections_filter(test_df, "le", Sy=300)
     assert selection.iloc[0, 1] == "A"
     assert selection.iloc[1, 1] == "B"
 
@@ -36,12 +42,220 @@ def test_sort_by_weight():
             ["Y", "C", 400, 600],
             ["Y", "D", 500, 700],
         ],
-        columns=["Type", "Section", "Ix", "W"],
+        columns=["Type", "Section", "Ix", "kg/m"],
     )
     selection = sort_by_weight(test_df)
     assert selection.iloc[0, 1] == "B"
     assert selection.iloc[1, 1] == "A"
 
-    selection = sort_by_weight(test_df, ascending=False)
+    selection = sort_by_weight(test_df).iloc[::-1]
     assert selection.iloc[0, 1] == "D"
-    assert selection.iloc[1, 1] == "C"
\ No newline at end of file
+    assert selection.iloc[1, 1] == "C"
+
+
+def test_load_catalogue_cache(tmp_path):
+    source = tmp_path / "catalogue.csv"
+    source.write_text(open(sections_db.BUNDLED_CATALOGUE).read())
+    parsed = sections_db.load_catalogue(str(source), use_cache=False)
+    cold = sections_db.load_catalogue(str(source))
+    path = sections_db.cache_path(str(source), sections_db.file_hash(str(source)))
+    assert os.path.exists(path)
+    warm = sections_db.read_catalogue_cache(path)
+    pd.testing.assert_frame_equal(cold, parsed)
+    pd.testing.assert_frame_equal(warm, parsed)
+    assert parsed["Section name"].iloc[0] == "IPE 750 x 220"
+    assert round(parsed["kg/m"].iloc[0], 1) == 220.3
+
+
+
+def test_load_eu_pf_sections_units():
+    eu_pf = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+    ipe = eu_pf.iloc[0]
+    assert ipe["Section name"] == "IPE 750 x 220"
+    assert ipe.A == 280.7e2
+    assert ipe.Iy == 279390e4
+    assert ipe["Wpl.y"] == 8231e3
+    assert ipe.h == 779.0
+    assert eu_pf["Section name"].dtype == "category"
+    assert (eu_pf.drop(columns="Section name").dtypes == "float64").all()
+
+
+def test_section_index():
+    test_df = pd.DataFrame(
+        data=[
+            ["X", "A", 200, 300],
+            ["X", "B", 250, 250],
+            ["Y", "C", 400, 600],
+            ["Y", "D", 500, 700],
+        ],
+        columns=["Type", "Section", "Ix", "W"],
+    )
+    index = sections_db.SectionIndex(test_df, indexed=("Ix",), weight="W")
+    selection = index.select({"Ix": ("ge", 250)})
+    assert list(selection.Section) == ["B", "C", "D"]
+
+    selection = index.select({"Ix": ("gt", 250), "W": ("le", 650)})
+    assert list(selection.Section) == ["C"]
+
+    assert index.lightest({"Ix": ("ge", 210), "W": ("lt", 700)}).Section == "B"
+    assert index.lightest({"Ix": ("ge", 600)}) is None
+
+    positions = index.lightest_batch({"Ix": ("ge", [100, 300, 450, 900])})
+    assert list(positions) == [1, 2, 3, -1]
+
+
+def test_section_index_matches_sections_filter():
+    eu_pf = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+    index = sections_db.SectionIndex(eu_pf)
+    expected = sections_filter(eu_pf, "ge", **{"Iy": 5e8, "Wpl.y": 2e6})
+    expected = sections_filter(expected, "le", **{"kg/m": 150})
+    selection = index.select({"Iy": ("ge", 5e8), "Wpl.y": ("ge", 2e6), "kg/m": ("le", 150)})
+    assert sorted(selection.index) == sorted(expected.index)
+    assert selection["kg/m"].is_monotonic_increasing
+
+
+def test_resistance_table(tmp_path):
+    source = tmp_path / "catalogue.csv"
+    lines = open(sections_db.BUNDLED_CATALOGUE).read().splitlines(keepends=True)
+    source.write_text("".join(lines))
+    table = sections_db.ResistanceTable("S355", str(source))
+    assert table.rebuilt == len(table)
+    # IPE 750 x 220: class 1 in bending, class 4 in compression, tf <= 40 mm
+    assert math.isclose(table.get("IPE 750 x 220", "Mc,y,Rd"), 8231e3 * 355)
+    assert math.isclose(table.get("IPE 750 x 220", "Vpl,z,Rd"), 139e2 * 355 / math.sqrt(3))
+    assert math.isnan(table.get("IPE 750 x 220", "Nc,Rd"))
+    assert math.isclose(sections_db.ResistanceTable("S460", str(source)).get("IPE 750 x 220", "Npl,Rd"), 280.7e2 * 460)
+    assert list(sections_db.yield_strength([40., 40.1], "S275")) == [275., 255.]
+
+    assert sections_db.ResistanceTable("S355", str(source)).rebuilt == 0
+    # Only the edited row is recalculated
+    lines[1] = lines[1].replace(",8231.0,", ",8000.0,")
+    source.write_text("".join(lines))
+    refreshed = sections_db.ResistanceTable("S355", str(source))
+    assert refreshed.rebuilt == 1
+    assert math.isclose(refreshed.get("IPE 750 x 220", "Mc,y,Rd"), 8000e3 * 355)
+    assert list(refreshed.lookup(["IPE 750 x 196", "IPE 750 x 220"], "Mc,y,Rd")) == [
+        table.get("IPE 750 x 196", "Mc,y,Rd"), refreshed.get("IPE 750 x 220", "Mc,y,Rd")
+    ]
+
+
+def test_section_cache(tmp_path):
+    small = pd.Series({"h": 100., "b": 50., "tf": 5., "tw": 4., "r": 7.})
+    other = pd.Series({"h": 120., "b": 60., "tf": 6., "tw": 4., "r": 8.})
+    cache = sections_db.SectionCache(maxsize=1, directory=str(tmp_path))
+    section = sections_db.create_section(small, mesh_size=50, cache=cache)
+    assert section.section_props.omega is not None
+    assert sections_db.create_section(small, mesh_size=50, cache=cache) is section
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    sections_db.create_section(other, mesh_size=50, cache=cache)
+    assert len(cache) == 1 # 'small' evicted
+    from_disk = sections_db.create_section(small, mesh_size=50, cache=cache)
+    assert cache.stats()["disk_hits"] == 1
+    assert math.isclose(
+        sections_db.max_vonmises_stress(from_disk, N=1e4),
+        sections_db.max_vonmises_stress(section, N=1e4),
+    )
+
+
+def test_calculate_section_stresses():
+    test_df = pd.DataFrame(
+        data=[
+            ["A", 100., 50., 5., 4., 7.],
+            ["B", 120., 60., 6., 4., 8.],
+            ["C", 140., 70., 7., 5., 9.],
+        ],
+        columns=["Section name", "h", "b", "tf", "tw", "r"],
+    )
+    calls = []
+    serial = sections_db.calculate_section_stresses(
+        test_df, 350, N=1e4, Mx=1e6, mesh_size=50, progress=lambda done, total: calls.append((done, total))
+    )
+    assert "sig_vm Max" not in test_df.columns
+    assert calls == [(1, 3), (2, 3), (3, 3)]
+    assert (serial["fy"] == 350).all()
+    assert (serial["DCR stress"] == 350 / serial["sig_vm Max"]).all()
+    assert serial["sig_vm Max"].is_monotonic_decreasing
+    assert sections_db.section_key(test_df.iloc[0], 50) not in sections_db.section_cache.sections
+
+    parallel = sections_db.calculate_section_stresses(test_df, 350, N=1e4, Mx=1e6, mesh_size=50, workers=2, chunksize=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+    cancel = threading.Event()
+    cancel.set()
+    cancelled = sections_db.calculate_section_stresses(test_df, 350, N=1e4, mesh_size=50, cancel=cancel)
+    assert cancelled["sig_vm Max"].isna().all()
+
+
+def test_max_vonmises_stresses():
+    small = pd.Series({"h": 100., "b": 50., "tf": 5., "tw": 4., "r": 7.})
+    section = sections_db.create_section(small, mesh_size=50, cache=None)
+    actions = [
+        [1e4, 0, 0, 0, 0, 0],
+        [0, 1e6, 0, 0, 0, 0],
+        [-2e4, 3e5, -1e5, 2e3, -5e3, 1e5],
+    ]
+    stresses = sections_db.max_vonmises_stresses(section, actions)
+    assert stresses.shape == (3,)
+    for case, stress in zip(actions, stresses):
+        assert math.isclose(stress, sections_db.max_vonmises_stress(section, *case), rel_tol=1e-9)
+
+
+def test_screen_section_stresses():
+    eu_pf = sections_db.load_eu_pf_sections(sections_db.BUNDLED_CATALOGUE)
+    ipe = eu_pf.iloc[[0]]
+    estimate = sections_db.estimate_vonmises_stress(ipe, N=1e6, Mx=2e8)
+    assert math.isclose(estimate[0], 1e6 / 28070 + 2e8 / 7173e3)
+
+    # Far from the boundary: no finite element solve
+    screened = sections_db.screen_section_stresses(eu_pf.iloc[:20], 355, N=1e4)
+    assert not screened["FE check"].any()
+    assert (screened["sig_vm Max"] == screened["sig_vm Est"]).all()
+    assert (screened["DCR stress"] > 1).all()
+
+    # The band covers the error of the estimate against the finite element stress
+    actions = np.array([
+        [1e6, 0, 0, 0, 0, 0], [0, 1e8, 0, 0, 0, 0], [0, 0, 0, 0, 5e5, 0], [0, 0, 0, 2e5, 0, 0],
+        [0, 0, 0, 0, 0, 1e6], [1e6, 1e8, 2e7, 1e5, 3e5, 5e5],
+    ])
+    for position in (0, 400, 900):
+        section = eu_pf.iloc[[position]]
+        finite_element = sections_db.max_vonmises_stresses(
+            sections_db.create_section(section.iloc[0], cache=None), actions
+        )
+        estimated = np.array([sections_db.estimate_vonmises_stress(section, *case)[0] for case in actions])
+        assert (np.abs(estimated / finite_element - 1) <= sections_db.SCREEN_BAND).all()
+
+    # Near the boundary: only those sections are checked by finite elements
+    spread = eu_pf.iloc[::90]
+    screened = sections_db.screen_section_stresses(spread, 355, Mx=2e7, mesh_size=20)
+    in_band = np.abs(screened["sig_vm Est"] / 355 - 1) <= sections_db.SCREEN_BAND
+    assert 1 <= in_band.sum() <= 2
+    assert (screened["FE check"] == in_band).all()
+    checked = sections_db.calculate_section_stresses(spread.loc[in_band], 355, Mx=2e7, mesh_size=20)
+    assert np.allclose(screened.loc[in_band, "sig_vm Max"], checked["sig_vm Max"])
+    assert (screened.loc[~in_band, "sig_vm Max"] == screened.loc[~in_band, "sig_vm Est"]).all()
+
+
+def test_refine_section():
+    small = pd.Series({"h": 100., "b": 50., "tf": 5., "tw": 4., "r": 7.})
+    section, mesh_record = sections_db.refine_section(small, N=1e4, Mx=1e6, tolerance=0.05, initial_mesh_size=200)
+    assert mesh_record["converged"]
+    assert mesh_record["elements"] == len(section.elements)
+    assert mesh_record["iterations"] == 2
+    # Meshes with as many elements as the last one solved are skipped
+    assert mesh_record["elements"] != len(sections_db.create_section(small, 200, cache=None).elements)
+    assert mesh_record["mesh size"] < 200 * 0.5 ** (mesh_record["iterations"] - 1)
+    assert math.isclose(
+        mesh_record["sig_vm Max"],
+        sections_db.max_vonmises_stress(section, N=1e4, Mx=1e6),
+    )
+
+    test_df = pd.DataFrame([small])
+    results = sections_db.calculate_section_stresses(test_df, 350, N=1e4, Mx=1e6, mesh_size=200, tolerance=0.05)
+    assert results["elements"].iloc[0] == mesh_record["elements"]
+    assert results["sig_vm Max"].iloc[0] == mesh_record["sig_vm Max"]
+    # Without a mesh size the adaptive meshing starts as coarse as refine_section's
+    default_start = sections_db.calculate_section_stresses(test_df, 350, N=1e4, Mx=1e6, tolerance=0.05)
+    assert default_start["mesh size"].iloc[0] < 400 * 0.5 ** (default_start["iterations"].iloc[0] - 1)